@@ -88,6 +88,17 @@ function createTables() {
       }
     });
 
+    // Which scraper source a row was synced from (POST /api/events/sync), so a
+    // source only ever updates or retires its own rows; NULL for everything else
+    db.run('ALTER TABLE events ADD COLUMN sync_source TEXT', (err) => {
+      if (err && !String(err.message).includes('duplicate column')) {
+        console.warn('Note (ALTER TABLE events add sync_source):', err.message);
+      }
+      db.run('CREATE INDEX IF NOT EXISTS idx_events_sync_source ON events(sync_source)', (err2) => {
+        if (err2) console.warn('Note (index on sync_source):', err2.message);
+      });
+    });
+
     // Seed event types if empty
     db.get('SELECT COUNT(*) as cnt FROM event_types', (err, row) => {
       if (err) return;
@@ -3,6 +3,7 @@ const cors = require('cors');
 const helmet = require('helmet');
 const morgan = require('morgan');
 const db = require('./db');
+const { classifyTagsFromText, ingestRejection, eventRowParams, applyChangeSet } = require('./ingest');
 const rateLimit = require('express-rate-limit');
 const qs = require('querystring');
 const { exec } = require('child_process');
@@ -10,33 +11,6 @@ const { exec } = require('child_process');
 const app = express();
 const PORT = process.env.PORT || 3001;
 
-// Simple rule-based classifier to derive tags from title/description
-function classifyTagsFromText(title = '', description = '') {
-  const text = `${title} ${description}`.toLowerCase();
-  const tagSet = new Set();
-  const rules = [
-    { kw: ['workshop', 'training', 'hands-on', 'bootcamp'], tag: 'workshop' },
-    { kw: ['conference', 'summit', 'symposium', 'expo'], tag: 'conference' },
-    { kw: ['webinar', 'virtual'], tag: 'webinar' },
-    { kw: ['career fair', 'recruiting', 'job fair'], tag: 'career' },
-    { kw: ['council', 'board', 'committee', 'hearing', 'meeting'], tag: 'government' },
-    { kw: ['lecture', 'talk', 'colloquium', 'seminar'], tag: 'academic' },
-    { kw: ['football', 'basketball', 'baseball', 'soccer', 'athletic'], tag: 'athletics' },
-    { kw: ['holiday', 'break', 'closure'], tag: 'holiday' },
-    { kw: ['raleigh'], tag: 'raleigh' },
-    { kw: ['durham'], tag: 'durham' },
-    { kw: ['chapel hill'], tag: 'chapel-hill' },
-    { kw: ['cary'], tag: 'cary' },
-    { kw: ['unc', 'chapel hill'], tag: 'unc' },
-    { kw: ['duke'], tag: 'duke' },
-    { kw: ['ncsu', 'nc state'], tag: 'ncsu' },
-  ];
-  for (const r of rules) {
-    if (r.kw.some(k => text.includes(k))) tagSet.add(r.tag);
-  }
-  return Array.from(tagSet);
-}
-
 // Security middleware
 app.use(helmet());
 
@@ -61,6 +35,29 @@ const ingestStats = {
   reasons: { invalid_date: 0, invalid_order: 0, too_long: 0, invalid_coords: 0, missing_fields: 0 }
 };
 
+// Idempotency-Key -> response of recent batch uploads, so a client retrying a
+// chunk whose response it never saw gets the original result back
+const IDEMPOTENCY_TTL_MS = 24 * 60 * 60 * 1000;
+const IDEMPOTENCY_MAX = 5000;
+const idempotentResponses = new Map();
+
+function rememberIdempotent(key, body) {
+  idempotentResponses.set(key, { body, at: Date.now() });
+  while (idempotentResponses.size > IDEMPOTENCY_MAX) {
+    idempotentResponses.delete(idempotentResponses.keys().next().value);
+  }
+}
+
+function recallIdempotent(key) {
+  const hit = idempotentResponses.get(key);
+  if (!hit) return null;
+  if (Date.now() - hit.at > IDEMPOTENCY_TTL_MS) {
+    idempotentResponses.delete(key);
+    return null;
+  }
+  return hit.body;
+}
+
 // Health check endpoint
 app.get('/health', (req, res) => {
   res.json({ 
@@ -348,6 +345,18 @@ app.get('/api/events/:id', async (req, res) => {
   }
 });
 
+// All ingest endpoints share the one sqlite3 connection from db.js, which can only
+// hold one transaction at a time. Single and batch inserts and sync transactions
+// therefore run one after another through this queue: no "cannot start a
+// transaction within a transaction", and no insert landing inside (and rolled
+// back with) another request's sync.
+let ingestQueue = Promise.resolve();
+function withIngestLock(task) {
+  const result = ingestQueue.then(task);
+  ingestQueue = result.catch(() => {});
+  return result;
+}
+
 app.post('/api/events', async (req, res) => {
   try {
     const {
@@ -401,50 +410,53 @@ app.post('/api/events', async (req, res) => {
       WHERE title = ? AND start_date = ?
     `;
     
-    db.get(checkQuery, [title, start_date], (err, existingEvent) => {
-      if (err) {
-        console.error('Database error checking for duplicates:', err);
-        return res.status(500).json({ error: 'Database error' });
-      }
+    await withIngestLock(() => new Promise((release) => {
+      res.once('close', release); // every path below ends by sending the response
+      db.get(checkQuery, [title, start_date], (err, existingEvent) => {
+        if (err) {
+          console.error('Database error checking for duplicates:', err);
+          return res.status(500).json({ error: 'Database error' });
+        }
       
-      if (existingEvent) {
-        // Event already exists, return success but indicate it's a duplicate
-        ingestStats.totals.duplicates++;
-        return res.status(200).json({
-          id: existingEvent.id,
-          message: 'Event already exists (duplicate prevented)',
-          duplicate: true
-        });
-      }
+        if (existingEvent) {
+          // Event already exists, return success but indicate it's a duplicate
+          ingestStats.totals.duplicates++;
+          return res.status(200).json({
+            id: existingEvent.id,
+            message: 'Event already exists (duplicate prevented)',
+            duplicate: true
+          });
+        }
       
-      // Insert new event
-      const insertQuery = `
-        INSERT INTO events (
-          title, description, start_date, end_date, location_name,
-          latitude, longitude, organization_id, event_type, source_url, tags
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-      `;
+        // Insert new event
+        const insertQuery = `
+          INSERT INTO events (
+            title, description, start_date, end_date, location_name,
+            latitude, longitude, organization_id, event_type, source_url, tags
+          ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        `;
       
-      const params = [
-        title, description, start_date, end_date, location_name,
-        latitude || 0, longitude || 0, organization_id || 1, event_type || 'other', source_url || '',
-        Array.isArray(tags) ? tags.join(',') : (typeof tags === 'string' ? tags : classifyTagsFromText(title, description).join(','))
-      ];
+        const params = [
+          title, description, start_date, end_date, location_name,
+          latitude || 0, longitude || 0, organization_id || 1, event_type || 'other', source_url || '',
+          Array.isArray(tags) ? tags.join(',') : (typeof tags === 'string' ? tags : classifyTagsFromText(title, description).join(','))
+        ];
       
-      db.run(insertQuery, params, function(err) {
-        if (err) {
-          console.error('Database error:', err);
-          return res.status(500).json({ error: 'Database error' });
-        }
+        db.run(insertQuery, params, function(err) {
+          if (err) {
+            console.error('Database error:', err);
+            return res.status(500).json({ error: 'Database error' });
+          }
         
-        ingestStats.totals.inserted++;
-        res.status(201).json({
-          id: this.lastID,
-          message: 'Event created successfully',
-          duplicate: false
+          ingestStats.totals.inserted++;
+          res.status(201).json({
+            id: this.lastID,
+            message: 'Event created successfully',
+            duplicate: false
+          });
         });
       });
-    });
+    }));
   } catch (error) {
     console.error('API error:', error);
     res.status(500).json({ error: 'Internal server error' });
@@ -458,33 +470,21 @@ app.post('/api/events/batch', async (req, res) => {
     if (events.length === 0) {
       return res.status(400).json({ error: 'No events provided' });
     }
+    const idempotencyKey = req.get('Idempotency-Key');
+    const previous = idempotencyKey ? recallIdempotent(idempotencyKey) : null;
+    if (previous) {
+      return res.json({ ...previous, idempotent_replay: true });
+    }
 
     let inserted = 0;
     let duplicates = 0;
     let failed = 0;
 
     const insertOne = (e) => new Promise((resolve) => {
-      const {
-        title, description, start_date, end_date, location_name,
-        latitude, longitude, organization_id, event_type, source_url, tags
-      } = e;
-
-      if (!title || !start_date || !end_date) {
-        failed++; ingestStats.reasons.missing_fields++; return resolve();
-      }
-
-      // Validate times
-      const sMs = Date.parse(start_date);
-      const eMs = Date.parse(end_date);
-      if (!Number.isFinite(sMs)) { failed++; ingestStats.reasons.invalid_date++; return resolve(); }
-      if (!Number.isFinite(eMs)) { failed++; ingestStats.reasons.invalid_date++; return resolve(); }
-      if (eMs <= sMs) { failed++; ingestStats.reasons.invalid_order++; return resolve(); }
-      if (e.event_type !== 'holiday' && (eMs - sMs) > (14*60*60*1000)) { failed++; ingestStats.reasons.too_long++; return resolve(); }
+      const { title, start_date } = e;
 
-      // Validate coordinates if present
-      const latOkB = latitude === undefined || (Number.isFinite(Number(latitude)) && Math.abs(Number(latitude)) <= 90);
-      const lonOkB = longitude === undefined || (Number.isFinite(Number(longitude)) && Math.abs(Number(longitude)) <= 180);
-      if (!latOkB || !lonOkB) { failed++; ingestStats.reasons.invalid_coords++; return resolve(); }
+      const rejection = ingestRejection(e);
+      if (rejection) { failed++; ingestStats.reasons[rejection]++; return resolve(); }
 
       db.get('SELECT id FROM events WHERE title = ? AND start_date = ?', [title, start_date], (err, existing) => {
         if (err) { failed++; return resolve(); }
@@ -496,25 +496,23 @@ app.post('/api/events/batch', async (req, res) => {
             latitude, longitude, organization_id, event_type, source_url, tags
           ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         `;
-        const params = [
-          title, description || '', start_date, end_date, location_name || '',
-          Number(latitude) || 0, Number(longitude) || 0, organization_id || 1, event_type || 'other', source_url || '',
-          Array.isArray(tags) ? tags.join(',') : (typeof tags === 'string' ? tags : classifyTagsFromText(title, description).join(','))
-        ];
-        db.run(insertQuery, params, function(err2) {
+        db.run(insertQuery, eventRowParams(e), function(err2) {
           if (err2) { failed++; } else { inserted++; ingestStats.totals.inserted++; }
           resolve();
         });
       });
     });
 
-    for (const e of events) { // sequential to avoid SQLite busy
-      // eslint-disable-next-line no-await-in-loop
-      await insertOne(e);
-    }
+    await withIngestLock(async () => {
+      for (const e of events) { // sequential to avoid SQLite busy
+        // eslint-disable-next-line no-await-in-loop
+        await insertOne(e);
+      }
+    });
 
     ingestStats.totals.received += events.length;
     ingestStats.lastBatch = { received: events.length, inserted, duplicates, failed };
+    if (idempotencyKey) rememberIdempotent(idempotencyKey, ingestStats.lastBatch);
     res.json(ingestStats.lastBatch);
   } catch (error) {
     console.error('Batch ingest error:', error);
@@ -522,6 +520,42 @@ app.post('/api/events/batch', async (req, res) => {
   }
 });
 
+// Apply one source's change set (computed by scraper/sync.py) in a single transaction:
+// { source, inserts: [event], updates: [{ match: {title, start_date, organization_id}, event }],
+//   retires: [{title, start_date, organization_id}] }
+app.post('/api/events/sync', async (req, res) => {
+  const source = typeof req.body?.source === 'string' ? req.body.source : '';
+  if (!source) {
+    return res.status(400).json({ error: 'No source provided' });
+  }
+  const inserts = Array.isArray(req.body?.inserts) ? req.body.inserts : [];
+  const updates = Array.isArray(req.body?.updates) ? req.body.updates : [];
+  const retires = Array.isArray(req.body?.retires) ? req.body.retires : [];
+  const idempotencyKey = req.get('Idempotency-Key');
+  const previous = idempotencyKey ? recallIdempotent(idempotencyKey) : null;
+  if (previous) {
+    return res.json({ ...previous, idempotent_replay: true });
+  }
+
+  try {
+    const result = await withIngestLock(async () => {
+      // a retry of this key may have been applied while we were queued
+      const applied = idempotencyKey ? recallIdempotent(idempotencyKey) : null;
+      if (applied) return { ...applied, idempotent_replay: true };
+      const stats = await applyChangeSet(db, { source, inserts, updates, retires }, ingestStats.reasons);
+      if (idempotencyKey) rememberIdempotent(idempotencyKey, stats);
+      ingestStats.totals.received += inserts.length + updates.length;
+      ingestStats.totals.inserted += stats.inserted;
+      ingestStats.totals.duplicates += stats.duplicates;
+      return stats;
+    });
+    res.json(result);
+  } catch (error) {
+    console.error('Sync ingest error:', error);
+    res.status(500).json({ error: 'Internal server error' });
+  }
+});
+
 // Cleanup old events endpoint (older than 3 months)
 app.post('/api/events/cleanup-old', async (req, res) => {
   try {
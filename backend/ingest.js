@@ -0,0 +1,156 @@
+// ingest.js
+// Event validation and row building shared by the ingest endpoints (mirrored by
+// scraper/sqlite_loader.py), and the sync change-set transaction.
+
+// Simple rule-based classifier to derive tags from title/description
+function classifyTagsFromText(title = '', description = '') {
+  const text = `${title} ${description}`.toLowerCase();
+  const tagSet = new Set();
+  const rules = [
+    { kw: ['workshop', 'training', 'hands-on', 'bootcamp'], tag: 'workshop' },
+    { kw: ['conference', 'summit', 'symposium', 'expo'], tag: 'conference' },
+    { kw: ['webinar', 'virtual'], tag: 'webinar' },
+    { kw: ['career fair', 'recruiting', 'job fair'], tag: 'career' },
+    { kw: ['council', 'board', 'committee', 'hearing', 'meeting'], tag: 'government' },
+    { kw: ['lecture', 'talk', 'colloquium', 'seminar'], tag: 'academic' },
+    { kw: ['football', 'basketball', 'baseball', 'soccer', 'athletic'], tag: 'athletics' },
+    { kw: ['holiday', 'break', 'closure'], tag: 'holiday' },
+    { kw: ['raleigh'], tag: 'raleigh' },
+    { kw: ['durham'], tag: 'durham' },
+    { kw: ['chapel hill'], tag: 'chapel-hill' },
+    { kw: ['cary'], tag: 'cary' },
+    { kw: ['unc', 'chapel hill'], tag: 'unc' },
+    { kw: ['duke'], tag: 'duke' },
+    { kw: ['ncsu', 'nc state'], tag: 'ncsu' },
+  ];
+  for (const r of rules) {
+    if (r.kw.some(k => text.includes(k))) tagSet.add(r.tag);
+  }
+  return Array.from(tagSet);
+}
+
+// Validation shared by the batch and sync ingest endpoints (mirrored by
+// scraper/sqlite_loader.py). Returns an ingestStats.reasons key, or null if valid.
+function ingestRejection(e) {
+  const { title, start_date, end_date, latitude, longitude } = e;
+  if (!title || !start_date || !end_date) return 'missing_fields';
+
+  // Validate times
+  const sMs = Date.parse(start_date);
+  const eMs = Date.parse(end_date);
+  if (!Number.isFinite(sMs) || !Number.isFinite(eMs)) return 'invalid_date';
+  if (eMs <= sMs) return 'invalid_order';
+  if (e.event_type !== 'holiday' && (eMs - sMs) > (14*60*60*1000)) return 'too_long';
+
+  // Validate coordinates if present
+  const latOk = latitude === undefined || (Number.isFinite(Number(latitude)) && Math.abs(Number(latitude)) <= 90);
+  const lonOk = longitude === undefined || (Number.isFinite(Number(longitude)) && Math.abs(Number(longitude)) <= 180);
+  if (!latOk || !lonOk) return 'invalid_coords';
+  return null;
+}
+
+// Column values (title ... tags) for an ingested event, with defaults applied
+function eventRowParams(e) {
+  const {
+    title, description, start_date, end_date, location_name,
+    latitude, longitude, organization_id, event_type, source_url, tags
+  } = e;
+  return [
+    title, description || '', start_date, end_date, location_name || '',
+    Number(latitude) || 0, Number(longitude) || 0, organization_id || 1, event_type || 'other', source_url || '',
+    Array.isArray(tags) ? tags.join(',') : (typeof tags === 'string' ? tags : classifyTagsFromText(title, description).join(','))
+  ];
+}
+
+
+// Rows are matched on (title, start_date, organization_id) *and* sync_source,
+// so a source never touches rows another source or a person added
+const INSERT_QUERY = `
+  INSERT INTO events (
+    title, description, start_date, end_date, location_name,
+    latitude, longitude, organization_id, event_type, source_url, tags, sync_source
+  ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+`;
+const UPDATE_QUERY = `
+  UPDATE events SET
+    title = ?, description = ?, start_date = ?, end_date = ?, location_name = ?,
+    latitude = ?, longitude = ?, organization_id = ?, event_type = ?, source_url = ?, tags = ?
+  WHERE title = ? AND start_date = ? AND organization_id = ? AND sync_source = ?
+`;
+const RETIRE_QUERY = `
+  DELETE FROM events WHERE title = ? AND start_date = ? AND organization_id = ? AND sync_source = ?
+`;
+// Another row already holding the (title, start_date) an update moves onto
+const COLLISION_QUERY = `
+  SELECT id FROM events
+  WHERE title = ? AND start_date = ?
+    AND NOT (title = ? AND start_date = ? AND organization_id = ? AND sync_source IS ?)
+`;
+
+// Apply the change set of scraper `source` ({ source, inserts, updates, retires },
+// as sent to POST /api/events/sync) in a single transaction on `db`. Updates
+// and retires only match rows that source inserted. Rejected events are
+// counted in `reasons`. An update that would collide with another row's
+// (title, start_date) leaves that row alone and counts as a duplicate, like an
+// insert of an existing event. Resolves to inserted/updated/retired/duplicates/failed.
+async function applyChangeSet(db, { source, inserts = [], updates = [], retires = [] }, reasons = {}) {
+  if (!source) throw new Error('applyChangeSet needs the source the change set belongs to');
+  const run = (sql, params) => new Promise((resolve, reject) => {
+    db.run(sql, params, function(err) { return err ? reject(err) : resolve(this.changes); });
+  });
+  const get = (sql, params) => new Promise((resolve, reject) => {
+    db.get(sql, params, (err, row) => (err ? reject(err) : resolve(row)));
+  });
+  const rejected = (e) => {
+    const rejection = ingestRejection(e);
+    if (rejection) reasons[rejection] = (reasons[rejection] || 0) + 1;
+    return rejection;
+  };
+  const stats = { inserted: 0, updated: 0, retired: 0, duplicates: 0, failed: 0 };
+  const pending = [...inserts];
+
+  await run('BEGIN IMMEDIATE');
+  try {
+    for (const r of retires) {
+      // eslint-disable-next-line no-await-in-loop
+      stats.retired += await run(RETIRE_QUERY, [r.title, r.start_date, r.organization_id || 1, source]);
+    }
+    for (const u of updates) {
+      const e = u.event || {};
+      const m = u.match || {};
+      if (rejected(e)) { stats.failed++; continue; }
+      const match = [m.title, m.start_date, m.organization_id || 1, source];
+      // eslint-disable-next-line no-await-in-loop
+      const collision = await get(COLLISION_QUERY, [e.title, e.start_date, ...match]);
+      if (collision) { stats.duplicates++; continue; }
+      let changed;
+      try {
+        // eslint-disable-next-line no-await-in-loop
+        changed = await run(UPDATE_QUERY, [...eventRowParams(e), ...match]);
+      } catch (err) {
+        // a unique index on (title, start_date), where one exists, reports the same collision
+        if (err.code !== 'SQLITE_CONSTRAINT') throw err;
+        stats.duplicates++;
+        continue;
+      }
+      if (changed) { stats.updated += changed; continue; }
+      pending.push(e); // the old row is gone (e.g. cleaned up): insert instead
+    }
+    for (const e of pending) {
+      if (rejected(e)) { stats.failed++; continue; }
+      // eslint-disable-next-line no-await-in-loop
+      const existing = await get('SELECT id FROM events WHERE title = ? AND start_date = ?', [e.title, e.start_date]);
+      if (existing) { stats.duplicates++; continue; }
+      // eslint-disable-next-line no-await-in-loop
+      await run(INSERT_QUERY, [...eventRowParams(e), source]);
+      stats.inserted++;
+    }
+    await run('COMMIT');
+  } catch (err) {
+    await run('ROLLBACK').catch(() => {});
+    throw err;
+  }
+  return stats;
+}
+
+module.exports = { classifyTagsFromText, ingestRejection, eventRowParams, applyChangeSet };
@@ -0,0 +1,125 @@
+// test/ingest.test.js — run with `npm test`
+const test = require('node:test');
+const assert = require('node:assert');
+const sqlite3 = require('sqlite3');
+const { applyChangeSet } = require('../ingest');
+
+const SCHEMA = `
+  CREATE TABLE events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    description TEXT,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    location_name TEXT,
+    latitude REAL DEFAULT 0,
+    longitude REAL DEFAULT 0,
+    organization_id INTEGER DEFAULT 1,
+    event_type TEXT DEFAULT 'other',
+    source_url TEXT,
+    tags TEXT DEFAULT '',
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    sync_source TEXT
+  )
+`;
+
+function openDb(...statements) {
+  const db = new sqlite3.Database(':memory:');
+  return new Promise((resolve, reject) => {
+    db.exec([SCHEMA, ...statements].join(';'), (err) => (err ? reject(err) : resolve(db)));
+  });
+}
+
+function all(db, sql) {
+  return new Promise((resolve, reject) => {
+    db.all(sql, [], (err, rows) => (err ? reject(err) : resolve(rows)));
+  });
+}
+
+function meeting(title, start_date, extra = {}) {
+  return { title, start_date, end_date: start_date.replace('T18', 'T19'), organization_id: 5, ...extra };
+}
+
+async function insert(db, event, source = 'durham-ics') {
+  await applyChangeSet(db, { source, inserts: [event] });
+}
+
+for (const [name, indexes] of [
+  ['without a unique index', []],
+  ['with a unique (title, start_date) index', ['CREATE UNIQUE INDEX idx_events_title_start_unique ON events(title, start_date)']],
+]) {
+  test(`sync: an update colliding with another row counts as a duplicate (${name})`, async () => {
+    const db = await openDb(...indexes);
+    await insert(db, meeting('Council', '2030-01-07T18:00:00'));
+    await insert(db, meeting('Council', '2030-01-14T18:00:00'));
+    await insert(db, meeting('Budget Workshop', '2030-01-20T18:00:00'));
+
+    const stats = await applyChangeSet(db, {
+      source: 'durham-ics',
+      // the 7th moved onto the 14th, which another row already holds
+      updates: [
+        { match: { title: 'Council', start_date: '2030-01-07T18:00:00', organization_id: 5 },
+          event: meeting('Council', '2030-01-14T18:00:00', { description: 'moved' }) },
+      ],
+      inserts: [meeting('Parks Board', '2030-01-21T18:00:00')],
+      retires: [{ title: 'Budget Workshop', start_date: '2030-01-20T18:00:00', organization_id: 5 }],
+    });
+
+    assert.deepStrictEqual(stats, { inserted: 1, updated: 0, retired: 1, duplicates: 1, failed: 0 });
+    const rows = await all(db, 'SELECT title, start_date, description FROM events ORDER BY start_date');
+    assert.deepStrictEqual(rows.map((r) => [r.title, r.start_date, r.description]), [
+      ['Council', '2030-01-07T18:00:00', ''],
+      ['Council', '2030-01-14T18:00:00', ''],
+      ['Parks Board', '2030-01-21T18:00:00', ''],
+    ]);
+  });
+}
+
+test('sync: an update moves its own row', async () => {
+  const db = await openDb();
+  await insert(db, meeting('Council', '2030-01-07T18:00:00'));
+  const stats = await applyChangeSet(db, {
+    source: 'durham-ics',
+    updates: [
+      { match: { title: 'Council', start_date: '2030-01-07T18:00:00', organization_id: 5 },
+        event: meeting('Council', '2030-01-08T18:00:00') },
+    ],
+  });
+  assert.strictEqual(stats.updated, 1);
+  const rows = await all(db, 'SELECT start_date FROM events');
+  assert.deepStrictEqual(rows.map((r) => r.start_date), ['2030-01-08T18:00:00']);
+});
+
+test('sync: retires and updates only touch rows the source inserted', async () => {
+  const db = await openDb();
+  await insert(db, meeting('Council', '2030-01-07T18:00:00'), 'durham-ics');
+  // the same meeting, entered by hand before any scraper synced it
+  await new Promise((resolve, reject) => db.run(
+    "INSERT INTO events (title, start_date, end_date, organization_id) VALUES ('Council', '2030-01-14T18:00:00', '2030-01-14T19:00:00', 5)",
+    [], (err) => (err ? reject(err) : resolve())
+  ));
+
+  const stats = await applyChangeSet(db, {
+    source: 'durham-agenda-center',
+    retires: [
+      { title: 'Council', start_date: '2030-01-07T18:00:00', organization_id: 5 },
+      { title: 'Council', start_date: '2030-01-14T18:00:00', organization_id: 5 },
+    ],
+    updates: [
+      { match: { title: 'Council', start_date: '2030-01-07T18:00:00', organization_id: 5 },
+        event: meeting('Council', '2030-01-07T18:00:00', { description: 'edited' }) },
+    ],
+  });
+
+  assert.deepStrictEqual(stats, { inserted: 0, updated: 0, retired: 0, duplicates: 1, failed: 0 });
+  const rows = await all(db, 'SELECT start_date, description, sync_source FROM events ORDER BY start_date');
+  assert.deepStrictEqual(rows.map((r) => [r.start_date, r.description, r.sync_source]), [
+    ['2030-01-07T18:00:00', '', 'durham-ics'],
+    ['2030-01-14T18:00:00', null, null],
+  ]);
+});
+
+test('sync: a change set without a source is refused', async () => {
+  const db = await openDb();
+  await assert.rejects(applyChangeSet(db, { inserts: [meeting('Council', '2030-01-07T18:00:00')] }));
+});
@@ -1,22 +1,165 @@
-import os, requests
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+import cassette
+import circuit_breaker
+import dedup
+import state_store
+from http_client import http_post
 
 API_BASE = os.getenv('API_URL', 'http://localhost:3001')
 
+# Batch uploads are split into chunks no larger than either limit (the
+# backend accepts bodies up to 10 MB) and sent by a small pool of workers.
+BATCH_MAX_EVENTS = int(os.getenv('API_BATCH_MAX_EVENTS', '250'))
+BATCH_MAX_BYTES = int(float(os.getenv('API_BATCH_MAX_KB', '2048')) * 1024)
+UPLOAD_WORKERS = int(os.getenv('API_UPLOAD_WORKERS', '3'))
+UPLOAD_ATTEMPTS = int(os.getenv('API_UPLOAD_ATTEMPTS', '4'))
+
+STAT_KEYS = ('received', 'inserted', 'duplicates', 'failed')
+
+
 def post_event(event):
+    if not dedup.drop_repeats([event])[0] or not state_store.changed([event]):
+        return True  # another scraper's copy, or uploaded before and unchanged
     try:
-        res = requests.post(f"{API_BASE}/api/events", json=event, timeout=15)
+        res = http_post(f"{API_BASE}/api/events", json=event, timeout=15)
         if res.status_code in (200,201):
+            if not cassette.replaying():
+                state_store.remember([event])
             return True
         print(f"❌ Failed to post: {res.status_code} {res.text}")
     except Exception as e:
         print(f"❌ Error: {e}")
     return False
 
+
+def chunk_events(events, max_events=BATCH_MAX_EVENTS, max_bytes=BATCH_MAX_BYTES):
+    """Split `events` into lists of at most `max_events` events and ~`max_bytes` of JSON."""
+    chunk, size = [], 0
+    for ev in events:
+        ev_size = len(json.dumps(ev, default=str).encode('utf-8')) + 1
+        if chunk and (len(chunk) >= max_events or size + ev_size > max_bytes):
+            yield chunk
+            chunk, size = [], 0
+        chunk.append(ev)
+        size += ev_size
+    if chunk:
+        yield chunk
+
+
+def idempotency_key(chunk) -> str:
+    """Same events, same key: a retried (or re-run) chunk is recognised by the backend."""
+    payload = json.dumps(chunk, sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _post_json(path, body, key):
+    """POST `body` to the API with an idempotency key, retrying transient failures."""
+    headers = {'Idempotency-Key': key}
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            res = http_post(f"{API_BASE}{path}", json=body, headers=headers, timeout=30)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt >= UPLOAD_ATTEMPTS:
+                raise
+            delay = circuit_breaker.backoff(attempt)
+        else:
+            if res.status_code not in circuit_breaker.RETRY_STATUSES or attempt >= UPLOAD_ATTEMPTS:
+                res.raise_for_status()
+                return res.json()
+            retry_after = res.headers.get('Retry-After', '')
+            delay = float(retry_after) if retry_after.isdigit() else circuit_breaker.backoff(attempt)
+            res.close()
+        time.sleep(delay)
+
+
+def _post_chunk(chunk):
+    """POST one chunk of events. Returns the backend's stats or raises."""
+    return _post_json("/api/events/batch", {'events': chunk}, idempotency_key(chunk))
+
+
+def _upload(chunk):
+    try:
+        return chunk, _post_chunk(chunk), None
+    except Exception as e:
+        return chunk, None, e
+
+
+def upload(events):
+    """
+    POST `events` to /api/events/batch in parallel chunks, as-is (no dedup).
+    Returns (stats, uploaded): the aggregated received/inserted/duplicates/failed
+    counts and the events of the chunks that were accepted. Events in chunks
+    that still fail after retries are counted as failed and reported under
+    "error".
+    """
+    chunks = list(chunk_events(events))
+    stats = dict.fromkeys(STAT_KEYS, 0)
+    uploaded, errors = [], []
+    workers = max(1, min(UPLOAD_WORKERS, len(chunks)))
+    if workers == 1:
+        results = map(_upload, chunks)
+    else:
+        pool = ThreadPoolExecutor(max_workers=workers)
+        results = pool.map(_upload, chunks)
+    for chunk, chunk_stats, error in results:
+        if error is not None:
+            errors.append(error)
+            stats['failed'] += len(chunk)
+            continue
+        uploaded.extend(chunk)
+        for key in STAT_KEYS:
+            stats[key] += int(chunk_stats.get(key) or 0)
+    if workers > 1:
+        pool.shutdown()
+
+    if len(chunks) > 1:
+        stats["chunks"] = len(chunks)
+    if errors:
+        print(f"❌ Batch error: {len(errors)}/{len(chunks)} chunks failed: {errors[-1]}")
+        stats["error"] = str(errors[-1])
+        stats["failed_chunks"] = len(errors)
+    return stats, uploaded
+
+
 def batch_post(events):
+    """
+    Upload one batch of events over HTTP and return the aggregated stats.
+    Copies other scrapers own and events unchanged since their last upload
+    are dropped first (dedup.select_new). Scrapers normally go through
+    event_sink.publish, which also supports the non-HTTP sinks.
+    """
+    fresh, skipped = dedup.select_new(events)
+    if not fresh:
+        print(f"⏭️  Nothing to upload ({skipped['skipped_unchanged']} unchanged, "
+              f"{skipped['skipped_duplicates']} duplicates)")
+        return {"received": 0, **skipped}
+    stats, uploaded = upload(fresh)
+    if not cassette.replaying():
+        state_store.remember(uploaded)
+    stats.update((k, v) for k, v in skipped.items() if v)
+    return stats
+
+
+def post_changes(payload):
+    """
+    Send a sync change set (sync.ChangeSet.payload()) to /api/events/sync in
+    one request, which the backend applies in one transaction: all of it
+    lands or none of it does, so the contributions sync.commit records always
+    match the server. Returns the inserted/updated/retired/duplicates/failed
+    counts, or {"error": ...} if the change set could not be applied.
+    """
     try:
-        res = requests.post(f"{API_BASE}/api/events/batch", json={'events': events}, timeout=30)
-        res.raise_for_status()
-        return res.json()
+        result = _post_json("/api/events/sync", payload, idempotency_key(payload))
     except Exception as e:
-        print(f"❌ Batch error: {e}")
+        print(f"❌ Sync error: {e}")
         return {"error": str(e)}
+    return {key: value for key, value in result.items() if isinstance(value, int) and not isinstance(value, bool)}
@@ -1,25 +1,31 @@
 # scraper/base_scraper.py
 
 import requests
+from http_client import http_get
 from abc import ABC, abstractmethod
-from bs4 import BeautifulSoup
+from html_parse import make_soup, make_tree
+from event_sink import publish
 
 class BaseScraper(ABC):
     """
     Abstract base class for all scrapers.
-    Each scraper can optionally pass custom headers (e.g., User-Agent) to avoid request blocking.
+    Requests go through the shared pooled transport (http_client), which already sends a
+    browser-like header set; scrapers only pass `headers` for per-source additions.
+    Set `parser_engine` on a subclass to pin its BeautifulSoup builder (see html_parse).
     """
+    parser_engine = None  # None -> html_parse.ENGINE (lxml unless HTML_PARSER says otherwise)
+
     def __init__(self, source_name, base_url, headers=None):
         self.source_name = source_name
         self.base_url = base_url
-        self.headers = headers or {}  # Optional HTTP headers
+        self.headers = headers or {}  # Extra HTTP headers merged over http_client.DEFAULT_HEADERS
 
     def fetch_html(self, url=None):
         """
         Fetch the HTML content of a webpage, using any provided headers.
         """
         try:
-            response = requests.get(url or self.base_url, headers=self.headers, timeout=10)
+            response = http_get(url or self.base_url, headers=self.headers, timeout=10)
             response.raise_for_status()
             return response.text
         except requests.RequestException as e:
@@ -30,7 +36,13 @@ class BaseScraper(ABC):
         """
         Returns a BeautifulSoup object from raw HTML.
         """
-        return BeautifulSoup(html, "html.parser")
+        return make_soup(html, self.parser_engine)
+
+    def get_tree(self, html):
+        """
+        Returns an lxml.html tree for XPath parsing (faster than soup on hot paths).
+        """
+        return make_tree(html)
 
     @abstractmethod
     def parse_events(self, html):
@@ -51,3 +63,11 @@ class BaseScraper(ABC):
             print(f"✅ Found {len(events)} events for {self.source_name}")
             return events
         return []
+
+    def run_and_post(self):
+        """
+        run() and deliver the events through the configured event sink (event_sink.py).
+        """
+        stats = publish(self.run())
+        print(f"📤 {self.source_name}: {stats}")
+        return stats
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Time each HTML parsing engine (see html_parse.py) on every HTML source.
+
+Fetches each scraper's entry page once through http_client (so --replay
+works offline against a recorded cassette), then parses it N times with
+BeautifulSoup/html.parser, BeautifulSoup/lxml and a bare lxml.html tree,
+and prints the median parse time per source in milliseconds.
+
+    python benchmark_parsers.py            # live (or HTTP-cached) pages
+    python benchmark_parsers.py --replay   # pages from the cassette
+    python benchmark_parsers.py --url https://www.durhamnc.gov/Calendar.aspx?EID=1234
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import cassette
+from html_parse import make_soup, make_tree
+from http_client import http_get
+
+# (name, entry page) for the scrapers that parse HTML
+SOURCES = [
+    ("UNC Chapel Hill", "https://calendar.unc.edu/"),
+    ("Duke University", "https://calendar.duke.edu/"),
+    ("Durham City", "https://www.durhamnc.gov/Calendar.aspx"),
+    ("Durham Agenda Center", "https://www.durhamnc.gov/AgendaCenter/City-Council-4"),
+    ("Durham County", "https://www.dconc.gov/residents/event-calendar"),
+    ("Orange County (HTML)", "https://www.orangecountync.gov/calendar.aspx?CID=7"),
+    ("Wake Forest University", "https://events.wfu.edu/"),
+    ("NCDOT Public Meetings", "https://www.ncdot.gov/news/public-meetings/Pages/default.aspx"),
+    ("NCDHHS Events", "https://www.ncdhhs.gov/events"),
+    ("CAMPO Calendar", "https://www.campo-nc.us/events"),
+    ("NC Court of Appeals", "https://appellate.nccourts.org/calendar.php?court=2"),
+]
+
+ENGINES = {
+    "html.parser": lambda html: make_soup(html, "html.parser"),
+    "lxml soup": lambda html: make_soup(html, "lxml"),
+    "lxml tree": make_tree,
+}
+
+
+def time_parse(parse, html, repeat):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        parse(html)
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples) * 1000
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark HTML parsing engines per source")
+    ap.add_argument("--repeat", "-n", type=int, default=5, help="parses per engine per page (default 5)")
+    ap.add_argument("--url", action="append", help="benchmark this URL instead of the built-in sources (repeatable)")
+    ap.add_argument("--replay", action="store_true", help="serve pages from the recorded cassette")
+    args = ap.parse_args(argv)
+
+    if args.replay:
+        cassette.configure(mode=cassette.REPLAY)
+    sources = [(url, url) for url in args.url] if args.url else SOURCES
+
+    header = f"{'Source':<32} {'KB':>6}" + "".join(f" {name:>12}" for name in ENGINES)
+    print(header)
+    print("-" * len(header))
+    totals = dict.fromkeys(ENGINES, 0.0)
+    for name, url in sources:
+        try:
+            r = http_get(url, timeout=15)
+            r.raise_for_status()
+            html = r.text
+        except Exception as e:
+            print(f"{name[:32]:<32} ⚠️ fetch failed: {e}")
+            continue
+        row = f"{name[:32]:<32} {len(html) / 1024:>6.0f}"
+        for engine, parse in ENGINES.items():
+            ms = time_parse(parse, html, args.repeat)
+            totals[engine] += ms
+            row += f" {ms:>10.1f}ms"
+        print(row)
+    print("-" * len(header))
+    print(f"{'Total':<32} {'':>6}" + "".join(f" {ms:>10.1f}ms" for ms in totals.values()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,8 @@
-import requests
-from bs4 import BeautifulSoup
+from http_client import http_get
+from html_parse import make_soup
 from urllib.parse import urljoin
 from ics_scrapers import ICSUtils
-from api_client import batch_post
+from event_sink import publish
 
 
 class CarrboroLegistarICSScraper:
@@ -13,15 +13,14 @@ class CarrboroLegistarICSScraper:
     event_type = "government"
 
     def fetch_ics_links(self) -> list[str]:
-        headers = {"User-Agent": "Mozilla/5.0"}
         try:
-            r = requests.get(self.base_url, headers=headers, timeout=15)
+            r = http_get(self.base_url, timeout=15)
             r.raise_for_status()
         except Exception as e:
             print(f"❌ Failed to fetch Carrboro Legistar calendar: {e}")
             return []
 
-        soup = BeautifulSoup(r.text, "html.parser")
+        soup = make_soup(r.text)
         links = []
         for a in soup.select('a[href*="View.ashx?M=IC&"]'):
             href = a.get("href")
@@ -36,11 +35,11 @@ class CarrboroLegistarICSScraper:
                 continue
             yurl = urljoin(self.base_url, yhref)
             try:
-                yr = requests.get(yurl, headers=headers, timeout=15)
+                yr = http_get(yurl, timeout=15)
                 yr.raise_for_status()
             except Exception:
                 continue
-            ysoup = BeautifulSoup(yr.text, 'html.parser')
+            ysoup = make_soup(yr.text)
             for y in ysoup.select('a[href*="View.ashx?M=IC&"]'):
                 href = y.get('href')
                 if href:
@@ -51,22 +50,15 @@ class CarrboroLegistarICSScraper:
         return unique
 
     def run_and_post(self):
-        events = []
-        for ics_url in self.fetch_ics_links():
-            events.extend(
-                ICSUtils.parse_ics(
-                    ics_url,
-                    org_id=self.org_id,
-                    org_name=self.org_name,
-                    lat=self.lat,
-                    lon=self.lon,
-                    event_type=self.event_type,
-                )
-            )
-        if events:
-            print("Carrboro Legistar ICS batch:", batch_post(events))
-        else:
-            print("Carrboro Legistar ICS: no events parsed")
+        events = ICSUtils.parse_feeds(
+            self.fetch_ics_links(),
+            org_id=self.org_id,
+            org_name=self.org_name,
+            lat=self.lat,
+            lon=self.lon,
+            event_type=self.event_type,
+        )
+        print("Carrboro Legistar ICS batch:", publish(events))
 
 
 if __name__ == "__main__":
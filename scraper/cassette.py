@@ -0,0 +1,186 @@
+# scraper/cassette.py
+"""
+Record/replay of HTTP traffic for offline, deterministic scraper runs.
+
+In `record` mode every GET made through http_client (HTML, ICS, JSON, PDFs)
+is saved: bodies go to a content-addressed blob store (sha256 of the bytes),
+and an append-only index maps each request URL to its status, headers and
+blob. Failed requests are recorded too so replays fail the same way.
+
+In `replay` mode no network is touched: responses are served from the
+cassette (optionally after HTTP_REPLAY_LATENCY_MS of simulated latency) and
+uploads are acknowledged locally. A request missing from the cassette raises
+`CassetteMiss`, a `requests.ConnectionError`, so scrapers treat it as a
+normal fetch failure.
+
+Configure with `configure()` (run_all_scrapers.py --record/--replay) or the
+HTTP_CASSETTE_MODE / HTTP_CASSETTE_DIR environment variables.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+OFF, RECORD, REPLAY = "off", "record", "replay"
+
+_DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "cassettes")
+
+_state = {
+    "mode": os.getenv("HTTP_CASSETTE_MODE", OFF).lower(),
+    "dir": os.getenv("HTTP_CASSETTE_DIR", _DEFAULT_DIR),
+    "latency": float(os.getenv("HTTP_REPLAY_LATENCY_MS", "0")) / 1000.0,
+}
+_index = None
+_lock = threading.Lock()
+
+
+class CassetteMiss(requests.ConnectionError):
+    """Raised in replay mode for a request that was never recorded."""
+
+
+def configure(mode=None, directory=None, latency_ms=None):
+    global _index
+    with _lock:
+        if mode is not None:
+            _state["mode"] = mode
+        if directory is not None:
+            _state["dir"] = directory
+        if latency_ms is not None:
+            _state["latency"] = latency_ms / 1000.0
+        _index = None
+
+
+def mode() -> str:
+    return _state["mode"]
+
+
+def recording() -> bool:
+    return _state["mode"] == RECORD
+
+
+def replaying() -> bool:
+    return _state["mode"] == REPLAY
+
+
+def request_key(method, url) -> str:
+    return f"{method.upper()} {url}"
+
+
+def _index_path():
+    return os.path.join(_state["dir"], "index.jsonl")
+
+
+def _blob_path(digest):
+    return os.path.join(_state["dir"], "blobs", digest[:2], digest)
+
+
+def _load_index():
+    global _index
+    if _index is None:
+        index = {}
+        try:
+            with open(_index_path(), "r", encoding="utf-8") as fh:
+                for line in fh:
+                    line = line.strip()
+                    if line:
+                        rec = json.loads(line)
+                        index[rec["key"]] = rec  # later recordings win
+        except FileNotFoundError:
+            pass
+        _index = index
+    return _index
+
+
+def _append(rec):
+    with _lock:
+        os.makedirs(_state["dir"], exist_ok=True)
+        with open(_index_path(), "a", encoding="utf-8") as fh:
+            fh.write(json.dumps(rec) + "\n")
+        _load_index()[rec["key"]] = rec
+
+
+def write_blob(body: bytes) -> str:
+    digest = hashlib.sha256(body).hexdigest()
+    path = _blob_path(digest)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as fh:
+            fh.write(body)
+        os.replace(tmp, path)
+    return digest
+
+
+def record(method, url, response):
+    """Save a completed response (reads its body)."""
+    _append(_entry(method, url, response, write_blob(response.content or b"")))
+
+
+def record_file(method, url, response, fileobj):
+    """Save a streamed response whose body was spooled to `fileobj`."""
+    fileobj.seek(0)
+    digest = hashlib.sha256()
+    os.makedirs(os.path.join(_state["dir"], "blobs"), exist_ok=True)
+    tmp = os.path.join(_state["dir"], "blobs", f"stream.{threading.get_ident()}.tmp")
+    with open(tmp, "wb") as out:
+        for block in iter(lambda: fileobj.read(1024 * 1024), b""):
+            digest.update(block)
+            out.write(block)
+    path = _blob_path(digest.hexdigest())
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    os.replace(tmp, path)
+    _append(_entry(method, url, response, digest.hexdigest()))
+
+
+def _entry(method, url, response, blob):
+    return {
+        "key": request_key(method, url),
+        "url": response.url or url,
+        "status": response.status_code,
+        "headers": dict(response.headers),
+        "encoding": response.encoding,
+        "blob": blob,
+    }
+
+
+def record_error(method, url, error):
+    _append({"key": request_key(method, url), "url": url, "error": f"{type(error).__name__}: {error}"})
+
+
+def replay(method, url) -> requests.Response:
+    """Serve a recorded response, or raise CassetteMiss / the recorded failure."""
+    if _state["latency"]:
+        time.sleep(_state["latency"])
+    with _lock:
+        rec = _load_index().get(request_key(method, url))
+    if rec is None:
+        raise CassetteMiss(f"No recording for {method.upper()} {url}")
+    if "error" in rec:
+        raise requests.ConnectionError(f"(replayed) {rec['error']}")
+    with open(_blob_path(rec["blob"]), "rb") as fh:
+        body = fh.read()
+    return build_response(url, rec["status"], body, rec.get("headers"), rec.get("encoding"), final_url=rec["url"])
+
+
+def build_response(url, status, body, headers=None, encoding=None, final_url=None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response.headers = CaseInsensitiveDict(headers or {})
+    response.encoding = encoding
+    response.url = final_url or url
+    response.request = requests.Request("GET", url).prepare()
+    response.from_cassette = True
+    return response
+
+
+def acknowledge_upload(url, payload) -> requests.Response:
+    """Local stand-in for an API POST while replaying (nothing leaves the machine)."""
+    count = len(payload.get("events", [])) if isinstance(payload, dict) else 1
+    body = json.dumps({"received": count, "inserted": 0, "duplicates": 0, "failed": 0, "replayed": True})
+    return build_response(url, 200, body.encode("utf-8"), {"Content-Type": "application/json"}, "utf-8")
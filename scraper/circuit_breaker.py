@@ -0,0 +1,143 @@
+# scraper/circuit_breaker.py
+"""
+Per-domain circuit breaker and retry budget for the shared fetch path.
+
+After HTTP_BREAKER_THRESHOLD consecutive failures (connection errors,
+timeouts, 5xx) a host's breaker opens and every further request to it fails
+immediately with `CircuitOpenError` for the rest of the run, instead of each
+URL paying the full timeout.
+
+Open breakers are saved to disk. On the next run (within
+HTTP_BREAKER_COOLDOWN seconds, 48h by default so a host that was down for
+last night's cron run is still remembered tonight, even if a run is late)
+the host starts half-open: a single probe with a short timeout decides
+whether it is back, so a source that is known to be down costs one cheap
+request rather than a full scrape. Other requests to the host wait for the
+probe's verdict instead of failing while it is in flight.
+
+Transient failures are retried with jittered exponential backoff, drawing
+from a retry budget shared by the whole run (HTTP_RETRY_BUDGET).
+"""
+
+import json
+import os
+import random
+import threading
+import time
+
+import requests
+
+STATE_FILE = os.getenv(
+    "HTTP_BREAKER_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "breakers.json"),
+)
+THRESHOLD = int(os.getenv("HTTP_BREAKER_THRESHOLD", "5"))
+COOLDOWN_SECONDS = int(os.getenv("HTTP_BREAKER_COOLDOWN", str(48 * 3600)))
+PROBE_TIMEOUT = float(os.getenv("HTTP_BREAKER_PROBE_TIMEOUT", "5"))
+MAX_ATTEMPTS = int(os.getenv("HTTP_MAX_ATTEMPTS", "3"))
+RETRY_BUDGET = int(os.getenv("HTTP_RETRY_BUDGET", "100"))
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 8.0
+
+# Statuses that mean "host is struggling" rather than "this URL is wrong"
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised instead of contacting a host whose breaker is open."""
+
+
+_lock = threading.Lock()
+_probe_done = threading.Condition(_lock)
+_hosts = None
+_retries_left = RETRY_BUDGET
+
+
+def _load():
+    global _hosts
+    if _hosts is not None:
+        return _hosts
+    _hosts = {}
+    try:
+        with open(STATE_FILE, "r", encoding="utf-8") as fh:
+            saved = json.load(fh)
+    except (OSError, ValueError):
+        saved = {}
+    now = time.time()
+    for host, rec in saved.items():
+        if now - rec.get("opened_at", 0) < COOLDOWN_SECONDS:
+            # Known-down source: allow one cheap probe before trusting it again
+            _hosts[host] = {"state": HALF_OPEN, "failures": 0, "opened_at": rec["opened_at"], "probing": False}
+    return _hosts
+
+
+def _save():
+    opened = {h: {"opened_at": r["opened_at"]} for h, r in _hosts.items() if r["state"] != CLOSED}
+    try:
+        os.makedirs(os.path.dirname(STATE_FILE), exist_ok=True)
+        tmp = f"{STATE_FILE}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(opened, fh, indent=2)
+        os.replace(tmp, STATE_FILE)
+    except OSError:
+        pass
+
+
+def before_request(host, timeout):
+    """
+    Gate a request to `host`. Returns the timeout to use (shortened for a
+    half-open probe) or raises CircuitOpenError. While another thread's
+    probe is in flight, waits (up to twice the probe timeout) for its result.
+    """
+    probe_timeout = min(timeout, PROBE_TIMEOUT) if timeout else PROBE_TIMEOUT
+    with _lock:
+        rec = _load().get(host)
+        if rec is not None and rec["state"] == HALF_OPEN and rec["probing"]:
+            _probe_done.wait_for(lambda: not rec["probing"], timeout=2 * probe_timeout)
+        if rec is None or rec["state"] == CLOSED:
+            return timeout
+        if rec["state"] == HALF_OPEN and not rec["probing"]:
+            rec["probing"] = True
+            return probe_timeout
+    raise CircuitOpenError(f"Circuit open for {host}; skipping request")
+
+
+def record_success(host):
+    with _lock:
+        rec = _load().get(host)
+        if rec is None:
+            return
+        was_open = rec["state"] != CLOSED
+        rec.update(state=CLOSED, failures=0, probing=False)
+        _probe_done.notify_all()
+        if was_open:
+            print(f"🔌 {host} is reachable again; circuit closed")
+            _save()
+
+
+def record_failure(host):
+    with _lock:
+        rec = _load().setdefault(host, {"state": CLOSED, "failures": 0, "opened_at": 0, "probing": False})
+        rec["failures"] += 1
+        if rec["state"] == HALF_OPEN or (rec["state"] == CLOSED and rec["failures"] >= THRESHOLD):
+            rec.update(state=OPEN, opened_at=time.time(), probing=False)
+            _probe_done.notify_all()
+            print(f"⛔ {host} failed {rec['failures']} time(s) in a row; failing fast for the rest of the run")
+            _save()
+
+
+def take_retry() -> bool:
+    """Consume one retry from the run-wide budget; False once it is spent."""
+    global _retries_left
+    with _lock:
+        if _retries_left <= 0:
+            return False
+        _retries_left -= 1
+        return True
+
+
+def backoff(attempt) -> float:
+    """Full-jitter exponential backoff for retry number `attempt` (1-based)."""
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * (2 ** attempt)))
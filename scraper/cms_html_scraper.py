@@ -1,10 +1,9 @@
 # scraper/cms_html_scraper.py
 
 from base_scraper import BaseScraper
-from post_event import post_event
-from bs4 import BeautifulSoup
-from dateutil import parser
+from date_extract import parse_date
 from datetime import timedelta
+from event_model import api_event
 
 class CMSHTMLScraper(BaseScraper):
     """
@@ -13,15 +12,14 @@ class CMSHTMLScraper(BaseScraper):
     def __init__(self):
         super().__init__(
             "CMS Calendar",
-            "https://www.cms.k12.nc.us/calendar",
-            headers={"User-Agent":"Mozilla/5.0"}
+            "https://www.cms.k12.nc.us/calendar"
         )
         self.org_id = 41
         self.lat, self.lon = 35.2271, -80.8431
         self.event_type = "school_holiday"
 
     def parse_events(self, html):
-        soup = BeautifulSoup(html, "html.parser")
+        soup = self.get_soup(html)
         events = []
         # Each event in list with class .event-entry
         for item in soup.select("div.event-entry"):  
@@ -31,26 +29,21 @@ class CMSHTMLScraper(BaseScraper):
                 continue
 
             try:
-                start = parser.parse(date_tag.get("datetime") or date_tag.text, fuzzy=True)
+                start = parse_date(date_tag.get("datetime") or date_tag.text, source="cms_html")
                 end   = start + timedelta(hours=1)
             except Exception:
                 continue
 
-            events.append({
-                "title": title_tag.text.strip(),
-                "description": "",
-                "start_date": start.isoformat(),
-                "end_date": end.isoformat(),
-                "location_name": "CMS District",
-                "latitude": self.lat,
-                "longitude": self.lon,
-                "organization_id": self.org_id,
-                "event_type": self.event_type,
-                "source_url": self.base_url
-            })
+            events.append(api_event(
+                title_tag.text.strip(),
+                start,
+                end,
+                location_name="CMS District",
+                latitude=self.lat,
+                longitude=self.lon,
+                organization_id=self.org_id,
+                event_type=self.event_type,
+                source_url=self.base_url,
+            ))
         print(f"✅ Found {len(events)} CMS events")
         return events
-
-    def run_and_post(self):
-        for e in self.run():
-            post_event(e)
\ No newline at end of file
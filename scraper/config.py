@@ -25,3 +25,15 @@ SOURCES = {
     # Add more schools here as needed
 }
 
+
+# Per-host request pacing for http_client: host -> (requests per second, burst).
+# Hosts are matched without a leading "www."; unlisted hosts use the defaults in
+# rate_limit.py (HTTP_RATE_PER_SEC / HTTP_RATE_BURST).
+HOST_RATE_LIMITS = {
+    # Shared by DurhamICS, DurhamCity, AgendaCenter, BPAC and Cultural Advisory scrapers
+    "durhamnc.gov": (3.0, 6),
+    # Orange County HTML and CivicPlus ICS scrapers
+    "orangecountync.gov": (2.0, 4),
+    "appellate.nccourts.org": (1.0, 2),
+    "carync.iqm2.com": (2.0, 4),
+}
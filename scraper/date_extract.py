@@ -0,0 +1,292 @@
+# scraper/date_extract.py
+"""
+Shared, memoized date parsing for the HTML scrapers.
+
+`parse_date(text, source=...)` is a drop-in for
+`dateutil.parser.parse(text, fuzzy=True)`, but much cheaper on repeat work:
+
+  * Results (and failures) are kept in an LRU memo keyed by the raw string,
+    so the same "Monday, January 6, 2025" seen on a list page and again on
+    a detail page is parsed once.
+  * Each source learns its date shape. The first time fuzzy parsing
+    succeeds, the precompiled extractors below are tried on the same string;
+    one that reproduces fuzzy's exact result becomes that source's fast path.
+    Later strings go through that regex first and only fall back to fuzzy
+    parsing when it doesn't match cleanly.
+
+A fast-path match is only trusted when the text around it holds no other
+digits (e.g. a separate time or year), which fuzzy parsing would fold in.
+
+`find_date(text, source=...)` returns the first date found in a longer text
+(a whole page or card) instead of fuzzy-parsing every token in it, and
+`scan_dates(text)` walks every date and time span in a large buffer (PDF
+dumps, agenda tables) in a single regex pass.
+"""
+
+import os
+import re
+import threading
+from collections import OrderedDict, namedtuple
+from datetime import datetime, time
+
+
+MEMO_SIZE = int(os.getenv("DATE_MEMO_SIZE", "4096"))
+
+_MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+_WEEKDAY = r"(?:(?:mon|tue|tues|wed|wednes|thu|thur|thurs|fri|sat|satur|sun)(?:day)?\.?,?\s+)?"
+_MONTH = r"(?P<month>jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|sept?(?:ember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?"
+_TIME = (
+    r"(?:,?\s+(?:at\s+|@\s*)?(?P<hour>\d{1,2})(?::(?P<minute>\d{2}))?\s*(?P<ampm>[ap])\.?m\.?"
+    r"|,?\s+(?:at\s+)?(?P<hour24>\d{1,2}):(?P<minute24>\d{2}))?"
+)
+
+
+def _from_iso(m):
+    value = m.group(0).replace(" ", "T")
+    if value.endswith(("Z", "z")):
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value)
+
+
+def _clock(m):
+    if m.group("hour"):
+        hour = int(m.group("hour")) % 12
+        if m.group("ampm").lower() == "p":
+            hour += 12
+        return hour, int(m.group("minute") or 0)
+    if m.group("hour24"):
+        return int(m.group("hour24")), int(m.group("minute24"))
+    return 0, 0
+
+
+def _from_month_name(m):
+    month = _MONTHS[m.group("month")[:3].lower()]
+    return datetime(int(m.group("year")), month, int(m.group("day")), *_clock(m))
+
+
+def _from_numeric(m):
+    return datetime(int(m.group("year")), int(m.group("month")), int(m.group("day")), *_clock(m))
+
+
+# name -> (compiled pattern, builder). Every pattern requires a 4-digit year so
+# the result never depends on the parse-time "default" date.
+EXTRACTORS = {
+    "iso": (
+        re.compile(r"\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d{1,6})?)?(?:[zZ]|[+-]\d{2}:\d{2})?)?"),
+        _from_iso,
+    ),
+    "month-day-year": (
+        re.compile(_WEEKDAY + _MONTH + r"\s+(?P<day>\d{1,2})(?:st|nd|rd|th)?,?\s+(?P<year>\d{4})" + _TIME, re.I),
+        _from_month_name,
+    ),
+    "m/d/y": (
+        re.compile(_WEEKDAY + r"(?P<month>\d{1,2})/(?P<day>\d{1,2})/(?P<year>\d{4})" + _TIME, re.I),
+        _from_numeric,
+    ),
+}
+
+# Year-less dates for dated_lines only ("March 4 – Oral argument" in a court
+# calendar), plus the "March 2026" headings that supply their year
+_YEARLESS_RE = re.compile(
+    r"(?P<heading>\b" + _MONTH.replace("(?P<month>", "(?:") + r",?\s+(?P<heading_year>\d{4})\b)"
+    r"|\b" + _WEEKDAY + _MONTH + r"\s+(?P<day>\d{1,2})(?:st|nd|rd|th)?\b" + _TIME,
+    re.I,
+)
+
+_CLOCK_RE = re.compile(r"(?P<hour>\d{1,2})(?::(?P<minute>\d{2}))?\s*(?P<ampm>[ap])\.?m\.?|(?P<noon>noon)", re.I)
+
+
+def _scanner():
+    # One alternation over every extractor (inner group names dropped so they
+    # don't clash), then lone clock times. Dates come first so a time right
+    # after a date is consumed by the date's own time group.
+    parts = [
+        f"(?P<{name.replace('-', '_').replace('/', '_')}>{re.sub(r'[(][?]P<[a-z0-9]+>', '(?:', pattern.pattern)})"
+        for name, (pattern, _build) in EXTRACTORS.items()
+    ]
+    parts.append(r"(?P<clock>\b(?:\d{1,2}(?::\d{2})?\s*[ap]\.?m\.?|noon)\b)")
+    return re.compile("|".join(parts), re.I)
+
+
+_SCAN_RE = _scanner()
+_SCAN_NAMES = {name.replace("-", "_").replace("/", "_"): name for name in EXTRACTORS}
+
+# kind is "date" (value: datetime) or "time" (value: datetime.time)
+DateSpan = namedtuple("DateSpan", "start end kind value")
+
+_DIGIT_RE = re.compile(r"\d")
+_FAILED = object()
+
+_lock = threading.Lock()
+_memo: OrderedDict = OrderedDict()
+_learned: dict[str, str] = {}
+
+
+def _extract(name, text, whole=True):
+    pattern, build = EXTRACTORS[name]
+    m = pattern.search(text)
+    if not m:
+        return None
+    # Stray digits outside the match (another time, a year) would change fuzzy's answer
+    if whole and _DIGIT_RE.search(text[:m.start()] + text[m.end():]):
+        return None
+    try:
+        return build(m)
+    except ValueError:
+        return None
+
+
+def _learn(source, text, expected):
+    for name in EXTRACTORS:
+        if _extract(name, text) == expected:
+            _learned[source] = name
+            return
+
+
+def _memo_get(key):
+    with _lock:
+        if key in _memo:
+            _memo.move_to_end(key)
+            return _memo[key]
+    return None
+
+
+def _memo_put(key, value):
+    with _lock:
+        _memo[key] = value
+        _memo.move_to_end(key)
+        while len(_memo) > MEMO_SIZE:
+            _memo.popitem(last=False)
+
+
+def parse_date(text, source=None, fuzzy=True, default=None) -> datetime:
+    """
+    Parse `text` like dateutil.parser.parse(text, fuzzy=fuzzy, default=default).
+    `source` names the scraper so its date format can be learned. Raises
+    ValueError when no date is found.
+    """
+    key = (text, fuzzy, default)
+    hit = _memo_get(key)
+    if hit is _FAILED:
+        raise ValueError(f"No date found in {text[:60]!r}")
+    if hit is not None:
+        return hit
+
+    norm = " ".join(text.split())
+    learned = _learned.get(source) if source and default is None else None
+    dt = _extract(learned, norm) if learned else None
+    if dt is None:
+        from dateutil import parser as dateutil_parser  # deferred: only the slow path needs it
+        try:
+            dt = dateutil_parser.parse(norm, fuzzy=fuzzy, default=default)
+        except (ValueError, OverflowError):
+            _memo_put(key, _FAILED)
+            raise ValueError(f"No date found in {text[:60]!r}") from None
+        if source and default is None:
+            _learn(source, norm, dt)
+    _memo_put(key, dt)
+    return dt
+
+
+def scan_dates(text):
+    """
+    Yield a DateSpan for every date (with any attached time) and every lone
+    clock time in `text`, in order, from a single pass of one compiled regex.
+    Offsets index into `text` as given.
+    """
+    for m in _SCAN_RE.finditer(text):
+        kind = m.lastgroup
+        if kind == "clock":
+            c = _CLOCK_RE.fullmatch(m.group(0))
+            if not c:
+                continue
+            if c.group("noon"):
+                value = time(12, 0)
+            else:
+                hour = int(c.group("hour"))
+                if hour > 12:
+                    continue
+                value = time(hour % 12 + (12 if c.group("ampm").lower() == "p" else 0), int(c.group("minute") or 0))
+            yield DateSpan(m.start(), m.end(), "time", value)
+            continue
+        pattern, build = EXTRACTORS[_SCAN_NAMES[kind]]
+        try:
+            value = build(pattern.match(text, m.start()))
+        except (ValueError, AttributeError):
+            continue
+        yield DateSpan(m.start(), m.end(), "date", value)
+
+
+def _yearless_lines(text, start, end, year):
+    """dated_lines over text[start:end], which holds no full date; returns the year in force at `end`."""
+    last_line = start - 1
+    for m in _YEARLESS_RE.finditer(text, start, end):
+        if m.group("heading"):
+            year = int(m.group("heading_year"))
+            continue
+        if m.start() <= last_line:
+            continue
+        try:
+            dt = datetime(year, _MONTHS[m.group("month")[:3].lower()], int(m.group("day")), *_clock(m))
+        except ValueError:
+            continue
+        line_start = text.rfind("\n", 0, m.start()) + 1
+        line_end = text.find("\n", m.end(), end)
+        last_line = end if line_end < 0 else line_end
+        yield text[line_start:last_line].strip(), dt
+    return year
+
+
+def dated_lines(text, default=None):
+    """
+    Yield (line, datetime) for each line of `text` that contains a date,
+    using the first date on the line. Lines without one are never parsed.
+    A month and day without a year ("March 4 – Oral argument") takes the
+    year of the last full date or "March 2026" heading above it, else the
+    year of `default` (today).
+    """
+    year = (default or datetime.now()).year
+    last_line = 0
+    for span in scan_dates(text):
+        if span.kind != "date" or span.start < last_line:
+            continue
+        line_start = text.rfind("\n", 0, span.start) + 1
+        year = yield from _yearless_lines(text, last_line, line_start, year)
+        year = span.value.year
+        line_end = text.find("\n", span.end)
+        last_line = len(text) if line_end < 0 else line_end
+        yield text[line_start:last_line].strip(), span.value
+    yield from _yearless_lines(text, last_line, len(text), year)
+
+
+def first_date(text):
+    """First date the scanner finds in `text`, or None (no fuzzy fallback)."""
+    for span in scan_dates(text):
+        if span.kind == "date":
+            return span.value
+    return None
+
+
+def find_date(text, source=None, fuzzy=True):
+    """
+    First date in a longer text (a card or a whole page), or None.
+    Uses the scanner and only fuzzy-parses the text if it finds no date.
+    """
+    dt = first_date(text)
+    if dt is not None:
+        return dt
+    norm = " ".join(text.split())
+    try:
+        return parse_date(norm, source=source, fuzzy=fuzzy)
+    except ValueError:
+        return None
+
+
+def reset():
+    """Forget memoized results and learned formats (mainly for tests)."""
+    with _lock:
+        _memo.clear()
+        _learned.clear()
@@ -0,0 +1,113 @@
+# scraper/dedup.py
+"""
+Cross-scraper duplicate suppression before upload.
+
+The same meeting is often scraped more than once: Durham City's ICS feed,
+calendar pages and Agenda Center all list council meetings, and UNCC/ECU
+have both ICS and HTML scrapers. `canonical_key(event)` identifies an event
+independently of how a source formats it (normalized title, start instant
+in UTC to the minute, organization), and `drop_repeats(events)` removes
+copies before any HTTP call:
+
+* within the batch itself;
+* across scrapers, via the claims kept in state_store: the first source to
+  emit a key owns it, and keeps uploading that meeting run after run rather
+  than whichever scraper happens to finish first. Owners resolved in this
+  run are held in memory, so each key hits the database once per run.
+  Cassette replays read claims but never write them.
+"""
+
+import re
+import threading
+import unicodedata
+from datetime import datetime, timezone
+
+import cassette
+import state_store
+
+try:
+    from zoneinfo import ZoneInfo
+    LOCAL_TZ = ZoneInfo("America/New_York")
+except Exception:  # no tz database: treat naive times as UTC
+    LOCAL_TZ = timezone.utc
+
+_NON_WORD_RE = re.compile(r"[^\w]+")
+
+_lock = threading.Lock()
+_run_owners: dict[str, str] = {}
+
+
+def normalize_title(title) -> str:
+    """Casefolded, accent- and punctuation-free title with single spaces."""
+    text = unicodedata.normalize("NFKD", str(title or ""))
+    text = "".join(c for c in text if not unicodedata.combining(c)).casefold().replace("&", " and ")
+    return " ".join(_NON_WORD_RE.sub(" ", text).split())
+
+
+def start_instant(value) -> str:
+    """The event start as a UTC minute ("2025-01-06T23:00Z"); naive times are Eastern."""
+    raw = str(value or "").strip()
+    try:
+        dt = datetime.fromisoformat(raw)
+    except ValueError:
+        return raw
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=LOCAL_TZ)
+    return dt.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%MZ")
+
+
+def canonical_key(event) -> str:
+    return "|".join((
+        normalize_title(event.get("title")),
+        start_instant(event.get("start_date")),
+        str(event.get("organization_id") or ""),
+    ))
+
+
+def drop_repeats(events, source=None):
+    """
+    `events` minus copies of events already emitted by this batch, by another
+    scraper in this run, or owned by another scraper from earlier runs.
+    Returns (kept, dropped_count).
+    """
+    if not events:
+        return [], 0
+    source = source or state_store.current_source()
+    keys = [canonical_key(ev) for ev in events]
+    with _lock:
+        owners = {k: _run_owners[k] for k in keys if k in _run_owners}
+        unknown = [k for k in dict.fromkeys(keys) if k not in owners]
+        if unknown:
+            # The claim is decided (and recorded) in the state store, so the
+            # first scraper to emit a key this run wins unless another owns it.
+            # Only keys claimed by their owner are cached: an owner that has
+            # not emitted yet still refreshes its claim when it does. Replays
+            # resolve owners without recording claims.
+            claimed = state_store.claim(unknown, source, record=not cassette.replaying())
+            owners.update(claimed)
+            _run_owners.update((k, owner) for k, owner in claimed.items() if owner == source)
+
+    kept, seen = [], set()
+    for ev, key in zip(events, keys):
+        if key in seen or owners.get(key) != source:
+            continue
+        seen.add(key)
+        kept.append(ev)
+    return kept, len(events) - len(kept)
+
+
+def reset_run():
+    """Forget the in-run index (the persistent claims are kept)."""
+    with _lock:
+        _run_owners.clear()
+
+
+def select_new(events):
+    """
+    The events worth sending: repeats dropped (drop_repeats), then anything
+    unchanged since it was last delivered (state_store.changed).
+    Returns (fresh, skip_counts) where skip_counts feeds the upload stats.
+    """
+    unique, repeats = drop_repeats(events)
+    fresh = state_store.changed(unique)
+    return fresh, {"skipped_unchanged": len(unique) - len(fresh), "skipped_duplicates": repeats}
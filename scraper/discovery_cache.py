@@ -0,0 +1,97 @@
+# scraper/discovery_cache.py
+"""
+Persistent cache of discovered URLs (valid CivicPlus category pages, ICS
+export links, ...) so scrapers don't re-probe hundreds of candidate URLs on
+every run.
+
+`get_or_discover(name, discover)` returns the remembered URLs for `name`.
+Entries younger than DISCOVERY_REPROBE_DAYS are used as-is; older ones are
+still used for this run while `discover` re-probes on a background thread
+and refreshes the entry. Entries older than DISCOVERY_TTL_DAYS, or missing,
+are discovered synchronously. Empty results are never stored, so a site
+that is down can't wipe out what we know about it.
+"""
+
+import json
+import os
+import threading
+import time
+
+CACHE_FILE = os.getenv(
+    "DISCOVERY_CACHE_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "discovery.json"),
+)
+REPROBE_SECONDS = float(os.getenv("DISCOVERY_REPROBE_DAYS", "3")) * 86400
+TTL_SECONDS = float(os.getenv("DISCOVERY_TTL_DAYS", "14")) * 86400
+
+_lock = threading.Lock()
+_entries = None
+_background: dict[str, threading.Thread] = {}
+
+
+def _load():
+    global _entries
+    if _entries is None:
+        try:
+            with open(CACHE_FILE, "r", encoding="utf-8") as fh:
+                _entries = json.load(fh)
+        except (OSError, ValueError):
+            _entries = {}
+    return _entries
+
+
+def _save():
+    try:
+        os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+        tmp = f"{CACHE_FILE}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(_entries, fh, indent=2)
+        os.replace(tmp, CACHE_FILE)
+    except OSError:
+        pass
+
+
+def store(name, urls):
+    urls = list(dict.fromkeys(urls))
+    if not urls:
+        return
+    with _lock:
+        _load()[name] = {"urls": urls, "discovered_at": time.time()}
+        _save()
+
+
+def _refresh(name, discover):
+    try:
+        store(name, discover())
+        print(f"🔁 Background re-probe refreshed {name}")
+    except Exception as e:
+        print(f"⚠️ Background re-probe of {name} failed: {e}")
+    finally:
+        with _lock:
+            _background.pop(name, None)
+
+
+def get_or_discover(name, discover) -> list:
+    """Known URLs for `name`, calling `discover()` (returns a list of URLs) only when needed."""
+    with _lock:
+        entry = _load().get(name)
+    age = time.time() - entry["discovered_at"] if entry else None
+
+    if entry is None or age > TTL_SECONDS:
+        urls = list(dict.fromkeys(discover()))
+        store(name, urls)
+        return urls
+
+    if age > REPROBE_SECONDS:
+        with _lock:
+            if name not in _background:
+                t = threading.Thread(target=_refresh, args=(name, discover), name=f"reprobe:{name}")
+                _background[name] = t
+                t.start()
+    return list(entry["urls"])
+
+
+def wait_for_background(timeout=None):
+    """Let in-flight re-probes finish (the runner calls this before exiting)."""
+    for t in list(_background.values()):
+        t.join(timeout)
@@ -1,6 +1,7 @@
-import requests
-from api_client import batch_post
+from http_client import http_get
+from event_sink import publish
 from datetime import datetime, timedelta
+from event_model import api_event
 
 class DukeJsonScraper:
     def __init__(self):
@@ -19,7 +20,7 @@ class DukeJsonScraper:
     def run_and_post(self):
         print(f"🔎 Fetching JSON: {self.url}")
         try:
-            res = requests.get(self.url, params=self.params, timeout=10)
+            res = http_get(self.url, params=self.params, timeout=10)
             res.raise_for_status()
             data = res.json()
         except Exception as e:
@@ -37,19 +38,19 @@ class DukeJsonScraper:
             url   = ev.get("url")
             loc   = ev.get("venue", {}).get("name", "Duke University")
 
-            payloads.append({
-                "title":         title,
-                "description":   (ev.get("description") or "")[:500],
-                "start_date":    start,
-                "end_date":      end,
-                "location_name": loc,
-                "latitude":      self.lat,
-                "longitude":     self.lon,
-                "organization_id": self.org_id,
-                "event_type":    self.event_type,
-                "source_url":    url
-            })
+            payloads.append(api_event(
+                title,
+                start,
+                end,
+                description=ev.get("description") or "",
+                location_name=loc,
+                latitude=self.lat,
+                longitude=self.lon,
+                organization_id=self.org_id,
+                event_type=self.event_type,
+                source_url=url,
+            ))
 
         if payloads:
-            stats = batch_post(payloads)
+            stats = publish(payloads)
             print("Duke JSON batch:", stats)
@@ -1,28 +1,28 @@
 # scraper/duke_scraper.py
 
 from base_scraper import BaseScraper
-from api_client import batch_post
-from datetime import timedelta
-from bs4 import BeautifulSoup
-from dateutil import parser
+from event_sink import publish
+from date_extract import parse_date
+from event_model import api_event
+import structured_data
 
 class DukeScraper(BaseScraper):
     def __init__(self):
         super().__init__(
             "Duke University",
-            "https://calendar.duke.edu/",
-            headers={
-                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-                "Accept-Language": "en-US,en;q=0.5",
-                "Accept-Encoding": "gzip, deflate",
-                "Connection": "keep-alive",
-                "Upgrade-Insecure-Requests": "1"
-            }
+            "https://calendar.duke.edu/"
         )
 
     def parse_events(self, html):
-        soup = BeautifulSoup(html, "html.parser")
+        # Prefer schema.org Event data (JSON-LD or microdata) when the page has it
+        events = structured_data.extract_events(
+            html, self.base_url, 3, "Duke University", 36.0014, -78.9382, "academic"
+        )
+        if events:
+            print(f"✅ Found {len(events)} Duke events (structured data)")
+            return events
+
+        soup = self.get_soup(html)
         events = []
 
         # Duke uses single-events-container for each event
@@ -48,25 +48,22 @@ class DukeScraper(BaseScraper):
             datetime_str = f"{date_str} {time_str}".strip()
 
             try:
-                start = parser.parse(datetime_str, fuzzy=True)
-                # Default to 1-hour duration if no end time specified
-                end = start + timedelta(hours=1)
+                start = parse_date(datetime_str, source="duke")
             except Exception as e:
                 print(f"❌ Duke date parse error '{title}': {e}")
                 continue
 
-            events.append({
-                "title":          title,
-                "description":    "",
-                "start_date":     start.isoformat(),
-                "end_date":       end.isoformat(),
-                "location_name":  location_tag.text.strip() if location_tag else "Duke University",
-                "latitude":       36.0014,
-                "longitude":     -78.9382,
-                "organization_id": 3,
-                "event_type":     "academic",
-                "source_url":     url
-            })
+            # No end time on the card: api_event defaults to a 1-hour duration
+            events.append(api_event(
+                title,
+                start,
+                location_name=location_tag.text.strip() if location_tag else "Duke University",
+                latitude=36.0014,
+                longitude=-78.9382,
+                organization_id=3,
+                event_type="academic",
+                source_url=url,
+            ))
 
         print(f"✅ Found {len(events)} Duke events")
         return events
@@ -74,5 +71,5 @@ class DukeScraper(BaseScraper):
     def run_and_post(self):
         events = self.run()
         if events:
-            stats = batch_post(events)
+            stats = publish(events)
             print("Duke batch:", stats)
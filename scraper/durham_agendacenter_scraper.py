@@ -1,8 +1,8 @@
-import requests
-from bs4 import BeautifulSoup
-from dateutil import parser
-from datetime import timedelta
-from api_client import batch_post
+from http_client import http_get
+from html_parse import make_soup
+from date_extract import first_date
+from event_sink import publish
+from event_model import api_event
 
 
 class DurhamAgendaCenterScraper:
@@ -28,14 +28,13 @@ class DurhamAgendaCenterScraper:
     event_type = "government"
 
     def fetch(self, url: str) -> str:
-        headers = {"User-Agent": "Mozilla/5.0"}
-        r = requests.get(url, headers=headers, timeout=15)
+        r = http_get(url, timeout=15)
         r.raise_for_status()
         return r.text
 
     def parse_board(self, name: str, url: str):
         html = self.fetch(url)
-        soup = BeautifulSoup(html, "html.parser")
+        soup = make_soup(html)
         events = []
         # Table rows often under a listing; extract all agenda rows
         for row in soup.select("table tr"):
@@ -45,10 +44,9 @@ class DurhamAgendaCenterScraper:
             text = row.get_text(" ", strip=True)
             if not text:
                 continue
-            # Find a date in the row text
-            try:
-                dt = parser.parse(text, fuzzy=True)
-            except Exception:
+            # First date in the row (the meeting date; later ones are "Posted ..." stamps)
+            dt = first_date(text)
+            if not dt:
                 continue
             title = f"{name} Meeting"
             # Prefer the agenda link as source URL
@@ -59,18 +57,17 @@ class DurhamAgendaCenterScraper:
             else:
                 source_url = href or url
 
-            events.append({
-                "title": title,
-                "description": "",
-                "start_date": dt.isoformat(),
-                "end_date": (dt + timedelta(hours=2)).isoformat(),
-                "location_name": "Durham, NC",
-                "latitude": self.lat,
-                "longitude": self.lon,
-                "organization_id": self.org_id,
-                "event_type": self.event_type,
-                "source_url": source_url,
-            })
+            events.append(api_event(
+                title,
+                dt,
+                default_hours=2,
+                location_name="Durham, NC",
+                latitude=self.lat,
+                longitude=self.lon,
+                organization_id=self.org_id,
+                event_type=self.event_type,
+                source_url=source_url,
+            ))
         return events
 
     def run_and_post(self):
@@ -82,7 +79,7 @@ class DurhamAgendaCenterScraper:
                 print(f"❌ Error scraping {name}: {e}")
         print(f"✅ Durham Agenda Center parsed {len(all_events)} events")
         if all_events:
-            print("Durham Agenda Center batch:", batch_post(all_events))
+            print("Durham Agenda Center batch:", publish(all_events))
 
 
 if __name__ == "__main__":
@@ -1,9 +1,10 @@
 import re
 from datetime import datetime, timedelta
-from dateutil import parser
-import requests
-from bs4 import BeautifulSoup
-from api_client import batch_post
+from date_extract import parse_date
+from http_client import http_get
+from html_parse import make_soup
+from event_sink import publish
+from event_model import api_event
 
 
 class DurhamBPACScraper:
@@ -14,14 +15,13 @@ class DurhamBPACScraper:
     event_type = "government"
 
     def fetch(self) -> str:
-        headers = {"User-Agent": "Mozilla/5.0"}
-        r = requests.get(self.url, headers=headers, timeout=15)
+        r = http_get(self.url, timeout=15)
         r.raise_for_status()
         return r.text
 
     def parse(self):
         html = self.fetch()
-        soup = BeautifulSoup(html, "html.parser")
+        soup = make_soup(html)
         text = soup.get_text("\n")
 
         # Meeting time: third Tuesday monthly, stated as 7 p.m. to 9 p.m.
@@ -39,25 +39,25 @@ class DurhamBPACScraper:
         for m, d in re.findall(r"\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(\d{1,2})\b", text):
             datestr = f"{m} {d}, {year} {default_start_time}"
             try:
-                start = parser.parse(datestr)
-                end = parser.parse(f"{m} {d}, {year} {default_end_time}")
+                start = parse_date(datestr, source="durham_bpac", fuzzy=False)
+                end = parse_date(f"{m} {d}, {year} {default_end_time}", source="durham_bpac", fuzzy=False)
             except Exception:
                 continue
             # Drop past events older than 60 days
             if start < datetime.utcnow() - timedelta(days=60):
                 continue
-            events.append({
-                "title": "Durham BPAC Meeting",
-                "description": "Monthly Bicycle & Pedestrian Advisory Commission meeting.",
-                "start_date": start.isoformat(),
-                "end_date": end.isoformat(),
-                "location_name": "Durham City Hall (or Zoom)",
-                "latitude": self.lat,
-                "longitude": self.lon,
-                "organization_id": self.org_id,
-                "event_type": self.event_type,
-                "source_url": self.url,
-            })
+            events.append(api_event(
+                "Durham BPAC Meeting",
+                start,
+                end,
+                description="Monthly Bicycle & Pedestrian Advisory Commission meeting.",
+                location_name="Durham City Hall (or Zoom)",
+                latitude=self.lat,
+                longitude=self.lon,
+                organization_id=self.org_id,
+                event_type=self.event_type,
+                source_url=self.url,
+            ))
 
         return events
 
@@ -65,7 +65,7 @@ class DurhamBPACScraper:
         events = self.parse()
         print(f"✅ Durham BPAC parsed {len(events)} events")
         if events:
-            print("Durham BPAC batch:", batch_post(events))
+            print("Durham BPAC batch:", publish(events))
 
 
 if __name__ == "__main__":
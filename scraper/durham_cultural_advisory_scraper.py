@@ -1,8 +1,8 @@
-from datetime import timedelta
-from dateutil import parser
-import requests
-from bs4 import BeautifulSoup
-from api_client import batch_post
+from date_extract import parse_date
+from http_client import http_get
+from html_parse import make_soup
+from event_sink import publish
+from event_model import api_event
 
 
 class DurhamCulturalAdvisoryScraper:
@@ -13,14 +13,13 @@ class DurhamCulturalAdvisoryScraper:
     event_type = "government"
 
     def fetch(self) -> str:
-        headers = {"User-Agent": "Mozilla/5.0"}
-        r = requests.get(self.url, headers=headers, timeout=15)
+        r = http_get(self.url, timeout=15)
         r.raise_for_status()
         return r.text
 
     def parse(self):
         html = self.fetch()
-        soup = BeautifulSoup(html, "html.parser")
+        soup = make_soup(html)
         text = soup.get_text("\n", strip=True)
 
         events = []
@@ -31,29 +30,28 @@ class DurhamCulturalAdvisoryScraper:
                 continue
             if any(k in t for k in ["2025", "2026", "Wednesday", "pm", "AM", "September", "October", "November", "December", "January", "February", "March", "April", "May", "June"]):
                 try:
-                    dt = parser.parse(t, fuzzy=True)
+                    dt = parse_date(t, source="durham_cultural_advisory")
                 except Exception:
                     continue
-                end = dt + timedelta(hours=2)
-                events.append({
-                    "title": "Durham Cultural Advisory Board Meeting",
-                    "description": "Monthly DCAB meeting.",
-                    "start_date": dt.isoformat(),
-                    "end_date": end.isoformat(),
-                    "location_name": "General Services Dept or Zoom",
-                    "latitude": self.lat,
-                    "longitude": self.lon,
-                    "organization_id": self.org_id,
-                    "event_type": self.event_type,
-                    "source_url": self.url,
-                })
+                events.append(api_event(
+                    "Durham Cultural Advisory Board Meeting",
+                    dt,
+                    default_hours=2,
+                    description="Monthly DCAB meeting.",
+                    location_name="General Services Dept or Zoom",
+                    latitude=self.lat,
+                    longitude=self.lon,
+                    organization_id=self.org_id,
+                    event_type=self.event_type,
+                    source_url=self.url,
+                ))
         return events
 
     def run_and_post(self):
         events = self.parse()
         print(f"✅ Durham Cultural Advisory parsed {len(events)} events")
         if events:
-            print("Durham Cultural Advisory batch:", batch_post(events))
+            print("Durham Cultural Advisory batch:", publish(events))
 
 
 if __name__ == "__main__":
@@ -1,8 +1,9 @@
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse, parse_qs
+from http_client import http_get, group_by_host
+import discovery_cache
+from link_extract import href_contains, iter_links
+from urllib.parse import urlparse, parse_qs
 from ics_scrapers import ICSUtils
-from api_client import batch_post
+from event_sink import publish
 
 
 class DurhamICSScraper:
@@ -12,20 +13,24 @@ class DurhamICSScraper:
     lat, lon = 35.9940, -78.8986
     event_type = "government"
 
-    def discover_category_pages(self) -> list[str]:
-        headers = {"User-Agent": "Mozilla/5.0"}
+    def discover_category_pages(self, root_html: str | None = None) -> list[str]:
+        # Valid category pages rarely change; re-probe only when the cache says so
+        return discovery_cache.get_or_discover(
+            "durham-ics:category-pages", lambda: self.probe_category_pages(root_html)
+        )
+
+    def probe_category_pages(self, root_html: str | None = None) -> list[str]:
         category_links: list[str] = []
 
         # 1) Try root page for category links
         try:
-            r = requests.get(self.base_url, headers=headers, timeout=15)
-            r.raise_for_status()
-            soup = BeautifulSoup(r.text, "html.parser")
-            for a in soup.select('a[href*="Calendar.aspx?CID="]'):
-                href = a.get("href")
-                if not href:
-                    continue
-                category_links.append(urljoin(self.base_url, href))
+            if root_html is None:
+                r = http_get(self.base_url, timeout=15)
+                r.raise_for_status()
+                root_html = r.text
+            category_links.extend(
+                iter_links(root_html, self.base_url, href_contains("Calendar.aspx?CID="), want_text=False)
+            )
         except Exception as e:
             print(f"⚠️ Could not enumerate categories from root: {e}")
 
@@ -34,7 +39,7 @@ class DurhamICSScraper:
         for cid in likely_cids:
             url = f"{self.base_url}?CID={cid}"
             try:
-                r = requests.get(url, headers=headers, timeout=10)
+                r = http_get(url, timeout=10)
                 if r.status_code == 200 and "Calendar" in r.text:
                     category_links.append(url)
             except Exception:
@@ -45,47 +50,45 @@ class DurhamICSScraper:
         return unique
 
     def discover_ics_links(self) -> list[str]:
-        headers = {"User-Agent": "Mozilla/5.0"}
         ics_links: list[str] = []
+        root_html = None
 
         # Try to find any direct ICS link on the root page
         try:
-            r = requests.get(self.base_url, headers=headers, timeout=15)
+            r = http_get(self.base_url, timeout=15)
             r.raise_for_status()
-            soup = BeautifulSoup(r.text, "html.parser")
-            for a in soup.select('a[href*="/common/modules/iCalendar/export.aspx"]'):
-                ics_links.append(urljoin(self.base_url, a.get("href")))
+            root_html = r.text
+            ics_links.extend(iter_links(
+                root_html, self.base_url, href_contains("/common/modules/iCalendar/export.aspx"), want_text=False
+            ))
         except Exception:
             pass
 
         # Also visit each category page and look for an ICS export link or "Subscribe to iCalendar"
-        for cat_url in self.discover_category_pages():
+        for cat_url in self.discover_category_pages(root_html):
             try:
-                r = requests.get(cat_url, headers=headers, timeout=15)
+                r = http_get(cat_url, timeout=15)
                 r.raise_for_status()
-                soup = BeautifulSoup(r.text, "html.parser")
-                # CivicPlus often hides ICS behind buttons with 'Subscribe to iCalendar' text
-                for a in soup.find_all('a'):
-                    href = a.get('href')
-                    text = (a.get_text() or '').strip().lower()
-                    if not href:
-                        continue
-                    if '/common/modules/iCalendar/export.aspx' in href or 'subscribe to icalendar' in text:
-                        ics_links.append(urljoin(cat_url, href))
-                # Also collect per-event ICS via event IDs present on the page
-                for a in soup.select('a[href*="Calendar.aspx?EID="]'):
-                    href = a.get('href')
-                    if not href:
+                # CivicPlus often hides ICS behind buttons with 'Subscribe to iCalendar' text;
+                # EID detail links give per-event ICS. One tokenizer pass collects both.
+                for url in iter_links(
+                    r.text, cat_url,
+                    lambda href, text: '/common/modules/iCalendar/export.aspx' in href
+                    or 'subscribe to icalendar' in text.strip().lower()
+                    or 'Calendar.aspx?EID=' in href,
+                ):
+                    if 'Calendar.aspx?EID=' not in url:
+                        ics_links.append(url)
                         continue
                     try:
                         # Extract EID integer
-                        q = urlparse(urljoin(cat_url, href))
+                        q = urlparse(url)
                         params = parse_qs(q.query)
                         eid_vals = params.get('EID') or params.get('eid')
                         if not eid_vals:
                             # Fallback: parse from path if formatted like ...EID=1234
-                            if 'EID=' in href:
-                                eid_vals = [href.split('EID=')[1].split('&')[0]]
+                            if 'EID=' in url:
+                                eid_vals = [url.split('EID=')[1].split('&')[0]]
                         if not eid_vals:
                             continue
                         eid = eid_vals[0]
@@ -101,22 +104,15 @@ class DurhamICSScraper:
         return dedup
 
     def run_and_post(self):
-        all_events = []
-        for ics_url in self.discover_ics_links():
-            events = ICSUtils.parse_ics(
-                ics_url,
-                org_id=self.org_id,
-                org_name=self.org_name,
-                lat=self.lat,
-                lon=self.lon,
-                event_type=self.event_type,
-            )
-            all_events.extend(events)
-
-        if all_events:
-            print("Durham ICS batch:", batch_post(all_events))
-        else:
-            print("Durham ICS: no events parsed")
+        events = ICSUtils.parse_feeds(
+            group_by_host(self.discover_ics_links()),
+            org_id=self.org_id,
+            org_name=self.org_name,
+            lat=self.lat,
+            lon=self.lon,
+            event_type=self.event_type,
+        )
+        print("Durham ICS batch:", publish(events))
 
 
 if __name__ == "__main__":
@@ -1,12 +1,25 @@
 # scraper/durham_scraper.py
 
 from base_scraper import BaseScraper
-from api_client import batch_post
-from bs4 import BeautifulSoup
-from dateutil import parser
-from datetime import timedelta
-import requests
-from urllib.parse import urljoin, urlparse, parse_qs
+from event_sink import publish
+from date_extract import find_date, parse_date
+from http_client import http_get, group_by_host
+from html_parse import page_text, text_of
+from link_extract import href_contains, iter_links
+import cassette
+import discovery_cache
+import state_store
+import structured_data
+import sync
+import os
+import time
+from urllib.parse import urlparse, parse_qs
+from event_model import api_event, utc_instant
+
+
+# Detail pages fetched more recently than this are not re-fetched on incremental runs
+DETAIL_RECHECK_SECONDS = float(os.getenv("DURHAM_DETAIL_RECHECK_DAYS", "7")) * 86400
+STATE_SOURCE = "durham-city"
 
 
 class DurhamCityScraper(BaseScraper):
@@ -17,89 +30,133 @@ class DurhamCityScraper(BaseScraper):
     def __init__(self):
         super().__init__(
             "Durham City Meetings",
-            "https://durhamnc.gov/Calendar.aspx",
-            headers={"User-Agent": "Mozilla/5.0"}
+            "https://www.durhamnc.gov/Calendar.aspx"
         )
         self.org_id = 40
         self.lat, self.lon = 35.9940, -78.8986
         self.event_type = "government"
+        self._fetched = {}
 
-    def discover_category_pages(self):
+    def candidate_category_pages(self):
         # Probe a wider range of category IDs
         pages = [self.base_url]
         for cid in range(1, 201):
             pages.append(f"{self.base_url}?CID={cid}")
         return pages
 
-    def extract_event_links(self, html, page_url):
-        soup = BeautifulSoup(html, "html.parser")
-        links = []
-        for a in soup.select('a[href*="Calendar.aspx?EID="]'):
-            href = a.get("href")
-            if not href:
+    def probe_category_pages(self):
+        """Full probe: keep only category pages that actually list events."""
+        valid = []
+        for cat_url in self.candidate_category_pages():
+            try:
+                r = http_get(cat_url, timeout=12)
+                if r.status_code == 200 and self.extract_event_links(r.text, cat_url):
+                    valid.append(cat_url)
+            except Exception:
                 continue
-            links.append(urljoin(page_url, href))
+        return valid
+
+    def discover_category_pages(self):
+        # Known-good CIDs come from the discovery cache; the 200-CID probe only
+        # runs on a cold cache or as a periodic background refresh.
+        return discovery_cache.get_or_discover("durham-city:category-pages", self.probe_category_pages)
+
+    def extract_event_links(self, html, page_url):
+        links = iter_links(html, page_url, href_contains("Calendar.aspx?EID="), want_text=False)
         return list(dict.fromkeys(links))
 
+    @staticmethod
+    def _event_id(url):
+        return parse_qs(urlparse(url).query).get("EID")
+
+    def _entry_for_page(self, structured, html, url):
+        """
+        The structured event this detail page is about. Pages also list related
+        and upcoming events, so match on the EID in the entry's URL, else on
+        the start given by the page's own <time> elements.
+        """
+        eid = self._event_id(url)
+        by_url = [ev for ev in structured if eid and self._event_id(ev["source_url"]) == eid]
+        if len(by_url) == 1:
+            return by_url[0]
+        page_starts = set()
+        for value in self.get_tree(html).xpath("//time/@datetime"):
+            try:
+                page_starts.add(utc_instant(parse_date(value, source="durham")))
+            except Exception:
+                continue
+        for ev in by_url or structured:
+            if utc_instant(ev["start_date"]) in page_starts:
+                return ev
+        return None
+
     def parse_event_detail(self, html, url):
-        soup = BeautifulSoup(html, "html.parser")
+        structured = structured_data.extract_events(
+            html, url, self.org_id, "Durham, NC", self.lat, self.lon, self.event_type
+        )
+        if structured:
+            entry = self._entry_for_page(structured, html, url)
+            if entry:
+                return entry
+        # ~200 detail pages per run: parse with lxml/XPath directly instead of building soup
+        tree = self.get_tree(html)
         # Title: h1 or document title
-        title_tag = soup.select_one("h1, .page-title, #PageTitle")
-        title = (title_tag.get_text(strip=True) if title_tag else (soup.title.get_text(strip=True) if soup.title else "Durham Event"))
+        title_tag = tree.xpath(
+            '(//h1 | //*[contains(concat(" ", normalize-space(@class), " "), " page-title ")] | //*[@id="PageTitle"])[1]'
+        )
+        doc_title = tree.xpath("//title[1]")
+        title = text_of(title_tag[0]) if title_tag else (text_of(doc_title[0]) if doc_title else "Durham Event")
 
         # Try to find date/time via <time> elements
         start = None
-        time_tags = soup.find_all("time")
-        for t in time_tags:
-            dt = t.get("datetime") or t.get_text(strip=True)
+        for t in tree.xpath("//time"):
+            dt = t.get("datetime") or text_of(t)
             if not dt:
                 continue
             try:
-                start = parser.parse(dt, fuzzy=True)
+                start = parse_date(dt, source="durham")
                 break
             except Exception:
                 continue
         if not start:
-            # Fallback: regex-like fuzzy parse across the page text
-            try:
-                start = parser.parse(soup.get_text(" ", strip=True), fuzzy=True)
-            except Exception:
+            # Fallback: first date in the page text (fuzzy parse only if no known shape matches)
+            start = find_date(page_text(tree), source="durham")
+            if not start:
                 return None
-        end = start + timedelta(hours=1)
 
         # Location: look for label or common classes
         location = "Durham, NC"
-        cand = soup.find(string=lambda s: isinstance(s, str) and "Location" in s)
-        if cand and cand.parent:
+        cand = tree.xpath('(//text()[contains(., "Location")][not(ancestor::script) and not(ancestor::style)])[1]')
+        parent = None
+        if cand:
+            parent = cand[0].getparent()
+            if cand[0].is_tail and parent is not None:
+                parent = parent.getparent()
+        if parent is not None:
             # Try sibling text
-            sibling_text = cand.parent.get_text(" ", strip=True)
+            sibling_text = " ".join(s.strip() for s in parent.itertext() if s.strip())
             if ":" in sibling_text:
                 loc = sibling_text.split(":", 1)[1].strip()
                 if loc:
                     location = loc
 
-        return {
-            "title": title,
-            "description": "",
-            "start_date": start.isoformat(),
-            "end_date": end.isoformat(),
-            "location_name": location,
-            "latitude": self.lat,
-            "longitude": self.lon,
-            "organization_id": self.org_id,
-            "event_type": self.event_type,
-            "source_url": url,
-        }
+        return api_event(
+            title,
+            start,
+            location_name=location,
+            latitude=self.lat,
+            longitude=self.lon,
+            organization_id=self.org_id,
+            event_type=self.event_type,
+            source_url=url,
+        )
 
     def run(self):
-        headers = self.headers
-        session = requests.Session()
-        session.headers.update(headers)
         all_event_links = []
         # Collect event links from root and category pages
         for cat_url in self.discover_category_pages():
             try:
-                r = session.get(cat_url, timeout=12)
+                r = http_get(cat_url, timeout=12)
                 if r.status_code != 200:
                     continue
                 all_event_links.extend(self.extract_event_links(r.text, cat_url))
@@ -107,12 +164,24 @@ class DurhamCityScraper(BaseScraper):
                 continue
         all_event_links = list(dict.fromkeys(all_event_links))[:200]
 
+        # Skip detail pages already fetched (and uploaded) within the recheck window.
+        # Not in sync mode: a page left out would count as a retired event.
+        now = time.time()
+        fetched_at = state_store.get_watermark("detail-pages", source=STATE_SOURCE) or {}
+        if state_store.incremental() and not sync.enabled():
+            fresh_links = [u for u in all_event_links if now - fetched_at.get(u, 0) > DETAIL_RECHECK_SECONDS]
+            if len(fresh_links) < len(all_event_links):
+                print(f"⏭️  {len(all_event_links) - len(fresh_links)} Durham detail pages seen recently")
+            all_event_links = fresh_links
+        self._fetched = {}
+
         events = []
-        for ev_url in all_event_links:
+        for ev_url in group_by_host(all_event_links):
             try:
-                r = session.get(ev_url, timeout=12)
+                r = http_get(ev_url, timeout=12)
                 if r.status_code != 200:
                     continue
+                self._fetched[ev_url] = now
                 parsed = self.parse_event_detail(r.text, ev_url)
                 if parsed:
                     events.append(parsed)
@@ -123,9 +192,26 @@ class DurhamCityScraper(BaseScraper):
 
     def run_and_post(self):
         events = self.run()
+        stats = {}
+        if sync.enabled():
+            # The change set may be committed later (run_all_scrapers --sync);
+            # the pages only count as uploaded once it has been applied
+            sync.on_commit(self._remember_fetched)
         if events:
-            stats = batch_post(events)
+            stats = publish(events)
             print("Durham HTML batch:", stats)
+        if not sync.enabled() and "error" not in stats:
+            self._remember_fetched()
+
+    def _remember_fetched(self):
+        """Record the detail pages fetched this run (after a successful upload)."""
+        if not self._fetched or cassette.replaying():
+            return
+        cutoff = time.time() - DETAIL_RECHECK_SECONDS
+        fetched_at = state_store.get_watermark("detail-pages", source=STATE_SOURCE) or {}
+        fetched_at = {u: t for u, t in fetched_at.items() if t > cutoff}
+        fetched_at.update(self._fetched)
+        state_store.set_watermark("detail-pages", fetched_at, source=STATE_SOURCE)
 
     # Implement abstract method to satisfy BaseScraper, not used in this subclass
     def parse_events(self, html):
@@ -1,9 +1,11 @@
-import requests
-from bs4 import BeautifulSoup
-from dateutil import parser
+from http_client import http_get
+from html_parse import make_soup
+from date_extract import parse_date
+import structured_data
 from datetime import timedelta
-from api_client import batch_post
+from event_sink import publish
 from datetime import datetime
+from event_model import api_event
 
 
 class ECUHTMLEventsScraper:
@@ -14,13 +16,13 @@ class ECUHTMLEventsScraper:
     event_type = "university"
 
     def fetch(self, url: str) -> str:
-        headers = {"User-Agent": "Mozilla/5.0"}
-        r = requests.get(url, headers=headers, timeout=15)
+        r = http_get(url, timeout=15)
         r.raise_for_status()
         return r.text
 
+    @structured_data.prefer_structured(default_hours=2)
     def parse_list(self, html: str, source_url: str) -> list[dict]:
-        soup = BeautifulSoup(html, "html.parser")
+        soup = make_soup(html)
         events: list[dict] = []
         for card in soup.select("article, .event, li"):
             title_el = card.find(["h2","h3","a"]) or None
@@ -34,34 +36,33 @@ class ECUHTMLEventsScraper:
                 if not s:
                     continue
                 try:
-                    dt = parser.parse(s, fuzzy=True)
+                    dt = parse_date(s, source="ecu_html")
                     break
                 except Exception:
                     continue
             if not dt:
                 try:
-                    dt = parser.parse(text, fuzzy=True)
+                    dt = parse_date(text, source="ecu_html")
                 except Exception:
                     dt = None
             if not dt:
                 continue
-            end_dt = dt + timedelta(hours=2)
             a = card.find("a")
             url = a.get("href") if a and a.get("href") else source_url
             if url and url.startswith("/"):
                 url = self.base_url.rstrip("/") + url
-            events.append({
-                "title": title,
-                "description": text[:600],
-                "start_date": dt.isoformat(),
-                "end_date": end_dt.isoformat(),
-                "location_name": self.org_name,
-                "latitude": self.lat,
-                "longitude": self.lon,
-                "organization_id": self.org_id,
-                "event_type": self.event_type,
-                "source_url": url,
-            })
+            events.append(api_event(
+                title,
+                dt,
+                default_hours=2,
+                description=text,
+                location_name=self.org_name,
+                latitude=self.lat,
+                longitude=self.lon,
+                organization_id=self.org_id,
+                event_type=self.event_type,
+                source_url=url,
+            ))
         return events
 
     def run_and_post(self):
@@ -94,7 +95,7 @@ class ECUHTMLEventsScraper:
 
         print(f"✅ ECU HTML parsed {len(deduped)} events across {len(pages)} pages")
         if deduped:
-            print("ECU HTML batch:", batch_post(deduped))
+            print("ECU HTML batch:", publish(deduped))
 
 
 if __name__ == "__main__":
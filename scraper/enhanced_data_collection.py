@@ -4,12 +4,17 @@ Enhanced Data Collection for EventPulse NC
 Scales up the database with realistic events to reach 10,000+ events
 """
 
-import requests
 import os
+import sys
 import random
 from datetime import datetime, timedelta
 import time
 
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from event_batch import EventBatch
+from event_sink import publish
+
 API_URL = os.getenv("API_URL", "http://localhost:3001")
 
 # Event templates for better variety
@@ -89,8 +94,8 @@ locations = [
 ]
 
 def generate_events_for_month(year, month, num_events=100):
-    """Generate events distributed across the entire month"""
-    events = []
+    """Generate events distributed across the entire month (as a columnar EventBatch)"""
+    events = EventBatch()
     
     # Get the number of days in the month
     if month == 12:
@@ -137,28 +142,6 @@ def generate_events_for_month(year, month, num_events=100):
     
     return events
 
-def post_event(event):
-    """Post a single event to the API"""
-    try:
-        response = requests.post(f"{API_URL}/api/events", json=event)
-        if response.status_code == 201:
-            print(f"✅ Posted: {event['title']}")
-            return True
-        elif response.status_code == 200:
-            data = response.json()
-            if data.get('duplicate'):
-                print(f"⏭️  Skipped (duplicate): {event['title']}")
-                return False
-            else:
-                print(f"✅ Posted: {event['title']}")
-                return True
-        else:
-            print(f"❌ Failed to post: {event['title']}, status: {response.status_code}")
-            return False
-    except Exception as e:
-        print(f"❌ Error posting event: {e}")
-        return False
-
 def main():
     print("🚀 Starting enhanced data collection for 2025...")
     
@@ -167,7 +150,7 @@ def main():
     september_events = generate_events_for_month(2025, 9, num_events=80)
     october_events = generate_events_for_month(2025, 10, num_events=90)
     
-    all_events = august_events + september_events + october_events
+    all_events = EventBatch.concat([august_events, september_events, october_events])
     
     print(f"📅 Generated {len(all_events)} events for 2025")
     print(f"   - August 2025: {len(august_events)} events")
@@ -175,15 +158,12 @@ def main():
     print(f"   - October 2025: {len(october_events)} events")
     print("📤 Posting events to API (batch mode)...")
     
-    # Batch post to reduce API overhead
-    try:
-        resp = requests.post(f"{API_URL}/api/events/batch", json={"events": all_events}, timeout=30)
-        resp.raise_for_status()
-        stats = resp.json()
-        print(f"\n🎉 Data collection complete!")
-        print(f"📦 Received: {stats.get('received')} • ✅ Inserted: {stats.get('inserted')} • ⏭️ Duplicates: {stats.get('duplicates')} • ❌ Failed: {stats.get('failed')}")
-    except Exception as e:
-        print(f"❌ Batch post failed: {e}")
+    # Vectorized validation/dedup, then chunked, parallel upload (see event_sink.publish)
+    stats = publish(all_events)
+    if "error" in stats:
+        print(f"❌ Batch post failed for {stats.get('failed_chunks')} chunks: {stats['error']}")
+    print(f"\n🎉 Data collection complete!")
+    print(f"📦 Received: {stats.get('received')} • ✅ Inserted: {stats.get('inserted')} • ⏭️ Duplicates: {stats.get('duplicates')} • ❌ Failed: {stats.get('failed')}")
     print(f"🗓️  Events now available for August, September, and October 2025!")
 
 if __name__ == "__main__":
@@ -0,0 +1,288 @@
+# scraper/event_batch.py
+"""
+Columnar (struct-of-arrays) container for large event runs.
+
+Bulk generators and backfills hold tens of thousands of events whose
+organization, location, type and URL strings repeat endlessly. An
+`EventBatch` stores each field as a column instead of one dict per event:
+
+* start/end: UTC microseconds (int64) plus the UTC offset in minutes the
+  value was written with, so it serializes back to the same ISO string
+  (strings that would not round-trip are kept verbatim);
+* latitude/longitude: float64, NaN when absent;
+* organization_id: int32;
+* title, description, location_name, event_type, source_url: dictionary-
+  encoded (`Categories`), each distinct string stored once.
+
+Columns grow as `array.array`s. `validate()` applies sqlite_loader.validate's
+rules to the whole batch at once, `unique_mask(valid)` finds repeats of
+dedup.canonical_key among the valid rows the same way, and `select(mask)`
+keeps the rows wanted. Those three need numpy, which is only imported when they are first called.
+
+Event sinks accept a batch directly: `sink.extend(batch)` (or `publish`)
+drops invalid rows and in-batch repeats up front, then streams the rest
+through the buffer as dicts.
+"""
+
+import math
+from array import array
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+import dedup
+import sqlite_loader
+from event_model import Event, as_datetime
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+ABSENT = -(2 ** 63)        # start/end missing or empty
+INVALID = ABSENT + 1       # start/end present but not an ISO date
+NAIVE = 10000              # added to the offset of values written without one
+REASONS = ("missing_fields", "invalid_date", "invalid_order", "too_long", "invalid_coords")
+TEXT_FIELDS = ("title", "description", "location_name", "event_type", "source_url")
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("EventBatch validation needs numpy (pip install -r requirements.txt)") from None
+    return numpy
+
+
+@lru_cache(maxsize=None)
+def _tz(minutes):
+    return timezone(timedelta(minutes=minutes))
+
+
+def _iso(us, offset):
+    if us in (ABSENT, INVALID):
+        return None
+    naive = offset >= NAIVE // 2
+    if naive:
+        offset -= NAIVE
+    dt = (EPOCH + timedelta(microseconds=us)).astimezone(_tz(offset))
+    return dt.replace(tzinfo=None).isoformat() if naive else dt.isoformat()
+
+
+def _encode_time(value):
+    """(UTC microseconds, offset code, verbatim text or None) for a start/end value."""
+    if value is None or value == "":
+        return ABSENT, 0, value or None
+    dt = as_datetime(value)
+    if not isinstance(dt, datetime):
+        return INVALID, 0, str(value)
+    naive = dt.tzinfo is None
+    if naive:
+        dt = dt.replace(tzinfo=dedup.LOCAL_TZ)
+    offset = dt.utcoffset()
+    if offset % timedelta(minutes=1):
+        return (dt - EPOCH) // timedelta(microseconds=1), 0, dt.isoformat()
+    us = (dt - EPOCH) // timedelta(microseconds=1)
+    code = offset // timedelta(minutes=1) + (NAIVE if naive else 0)
+    text = value if isinstance(value, str) and value != _iso(us, code) else None
+    return us, code, text
+
+
+def _coordinate(value):
+    """Float coordinate; NaN when absent, inf when not a number (fails validation)."""
+    if value is None or value == "":
+        return math.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.inf
+
+
+class Categories:
+    """Dictionary-encoded strings: each distinct value stored once, rows hold int32 codes."""
+
+    __slots__ = ("values", "codes", "_index")
+
+    def __init__(self):
+        self.values = []
+        self.codes = array("i")
+        self._index = {}
+
+    def append(self, value):
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self.values)
+            self.values.append(value)
+        self.codes.append(code)
+
+    def __getitem__(self, row):
+        return self.values[self.codes[row]]
+
+    def __len__(self):
+        return len(self.codes)
+
+    def take(self, rows) -> "Categories":
+        """The column restricted to `rows` (a numpy index array), with unused values dropped."""
+        np = _numpy()
+        used, codes = np.unique(np.frombuffer(self.codes, dtype=np.int32)[rows], return_inverse=True)
+        part = Categories()
+        part.values = [self.values[code] for code in used]
+        part._index = {value: code for code, value in enumerate(part.values)}
+        part.codes = array("i", codes.astype(np.int32).tobytes())
+        return part
+
+
+class EventBatch:
+    """Events as columns (see the module docstring). Iterating yields API dicts."""
+
+    __slots__ = (
+        "title", "description", "location_name", "event_type", "source_url",
+        "start_us", "start_offset", "end_us", "end_offset",
+        "latitude", "longitude", "organization_id", "verbatim",
+    )
+
+    def __init__(self, events=()):
+        for field in TEXT_FIELDS:
+            setattr(self, field, Categories())
+        self.start_us, self.end_us = array("q"), array("q")
+        self.start_offset, self.end_offset = array("h"), array("h")
+        self.latitude, self.longitude = array("d"), array("d")
+        self.organization_id = array("i")
+        self.verbatim = {}  # (field, row) -> original start/end text that doesn't round-trip
+        self.extend(events)
+
+    @classmethod
+    def concat(cls, batches) -> "EventBatch":
+        combined = cls()
+        for batch in batches:
+            combined.extend(batch)
+        return combined
+
+    def __len__(self):
+        return len(self.start_us)
+
+    def append(self, event):
+        """Add one event (API dict or event_model.Event)."""
+        if isinstance(event, Event):
+            event = event.to_dict()
+        row = len(self.start_us)
+        for field in TEXT_FIELDS:
+            getattr(self, field).append(event.get(field) or "")
+        for field, us_column, offset_column in (
+            ("start_date", self.start_us, self.start_offset),
+            ("end_date", self.end_us, self.end_offset),
+        ):
+            us, offset, text = _encode_time(event.get(field))
+            us_column.append(us)
+            offset_column.append(offset)
+            if text is not None:
+                self.verbatim[(field, row)] = text
+        self.latitude.append(_coordinate(event.get("latitude")))
+        self.longitude.append(_coordinate(event.get("longitude")))
+        self.organization_id.append(int(event.get("organization_id") or 1))
+
+    def extend(self, events):
+        for event in events:
+            self.append(event)
+
+    def row(self, i) -> dict:
+        latitude, longitude = self.latitude[i], self.longitude[i]
+        return {
+            "title": self.title[i],
+            "description": self.description[i],
+            "start_date": self.verbatim.get(("start_date", i)) or _iso(self.start_us[i], self.start_offset[i]),
+            "end_date": self.verbatim.get(("end_date", i)) or _iso(self.end_us[i], self.end_offset[i]),
+            "location_name": self.location_name[i],
+            "latitude": latitude if math.isfinite(latitude) else None,
+            "longitude": longitude if math.isfinite(longitude) else None,
+            "organization_id": self.organization_id[i],
+            "event_type": self.event_type[i],
+            "source_url": self.source_url[i],
+        }
+
+    def __iter__(self):
+        return (self.row(i) for i in range(len(self)))
+
+    def to_dicts(self) -> list:
+        return list(self)
+
+    def validate(self):
+        """
+        Vectorized sqlite_loader.validate: (numpy bool mask of valid rows,
+        {reason: count}). Each invalid row counts under its first failing rule.
+        """
+        np = _numpy()
+        n = len(self)
+        if not n:
+            return np.zeros(0, dtype=bool), {}
+        start = np.frombuffer(self.start_us, dtype=np.int64)
+        end = np.frombuffer(self.end_us, dtype=np.int64)
+        latitude = np.frombuffer(self.latitude, dtype=np.float64)
+        longitude = np.frombuffer(self.longitude, dtype=np.float64)
+        title_codes = np.frombuffer(self.title.codes, dtype=np.int32)
+        type_codes = np.frombuffer(self.event_type.codes, dtype=np.int32)
+
+        no_title = np.array([not value for value in self.title.values], dtype=bool)[title_codes]
+        holiday = np.array([value == "holiday" for value in self.event_type.values], dtype=bool)[type_codes]
+        dated = (start > INVALID) & (end > INVALID)
+        duration = np.zeros(n, dtype=np.int64)
+        duration[dated] = end[dated] - start[dated]
+        failures = (
+            no_title | (start == ABSENT) | (end == ABSENT),
+            (start == INVALID) | (end == INVALID),
+            dated & (duration <= 0),
+            dated & ~holiday & (duration > sqlite_loader.MAX_HOURS * 3600 * 10 ** 6),
+            (np.abs(latitude) > 90) | (np.abs(longitude) > 180),
+        )
+        valid = np.ones(n, dtype=bool)
+        reasons = {}
+        for reason, failed in zip(REASONS, failures):
+            failed = failed & valid
+            count = int(failed.sum())
+            if count:
+                reasons[reason] = count
+                valid &= ~failed
+        return valid, reasons
+
+    def unique_mask(self, among=None):
+        """
+        Numpy bool mask that is True for the first row of each dedup.canonical_key.
+        With `among` (a bool mask, e.g. from validate()), only those rows are
+        considered: an invalid row never shadows a valid repeat after it.
+        """
+        np = _numpy()
+        n = len(self)
+        rows = np.arange(n) if among is None else np.flatnonzero(among)
+        if not len(rows):
+            return np.zeros(n, dtype=bool)
+        # normalize each distinct title once, not once per row
+        normalized = {}
+        title_keys = np.array(
+            [normalized.setdefault(dedup.normalize_title(value), len(normalized)) for value in self.title.values],
+            dtype=np.int64,
+        )
+        keys = np.empty((n, 3), dtype=np.int64)
+        keys[:, 0] = title_keys[np.frombuffer(self.title.codes, dtype=np.int32)]
+        keys[:, 1] = np.frombuffer(self.start_us, dtype=np.int64) // (60 * 10 ** 6)
+        keys[:, 2] = np.frombuffer(self.organization_id, dtype=np.int32)
+        _keys, first = np.unique(keys[rows], axis=0, return_index=True)
+        mask = np.zeros(n, dtype=bool)
+        mask[rows[first]] = True
+        return mask
+
+    def select(self, mask) -> "EventBatch":
+        """A new batch with the rows where `mask` is True, in order."""
+        np = _numpy()
+        rows = np.flatnonzero(mask)
+        part = EventBatch()
+        for field in TEXT_FIELDS:
+            setattr(part, field, getattr(self, field).take(rows))
+        for field, dtype in (
+            ("start_us", np.int64), ("end_us", np.int64),
+            ("start_offset", np.int16), ("end_offset", np.int16),
+            ("latitude", np.float64), ("longitude", np.float64),
+            ("organization_id", np.int32),
+        ):
+            column = getattr(self, field)
+            setattr(part, field, array(column.typecode, np.frombuffer(column, dtype=dtype)[rows].tobytes()))
+        if self.verbatim:
+            new_row = {int(old): new for new, old in enumerate(rows)}
+            part.verbatim = {
+                (field, new_row[row]): text for (field, row), text in self.verbatim.items() if row in new_row
+            }
+        return part
@@ -0,0 +1,144 @@
+# scraper/event_model.py
+"""
+The event every scraper produces, as one shared type.
+
+`Event` is a slotted dataclass holding the ten fields of the API schema
+(title, description, start/end, location, coordinates, organization,
+type, source URL). Start and end may be datetimes or ISO strings and stay
+unserialized until `to_dict()`, so building one is a plain attribute
+fill. `normalize()` does the clean-up each scraper used to repeat:
+
+* text fields are stripped and cut to MAX_TEXT (500) characters;
+* a missing end, or one not after the start (compared as UTC instants,
+  naive times being Eastern), becomes start + `default_hours`;
+* coordinates are made floats, and dropped when out of range.
+
+Start and end are serialized as given (datetimes with their own offset,
+strings untouched): the backend treats (title, start_date) as an event's
+identity, so rewriting them in UTC would duplicate every row already
+stored.
+
+`api_event(...)` builds, normalizes and serializes in one call and is what
+parsers use; event_sink also accepts `Event` objects directly and only
+turns them into dicts when a batch is flushed.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from dedup import LOCAL_TZ
+
+MAX_TEXT = 500
+
+
+def _clip(text) -> str:
+    return str(text or "").strip()[:MAX_TEXT]
+
+
+def as_datetime(value):
+    """`value` as a datetime when it is one or parses as ISO 8601, else unchanged."""
+    if isinstance(value, str):
+        text = value.strip()
+        try:
+            return datetime.fromisoformat(text[:-1] + "+00:00" if text.endswith("Z") else text)
+        except ValueError:
+            return value
+    return value
+
+
+def utc_instant(value):
+    """A datetime (or ISO string) as an aware UTC datetime; naive times are Eastern. None if unparseable."""
+    value = as_datetime(value)
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=LOCAL_TZ)
+    return value.astimezone(timezone.utc)
+
+
+def _coord(value, limit):
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if -limit <= number <= limit else None
+
+
+def _iso(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+@dataclass(slots=True)
+class Event:
+    title: str
+    start: object                 # datetime or ISO string
+    end: object = None            # datetime, ISO string, or None for start + default_hours
+    description: str = ""
+    location_name: str = ""
+    latitude: float = None
+    longitude: float = None
+    organization_id: int = 1
+    event_type: str = "other"
+    source_url: str = ""
+
+    @classmethod
+    def from_dict(cls, data) -> "Event":
+        return cls(
+            title=data.get("title") or "",
+            start=data.get("start_date"),
+            end=data.get("end_date"),
+            description=data.get("description") or "",
+            location_name=data.get("location_name") or "",
+            latitude=data.get("latitude"),
+            longitude=data.get("longitude"),
+            organization_id=data.get("organization_id") or 1,
+            event_type=data.get("event_type") or "other",
+            source_url=data.get("source_url") or "",
+        )
+
+    @property
+    def start_utc(self):
+        return utc_instant(self.start)
+
+    @property
+    def end_utc(self):
+        return utc_instant(self.end)
+
+    def normalize(self, default_hours=1) -> "Event":
+        """Clean the event up in place (see the module docstring); returns it."""
+        self.title = _clip(self.title)
+        self.description = _clip(self.description)
+        self.location_name = _clip(self.location_name)
+        start = as_datetime(self.start)
+        if isinstance(start, datetime):
+            end_utc = self.end_utc
+            if end_utc is None or end_utc <= utc_instant(start):
+                self.end = start + timedelta(hours=default_hours)
+        self.latitude = _coord(self.latitude, 90)
+        self.longitude = _coord(self.longitude, 180)
+        return self
+
+    def to_dict(self) -> dict:
+        """The API payload (POST /api/events)."""
+        return {
+            "title": self.title,
+            "description": self.description,
+            "start_date": _iso(self.start),
+            "end_date": _iso(self.end),
+            "location_name": self.location_name,
+            "latitude": self.latitude,
+            "longitude": self.longitude,
+            "organization_id": self.organization_id,
+            "event_type": self.event_type,
+            "source_url": self.source_url,
+        }
+
+
+def api_event(title, start, end=None, default_hours=1, **fields) -> dict:
+    """Build, normalize and serialize an `Event` (keyword `fields` as in the dataclass)."""
+    return Event(title, start, end, **fields).normalize(default_hours).to_dict()
+
+
+def as_dicts(events) -> list:
+    """`events` with any `Event` objects serialized (dicts pass through untouched)."""
+    return [ev.to_dict() if isinstance(ev, Event) else ev for ev in events]
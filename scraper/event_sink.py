@@ -0,0 +1,284 @@
+# scraper/event_sink.py
+"""
+Buffered destinations for scraped events.
+
+Scrapers hand events (dicts or event_model.Event objects, serialized only
+at flush time) to an `EventSink` (`sink.add(ev)` / `sink.extend(evs)`)
+instead of POSTing them one by one. The sink buffers them and flushes
+automatically once EVENT_SINK_MAX_EVENTS are waiting or the oldest one
+has waited EVENT_SINK_MAX_SECONDS. `close()` (or leaving a `with` block)
+flushes the rest. A flush runs in the producing thread, so a slow
+destination slows the scraper down (backpressure) instead of growing the
+buffer without bound.
+
+Every flush drops repeats and (except for NDJSON exports) events unchanged
+since they were last delivered (dedup.select_new), then writes the rest to
+one of three backends:
+
+* "http":   the API's /api/events/batch (api_client.upload; the default);
+* "ndjson": one JSON object per line appended to a file;
+* "sqlite": bulk-loaded straight into the backend's events table
+            (sqlite_loader; for runs on the API's own host).
+
+The backend is chosen with EVENT_SINK (and EVENT_SINK_PATH), or with
+`configure()`. `open_sink()` opens the configured one, and `publish(events)`
+delivers one list of events (or an event_batch.EventBatch, whose invalid
+rows and repeats are dropped with vectorized checks first) and returns the
+aggregated stats.
+
+In sync mode (sync.py) a flush only stages the events; the source's change
+set (inserts, updates, retirements) is applied through the sink's
+`apply_changes` when the sink closes, or by `commit_sync()` when the
+runner defers it until the whole scraper has finished.
+"""
+
+import json
+import os
+import threading
+import time
+
+import api_client
+import cassette
+import dedup
+import event_batch
+import event_model
+import sqlite_loader
+import state_store
+import sync
+
+SINK_KIND = os.getenv("EVENT_SINK", "http")
+SINK_PATH = os.getenv("EVENT_SINK_PATH")
+MAX_EVENTS = int(os.getenv("EVENT_SINK_MAX_EVENTS", "500"))
+MAX_SECONDS = float(os.getenv("EVENT_SINK_MAX_SECONDS", "30"))
+# Local inserts are cheap per row; bigger flushes mean fewer transactions
+SQLITE_MAX_EVENTS = int(os.getenv("EVENT_SINK_SQLITE_MAX_EVENTS", "5000"))
+
+NDJSON_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "events.ndjson")
+
+STAT_KEYS = api_client.STAT_KEYS
+
+
+class EventSink:
+    """Buffers events and writes them in batches; subclasses implement `_write`."""
+
+    kind = None
+    # Whether deliveries count as uploads for state_store (unchanged events skipped next run)
+    tracks_state = True
+
+    def __init__(self, max_events=MAX_EVENTS, max_seconds=MAX_SECONDS):
+        self.max_events = max_events
+        self.max_seconds = max_seconds
+        self.stats = dict.fromkeys(STAT_KEYS, 0)
+        self._buffer = []
+        self._first_at = None
+        self._lock = threading.RLock()
+        self._closed = False
+        self._staged = False
+
+    def add(self, event):
+        with self._lock:
+            if self._closed:
+                raise ValueError("add() on a closed EventSink")
+            if not self._buffer:
+                self._first_at = time.monotonic()
+            self._buffer.append(event)
+            if (len(self._buffer) >= self.max_events
+                    or time.monotonic() - self._first_at >= self.max_seconds):
+                self.flush()
+
+    def extend(self, events):
+        if isinstance(events, event_batch.EventBatch):
+            events = self._vet(events)
+        for event in events:
+            self.add(event)
+
+    def _vet(self, batch):
+        """A columnar batch minus its invalid rows and repeats, found with vectorized checks."""
+        valid, reasons = batch.validate()
+        unique = batch.unique_mask(valid)
+        with self._lock:
+            self._count({"failed": int((~valid).sum()), "reasons": reasons})
+            self.stats["skipped_duplicates"] = (
+                self.stats.get("skipped_duplicates", 0) + int((valid & ~unique).sum())
+            )
+        return batch.select(valid & unique)
+
+    def _count(self, stats):
+        for key, value in stats.items():
+            if key in STAT_KEYS or key == "chunks":
+                self.stats[key] = self.stats.get(key, 0) + int(value or 0)
+            elif key == "reasons":
+                merged = self.stats.setdefault("reasons", {})
+                for reason, count in value.items():
+                    merged[reason] = merged.get(reason, 0) + count
+            elif key in ("error", "failed_chunks"):
+                self.stats[key] = value
+
+    def flush(self):
+        """Deliver everything buffered so far."""
+        with self._lock:
+            events, self._buffer = event_model.as_dicts(self._buffer), []
+            if not events:
+                return
+            if sync.enabled():
+                fresh, repeats = dedup.drop_repeats(events)
+                self.stats["skipped_duplicates"] = self.stats.get("skipped_duplicates", 0) + repeats
+                sync.stage(fresh)
+                self._staged = True
+                return
+            if self.tracks_state:
+                fresh, skipped = dedup.select_new(events)
+            else:
+                fresh, repeats = dedup.drop_repeats(events)
+                skipped = {"skipped_duplicates": repeats}
+            for key, count in skipped.items():
+                self.stats[key] = self.stats.get(key, 0) + count
+            if not fresh:
+                return
+            try:
+                stats, written = self._write(fresh)
+            except Exception as e:
+                print(f"❌ {self.kind} sink error: {e}")
+                stats, written = {"failed": len(fresh), "error": str(e)}, []
+            self._count(stats)
+            if written and self.tracks_state and not cassette.replaying():
+                state_store.remember(written)
+
+    def _write(self, events):
+        """Write `events`; return (stats, events actually delivered)."""
+        raise NotImplementedError
+
+    def apply_changes(self, changes):
+        """Apply a sync.ChangeSet; return its inserted/updated/retired/... stats."""
+        raise NotImplementedError
+
+    def close(self):
+        with self._lock:
+            if not self._closed:
+                self.flush()
+                if self._staged and not sync.deferred():
+                    self.stats.update(sync.commit(self.apply_changes, record=self.tracks_state))
+                self._closed = True
+                self._close()
+        return self.stats
+
+    def _close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class HTTPBatchSink(EventSink):
+    """POSTs to /api/events/batch in parallel, idempotent chunks."""
+
+    kind = "http"
+
+    def _write(self, events):
+        return api_client.upload(events)
+
+    def apply_changes(self, changes):
+        return api_client.post_changes(changes.payload())
+
+
+_file_locks: dict = {}
+_file_locks_guard = threading.Lock()
+
+
+def _file_lock(path):
+    with _file_locks_guard:
+        return _file_locks.setdefault(os.path.abspath(path), threading.Lock())
+
+
+class NDJSONSink(EventSink):
+    """Appends events to a newline-delimited JSON file (shared safely by all scrapers)."""
+
+    kind = "ndjson"
+    tracks_state = False  # an export: writing it must not stop the next upload
+
+    def __init__(self, path=None, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path or NDJSON_PATH
+
+    def _write(self, events):
+        lines = "".join(json.dumps(ev, default=str, ensure_ascii=False) + "\n" for ev in events)
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with _file_lock(self.path), open(self.path, "a", encoding="utf-8") as fh:
+            fh.write(lines)
+        return {"received": len(events), "inserted": len(events)}, events
+
+    def apply_changes(self, changes):
+        records = [{"op": "retire", **match} for match in changes.payload()["retires"]]
+        records += [{"op": "update", **update} for update in changes.payload()["updates"]]
+        records += [{"op": "insert", "event": ev} for ev in changes.inserts]
+        self._write(records)
+        return {"inserted": len(changes.inserts), "updated": len(changes.updates), "retired": len(changes.retires)}
+
+
+class SQLiteSink(EventSink):
+    """
+    Loads events straight into the backend's SQLite database (sqlite_loader):
+    same validation as the API, one transaction per flush, larger flushes.
+    Only the backend's own database (sqlite_loader.DB_PATH) updates state_store.
+    While a cassette is replaying, events are validated but nothing is
+    inserted or retired, just as API uploads are only acknowledged.
+    """
+
+    kind = "sqlite"
+
+    def __init__(self, path=None, max_events=SQLITE_MAX_EVENTS, **kwargs):
+        super().__init__(max_events=max_events, **kwargs)
+        self.loader = sqlite_loader.get_loader(path)
+        # state_store describes what the API serves; loading some other database
+        # (--sink-path /tmp/x.db) must not stop the next upload
+        self.tracks_state = self.loader.path == os.path.abspath(sqlite_loader.DB_PATH)
+
+    def _write(self, events):
+        if cassette.replaying():
+            failed = sum(1 for ev in events if sqlite_loader.validate(ev))
+            return {"received": len(events), "inserted": 0, "duplicates": 0, "failed": failed}, []
+        return self.loader.load(events)
+
+    def apply_changes(self, changes):
+        if cassette.replaying():
+            return dict.fromkeys(("inserted", "updated", "retired", "duplicates", "failed"), 0)
+        return self.loader.apply_changes(changes)
+
+
+SINKS = {"http": HTTPBatchSink, "ndjson": NDJSONSink, "sqlite": SQLiteSink}
+
+
+def configure(kind=None, path=None):
+    """Choose the sink `open_sink()` returns for the rest of the process."""
+    global SINK_KIND, SINK_PATH
+    if kind is not None:
+        if kind not in SINKS:
+            raise ValueError(f"unknown event sink {kind!r} (expected one of {', '.join(SINKS)})")
+        SINK_KIND = kind
+    if path is not None:
+        SINK_PATH = path
+
+
+def open_sink(**kwargs) -> EventSink:
+    """A new sink of the configured kind; use it as a context manager."""
+    cls = SINKS[SINK_KIND]
+    if cls is not HTTPBatchSink and SINK_PATH and "path" not in kwargs:
+        kwargs["path"] = SINK_PATH
+    return cls(**kwargs)
+
+
+def publish(events) -> dict:
+    """Deliver `events` to the configured sink and return the aggregated stats."""
+    with open_sink() as sink:
+        sink.extend(events)
+    return sink.stats
+
+
+def commit_sync(source=None) -> dict:
+    """Apply the staged change set of `source` (sync mode, deferred commits) through the configured sink."""
+    with open_sink() as sink:
+        return sync.commit(sink.apply_changes, source, record=sink.tracks_state)
@@ -1,5 +1,5 @@
 from ics_scrapers import ICSUtils
-from api_client import batch_post
+from event_sink import publish
 
 
 class FederalHolidaysICSScraper:
@@ -19,10 +19,7 @@ class FederalHolidaysICSScraper:
             lon=self.lon,
             event_type=self.event_type,
         )
-        if events:
-            print("Federal Holidays ICS batch:", batch_post(events))
-        else:
-            print("Federal Holidays ICS: no events parsed")
+        print("Federal Holidays ICS batch:", publish(events))
 
 
 if __name__ == "__main__":
@@ -1,20 +1,17 @@
 # scraper/holiday_scraper.py
 
 from base_scraper import BaseScraper
-from post_event import post_event
-from bs4 import BeautifulSoup
 from datetime import datetime
 
 class HolidayScraper(BaseScraper):
     def __init__(self):
         super().__init__(
             "US Holidays",
-            "https://www.timeanddate.com/holidays/us/",
-            headers={"User-Agent": "Mozilla/5.0"}
+            "https://www.timeanddate.com/holidays/us/"
         )
 
     def parse_events(self, html):
-        soup = BeautifulSoup(html, "html.parser")
+        soup = self.get_soup(html)
         events = []
 
         # All rows in zebra table (skip header)
@@ -50,7 +47,3 @@ class HolidayScraper(BaseScraper):
 
         print(f"✅ Found {len(events)} holidays")
         return events
-
-    def run_and_post(self):
-        for e in self.run():
-            post_event(e)
@@ -0,0 +1,58 @@
+# scraper/html_parse.py
+"""
+HTML parsing engines shared by all scrapers.
+
+`make_soup(html)` returns a BeautifulSoup object built with the configured
+tree builder: lxml by default (HTML_PARSER env var; "html.parser" restores
+the old pure-Python builder). The selector API (select, find_all, get_text)
+is the same whichever builder is used; BaseScraper subclasses can pin one
+with the `parser_engine` class attribute.
+
+Hot paths that don't need soup at all can use `make_tree(html)`, a plain
+lxml.html tree for XPath, together with `text_of` / `page_text`, which
+mirror `get_text(strip=True)` / `get_text(" ", strip=True)`.
+
+benchmark_parsers.py times each engine per source.
+"""
+
+import os
+
+ENGINE = os.getenv("HTML_PARSER", "lxml")
+ENGINES = ("lxml", "html.parser", "html5lib")
+
+_unavailable: set = set()
+
+
+def make_soup(html, engine=None):
+    """BeautifulSoup for `html` using `engine` (default ENGINE), falling back to html.parser."""
+    from bs4 import BeautifulSoup, FeatureNotFound  # imported on first use, like lxml in make_tree
+    engine = engine or ENGINE
+    if engine not in _unavailable:
+        try:
+            return BeautifulSoup(html, engine)
+        except FeatureNotFound:
+            _unavailable.add(engine)
+            print(f"⚠️ HTML parser '{engine}' is not installed; using html.parser")
+    return BeautifulSoup(html, "html.parser")
+
+
+def make_tree(html):
+    """lxml.html element tree for XPath-based scrapers."""
+    import lxml.html
+    if not html or not html.strip():
+        return lxml.html.fromstring("<html></html>")
+    if isinstance(html, str):
+        # lxml rejects str input that carries an XML encoding declaration
+        html = html.encode("utf-8")
+    return lxml.html.fromstring(html, parser=lxml.html.HTMLParser(encoding="utf-8"))
+
+
+def text_of(el) -> str:
+    """Like bs4's `get_text(strip=True)`: stripped text nodes joined with nothing."""
+    return "".join(s.strip() for s in el.itertext())
+
+
+def page_text(tree) -> str:
+    """Like bs4's `get_text(" ", strip=True)` for the visible text (no script/style)."""
+    nodes = tree.xpath("//text()[not(ancestor::script) and not(ancestor::style)]")
+    return " ".join(s.strip() for s in nodes if s.strip())
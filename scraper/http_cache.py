@@ -0,0 +1,232 @@
+# scraper/http_cache.py
+"""
+Persistent conditional-GET cache for the shared fetch path (http_client).
+
+Responses that carry an ETag or Last-Modified validator are written to disk.
+On the next run the validators are replayed as If-None-Match /
+If-Modified-Since; a 304 is answered from the stored body and flagged with
+`response.from_cache = True`, so callers can also skip re-parsing by keeping
+their parsed output next to the entry (see `load_parsed` / `store_parsed`).
+
+Entries expire after HTTP_CACHE_TTL seconds and the store is trimmed to
+HTTP_CACHE_MAX_MB by least-recently-used eviction.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+CACHE_DIR = os.getenv(
+    "HTTP_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "http"),
+)
+TTL_SECONDS = int(os.getenv("HTTP_CACHE_TTL", str(7 * 24 * 3600)))
+MAX_BYTES = int(float(os.getenv("HTTP_CACHE_MAX_MB", "200")) * 1024 * 1024)
+
+# Response headers worth keeping with a cached body
+_KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Content-Disposition")
+
+_lock = threading.Lock()
+_conn = None
+
+
+def enabled() -> bool:
+    return os.getenv("HTTP_CACHE", "1") not in ("0", "false", "off")
+
+
+def _db():
+    global _conn
+    if _conn is None:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        conn = sqlite3.connect(os.path.join(CACHE_DIR, "index.sqlite"), check_same_thread=False)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                headers TEXT,
+                encoding TEXT,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries(accessed_at)")
+        _conn = conn
+        _purge_expired()
+    return _conn
+
+
+def request_key(url, params=None) -> str:
+    """Stable key for a GET (the fully-encoded URL including query params)."""
+    if params:
+        url = requests.Request("GET", url, params=params).prepare().url
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+def _body_path(key):
+    return os.path.join(CACHE_DIR, key[:2], key + ".body")
+
+
+def _parsed_path(key, namespace):
+    ns = hashlib.sha256(namespace.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, key[:2], f"{key}.{ns}.parsed.json")
+
+
+def _remove_files(key):
+    folder = os.path.join(CACHE_DIR, key[:2])
+    if not os.path.isdir(folder):
+        return
+    for name in os.listdir(folder):
+        if name.startswith(key):
+            try:
+                os.remove(os.path.join(folder, name))
+            except OSError:
+                pass
+
+
+def _purge_expired():
+    cutoff = time.time() - TTL_SECONDS
+    rows = _conn.execute("SELECT key FROM entries WHERE stored_at < ?", (cutoff,)).fetchall()
+    for (key,) in rows:
+        _remove_files(key)
+    _conn.execute("DELETE FROM entries WHERE stored_at < ?", (cutoff,))
+    _conn.commit()
+
+
+def _evict_to_fit():
+    total = _conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+    if total <= MAX_BYTES:
+        return
+    for key, size in _conn.execute("SELECT key, size FROM entries ORDER BY accessed_at").fetchall():
+        _remove_files(key)
+        _conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+        total -= size
+        if total <= MAX_BYTES:
+            break
+    _conn.commit()
+
+
+def lookup(key):
+    """Return the cache row for `key` as a dict, or None if missing/expired."""
+    with _lock:
+        row = _db().execute(
+            "SELECT url, etag, last_modified, headers, encoding, stored_at FROM entries WHERE key = ?",
+            (key,),
+        ).fetchone()
+    if not row:
+        return None
+    url, etag, last_modified, headers, encoding, stored_at = row
+    if time.time() - stored_at > TTL_SECONDS or not os.path.exists(_body_path(key)):
+        return None
+    return {
+        "key": key, "url": url, "etag": etag, "last_modified": last_modified,
+        "headers": json.loads(headers or "{}"), "encoding": encoding,
+    }
+
+
+def conditional_headers(entry) -> dict:
+    headers = {}
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def is_cacheable(response) -> bool:
+    if response.status_code != 200:
+        return False
+    if "no-store" in response.headers.get("Cache-Control", "").lower():
+        return False
+    return bool(response.headers.get("ETag") or response.headers.get("Last-Modified"))
+
+
+def store(key, response, body=None):
+    """Persist a 200 response (with validators) and drop any stale parsed output."""
+    body = response.content if body is None else body
+    _commit(key, response, lambda fh: fh.write(body))
+
+
+def store_file(key, response, fileobj):
+    """Like `store`, for a streamed body that was spooled to `fileobj`."""
+    def write(fh):
+        fileobj.seek(0)
+        shutil.copyfileobj(fileobj, fh)
+        return fh.tell()
+    _commit(key, response, write)
+
+
+def _commit(key, response, write):
+    headers = {h: response.headers[h] for h in _KEPT_HEADERS if h in response.headers}
+    now = time.time()
+    with _lock:
+        conn = _db()
+        _remove_files(key)
+        path = _body_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as fh:
+            size = write(fh) or 0
+        os.replace(tmp, path)
+        conn.execute(
+            "INSERT OR REPLACE INTO entries (key, url, etag, last_modified, headers, encoding, size, stored_at, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, response.url, response.headers.get("ETag"), response.headers.get("Last-Modified"),
+             json.dumps(headers), response.encoding, size, now, now),
+        )
+        conn.commit()
+        _evict_to_fit()
+
+
+def revalidated(entry, response) -> requests.Response:
+    """Turn a 304 into a full 200 response built from the stored body."""
+    key = entry["key"]
+    with open(_body_path(key), "rb") as fh:
+        body = fh.read()
+    with _lock:
+        _db().execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        _conn.commit()
+    cached = requests.Response()
+    cached.status_code = 200
+    cached._content = body
+    cached.headers = CaseInsensitiveDict(entry["headers"])
+    cached.encoding = entry["encoding"]
+    cached.url = entry["url"]
+    cached.request = response.request
+    cached.elapsed = response.elapsed
+    cached.from_cache = True
+    return cached
+
+
+def load_parsed(url, namespace, params=None):
+    """Parsed output stored for the current cached body of `url`, or None."""
+    path = _parsed_path(request_key(url, params), namespace)
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+def store_parsed(url, namespace, value, params=None):
+    """Keep parsed output next to the cached body; it is discarded when the body changes."""
+    key = request_key(url, params)
+    if not os.path.exists(_body_path(key)):
+        return
+    path = _parsed_path(key, namespace)
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(value, fh)
+        os.replace(tmp, path)
+    except (OSError, TypeError, ValueError):
+        pass
@@ -0,0 +1,288 @@
+# scraper/http_client.py
+"""
+Shared HTTP transport for every scraper.
+
+All fetches go through one `requests.Session` so TCP/TLS connections are kept
+alive and reused per host (urllib3 keeps a separate connection pool for each
+origin). Scrapers should call `http_get` instead of `requests.get` and rely on
+DEFAULT_HEADERS rather than carrying their own User-Agent dicts.
+
+GETs are revalidated against the on-disk conditional-GET cache (http_cache)
+unless called with `cache=False`, and are recorded or replayed when a
+cassette mode is active (cassette). Every network request first takes a
+token from its host's bucket (rate_limit) and passes the host's circuit
+breaker (circuit_breaker), which also governs retries.
+
+Within one run, GETs for the same URL (with the same extra headers and
+`cache` flag) are coalesced: concurrent callers wait on a single in-flight
+request, and later callers get the same response (and the same decoded
+`.text`) from a run-scoped memo. Error responses (429/5xx) are not memoized.
+"""
+
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import cassette
+import circuit_breaker
+import http_cache
+import rate_limit
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+}
+
+DEFAULT_TIMEOUT = 15
+
+# Number of distinct hosts to keep pools for, and idle connections kept per host.
+POOL_HOSTS = int(os.getenv("HTTP_POOL_HOSTS", "64"))
+POOL_PER_HOST = int(os.getenv("HTTP_POOL_PER_HOST", "8"))
+
+# Upper bound on response bodies kept in the run-scoped single-flight memo.
+MEMO_MAX_BYTES = int(float(os.getenv("HTTP_MEMO_MAX_MB", "64")) * 1024 * 1024)
+
+_session = None
+_session_lock = threading.Lock()
+
+# Keyed by (url, sorted extra headers, cache flag)
+_inflight: dict[tuple, Future] = {}
+_memo: "OrderedDict[tuple, requests.Response]" = OrderedDict()
+_memo_bytes = 0
+_memo_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide pooled session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_PER_HOST)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update(DEFAULT_HEADERS)
+                _session = session
+    return _session
+
+
+class SharedResponse(requests.Response):
+    """A response handed to several callers; its body is decoded to text only once."""
+
+    _text = None
+
+    @classmethod
+    def wrap(cls, response):
+        shared = cls()
+        shared.__setstate__(response.__getstate__())
+        for attr in ("from_cache", "from_cassette"):
+            if hasattr(response, attr):
+                setattr(shared, attr, getattr(response, attr))
+        return shared
+
+    @property
+    def text(self):
+        if self._text is None:
+            self._text = super().text
+        return self._text
+
+
+def http_get(url, headers=None, params=None, timeout=DEFAULT_TIMEOUT, cache=True, share=True, **kwargs) -> requests.Response:
+    """
+    GET through the shared pool. `headers` are merged over DEFAULT_HEADERS.
+    Raises requests exceptions exactly like `requests.get`.
+
+    With `cache` on, a stored ETag/Last-Modified is sent along and a 304 comes
+    back as a normal 200 response with `from_cache = True`. With `share` on,
+    repeated or concurrent requests for the URL (with the same `headers` and
+    `cache`) in this run reuse one response.
+    """
+    if params:
+        url = requests.Request("GET", url, params=params).prepare().url
+    if not share or kwargs.get("stream"):
+        return _get(url, headers, timeout, cache, **kwargs)
+
+    key = (url, tuple(sorted((headers or {}).items())), cache)
+    with _memo_lock:
+        memoized = _memo.get(key)
+        if memoized is not None:
+            _memo.move_to_end(key)
+            return memoized
+        future = _inflight.get(key)
+        leader = future is None
+        if leader:
+            future = _inflight[key] = Future()
+    if not leader:
+        return future.result()
+
+    try:
+        response = SharedResponse.wrap(_get(url, headers, timeout, cache, **kwargs))
+    except BaseException as e:
+        with _memo_lock:
+            _inflight.pop(key, None)
+        future.set_exception(e)
+        raise
+    with _memo_lock:
+        # A 429/5xx that outlived its retries is handed to concurrent callers but not reused later
+        if response.status_code != 429 and response.status_code < 500:
+            _remember(key, response)
+        _inflight.pop(key, None)
+    future.set_result(response)
+    return response
+
+
+def _remember(key, response):
+    global _memo_bytes
+    size = len(response.content or b"")
+    if size > MEMO_MAX_BYTES:
+        return
+    _memo[key] = response
+    _memo_bytes += size
+    while _memo_bytes > MEMO_MAX_BYTES:
+        _, dropped = _memo.popitem(last=False)
+        _memo_bytes -= len(dropped.content or b"")
+
+
+def reset_run_memo():
+    """Forget responses shared in this run (e.g. between runs in one process)."""
+    global _memo_bytes
+    with _memo_lock:
+        _memo.clear()
+        _memo_bytes = 0
+
+
+def _get(url, headers, timeout, cache, **kwargs) -> requests.Response:
+    if cassette.replaying():
+        return cassette.replay("GET", url)
+    try:
+        response = _fetch(url, headers, timeout, cache, **kwargs)
+    except requests.RequestException as e:
+        if cassette.recording():
+            cassette.record_error("GET", url, e)
+        raise
+    if cassette.recording():
+        if kwargs.get("stream"):
+            _on_body(response, lambda spool: cassette.record_file("GET", url, response, spool))
+        else:
+            cassette.record("GET", url, response)
+    return response
+
+
+def _fetch(url, headers, timeout, cache, **kwargs) -> requests.Response:
+    if not cache or not http_cache.enabled():
+        return _send(url, headers, timeout, **kwargs)
+
+    key = http_cache.request_key(url)
+    entry = http_cache.lookup(key)
+    if entry:
+        headers = {**(headers or {}), **http_cache.conditional_headers(entry)}
+    response = _send(url, headers, timeout, **kwargs)
+    if response.status_code == 304 and entry:
+        return http_cache.revalidated(entry, response)
+    if http_cache.is_cacheable(response):
+        if kwargs.get("stream"):
+            _on_body(response, lambda spool: http_cache.store_file(key, response, spool))
+        else:
+            http_cache.store(key, response)
+    return response
+
+
+def _on_body(response, hook):
+    # Streamed bodies are persisted once the caller has read them (iter_chunks)
+    if not hasattr(response, "_body_hooks"):
+        response._body_hooks = []
+    response._body_hooks.append(hook)
+
+
+def iter_chunks(response, chunk_size=64 * 1024):
+    """
+    Yield the body of a (possibly streamed) response as byte chunks without
+    holding it all in memory. For streamed responses that the cache or a
+    cassette wants to keep, the chunks are spooled to a temporary file and
+    handed over once the body has been read to the end.
+    """
+    if response._content is not False:
+        # Body already in memory (304 from cache, cassette replay, shared memo)
+        body = response.content or b""
+        for start in range(0, len(body), chunk_size):
+            yield body[start:start + chunk_size]
+        return
+    hooks = getattr(response, "_body_hooks", None)
+    if not hooks:
+        yield from response.iter_content(chunk_size)
+        return
+    with tempfile.SpooledTemporaryFile(max_size=1024 * 1024) as spool:
+        for chunk in response.iter_content(chunk_size):
+            spool.write(chunk)
+            yield chunk
+        for hook in hooks:
+            hook(spool)
+
+
+def _send(url, headers, timeout, **kwargs) -> requests.Response:
+    """
+    One logical GET: gated by the host's circuit breaker, paced by its token
+    bucket, and retried with backoff on transient failures while the run's
+    retry budget lasts.
+    """
+    session = get_session()
+    host = rate_limit.host_key(url)
+    attempt = 0
+    while True:
+        attempt += 1
+        request_timeout = circuit_breaker.before_request(host, timeout)
+        rate_limit.acquire(url)
+        try:
+            response = session.get(url, headers=headers, timeout=request_timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            circuit_breaker.record_failure(host)
+            if attempt >= circuit_breaker.MAX_ATTEMPTS or not circuit_breaker.take_retry():
+                raise
+        except Exception:
+            # not retried (InvalidURL, TooManyRedirects, SSLError...), but it still
+            # settles a half-open probe so the host isn't refused for the rest of the run
+            circuit_breaker.record_failure(host)
+            raise
+        else:
+            if response.status_code not in circuit_breaker.RETRY_STATUSES:
+                circuit_breaker.record_success(host)
+                return response
+            circuit_breaker.record_failure(host)
+            if attempt >= circuit_breaker.MAX_ATTEMPTS or not circuit_breaker.take_retry():
+                return response
+            response.close()
+        time.sleep(circuit_breaker.backoff(attempt))
+
+
+def http_post(url, json=None, headers=None, timeout=DEFAULT_TIMEOUT, **kwargs) -> requests.Response:
+    """POST through the shared pool (used by the API client)."""
+    if cassette.replaying():
+        return cassette.acknowledge_upload(url, json)
+    rate_limit.acquire(url)
+    return get_session().post(url, json=json, headers=headers, timeout=timeout, **kwargs)
+
+
+def host_of(url) -> str:
+    return (urlparse(url).hostname or "").lower()
+
+
+def group_by_host(urls) -> list:
+    """
+    Reorder URLs so requests to the same host run back to back on a warm
+    connection. Order within each host, and first-seen host order, is preserved.
+    """
+    groups: dict[str, list] = {}
+    for url in urls:
+        groups.setdefault(host_of(url), []).append(url)
+    return [url for group in groups.values() for url in group]
@@ -1,128 +1,215 @@
 """
-ICS helpers with resilient parsing. Tries `ics` first; falls back to `icalendar` for
-feeds with malformed events. Ensures end >= start and pads default duration.
+ICS helpers built on the single-pass streaming reader in ics_stream. The feed is
+parsed straight off the response stream and its events are yielded as they are
+read, so the scrapers hand them to the sink without collecting the feed first;
+a malformed VEVENT only drops that event, not the feed. Ensures end >= start and pads default duration.
+Recurring events are expanded within a rolling window (ICS_WINDOW_PAST_DAYS /
+ICS_WINDOW_FUTURE_DAYS around now). The parse kept beside a cached feed holds
+the single events and the unexpanded recurring ones, so a 304 skips parsing
+and only re-runs the expansion for the current window.
 """
 
-import requests
-from datetime import timedelta, datetime
-from api_client import batch_post
+import itertools
+import os
+import re
+from datetime import datetime, timedelta, timezone
+
+import http_cache
+import ics_stream
+from event_model import api_event
+from http_client import http_get, iter_chunks
+from event_sink import publish
+
+_CHARSET_RE = re.compile(r"charset=([\w.-]+)", re.I)
+
+# Recurring events are expanded only within [now - past, now + future]
+ICS_WINDOW_PAST_DAYS = int(os.getenv("ICS_WINDOW_PAST_DAYS", "30"))
+ICS_WINDOW_FUTURE_DAYS = int(os.getenv("ICS_WINDOW_FUTURE_DAYS", "180"))
+ICS_MAX_OCCURRENCES = int(os.getenv("ICS_MAX_OCCURRENCES", "500"))
 
 
 class ICSUtils:
     @staticmethod
-    def parse_ics(url, org_id, org_name, lat, lon, event_type):
+    def default_window(now=None):
+        """(start, end) of the recurrence expansion window around `now`."""
+        now = now or datetime.now(timezone.utc)
+        return now - timedelta(days=ICS_WINDOW_PAST_DAYS), now + timedelta(days=ICS_WINDOW_FUTURE_DAYS)
+
+    @staticmethod
+    def _span(ev):
+        dtstart, dtend = ev["start"], ev["end"]
+        if dtend is None:
+            dtend = dtstart + timedelta(hours=1)
+        if dtend < dtstart:
+            # Swap or pad when calendars are malformed
+            dtstart, dtend = dtend, dtstart
+        if dtend == dtstart:
+            dtend = dtstart + timedelta(hours=1)
+        return dtstart, dtend
+
+    @staticmethod
+    def _api_event(ev, dtstart, dtend, url, org_id, org_name, lat, lon, event_type):
+        return api_event(
+            ev["title"].strip() or "Untitled",
+            dtstart,
+            dtend,
+            description=ev["description"],
+            location_name=ev["location"].strip() or org_name,
+            latitude=lat,
+            longitude=lon,
+            organization_id=org_id,
+            event_type=event_type,
+            source_url=url,
+        )
+
+    @staticmethod
+    def read_feed(chunks, source, masters, overridden, encoding="utf-8", errors=None):
+        """
+        One pass over raw ICS chunks, lazily yielding API dicts for the single
+        events as they are read. Recurring masters are appended to `masters`
+        and the instance starts replaced by RECURRENCE-ID overrides to
+        `overridden` ({uid: [start, ...]}); both are complete once the
+        generator is exhausted. `source` is (url, org_id, org_name, lat, lon,
+        event_type). None of it depends on the expansion window.
+        """
+        for ev in ics_stream.iter_events(chunks, encoding=encoding, errors=errors):
+            if ev["recurrence_id"] is not None:
+                overridden.setdefault(ev["uid"], []).extend(
+                    ics_stream.parse_date_list([ev["recurrence_id"]], ev["start"])
+                )
+                if ev["status"] == "CANCELLED":
+                    continue
+            elif ics_stream.is_recurring(ev):
+                masters.append(ev)
+                continue
+            yield ICSUtils._api_event(ev, *ICSUtils._span(ev), *source)
+
+    @staticmethod
+    def expand(masters, overridden, source, window=None, errors=None):
+        """
+        Lazily yield the occurrences of recurring `masters` (RRULE/RDATE) inside
+        `window` (default: `default_window()`), minus EXDATEs and `overridden`
+        instances. At most ICS_MAX_OCCURRENCES are produced per rule, so an
+        open-ended rule can't flood the output.
+        """
+        window = window or ICSUtils.default_window()
+        for ev in masters:
+            dtstart, dtend = ICSUtils._span(ev)
+            try:
+                starts = ics_stream.occurrences(
+                    dict(ev, start=dtstart), *window, limit=ICS_MAX_OCCURRENCES, skip=overridden.get(ev["uid"], ())
+                )
+                for start in starts:
+                    yield ICSUtils._api_event(ev, start, start + (dtend - dtstart), *source)
+            except (ValueError, TypeError) as e:
+                if errors is not None:
+                    errors.append(f"Bad recurrence in {ev['title']!r}: {e}")
+
+    @staticmethod
+    def iter_events(chunks, url, org_id, org_name, lat, lon, event_type, encoding="utf-8", errors=None, window=None):
+        """
+        Yield API-ready event dicts from raw ICS chunks: the single events,
+        then the recurring ones expanded within `window` (see `expand`).
+        """
+        source = (url, org_id, org_name, lat, lon, event_type)
+        masters, overridden = [], {}
+        yield from ICSUtils.read_feed(chunks, source, masters, overridden, encoding=encoding, errors=errors)
+        yield from ICSUtils.expand(masters, overridden, source, window=window, errors=errors)
+
+    @staticmethod
+    def _dump_feed(events, masters, overridden):
+        return {
+            "events": events,
+            "masters": [ics_stream.dump_event(ev) for ev in masters],
+            "overridden": {
+                uid: [ics_stream.dump_datetime(dt) for dt in starts] for uid, starts in overridden.items()
+            },
+        }
+
+    @staticmethod
+    def _load_feed(cached):
+        return (
+            cached["events"],
+            [ics_stream.load_event(ev) for ev in cached["masters"]],
+            {uid: [ics_stream.load_datetime(dt) for dt in starts] for uid, starts in cached["overridden"].items()},
+        )
+
+    @staticmethod
+    def parse_ics(url, org_id, org_name, lat, lon, event_type, window=None):
+        """
+        Lazily yield the API-ready events of the ICS feed at `url`: the single
+        events as they come off the response stream, then the recurring ones
+        expanded within `window`. Yields nothing if the feed can't be fetched;
+        a feed that breaks mid-read stops at the last complete event.
+        """
         headers = {
-            "User-Agent": "Mozilla/5.0",
             "Accept": "text/calendar, text/plain, */*",
             "Referer": url,
         }
         try:
-            r = requests.get(url, headers=headers, timeout=15)
+            r = http_get(url, headers=headers, timeout=15, stream=True)
             r.raise_for_status()
         except Exception as e:
             print(f"❌ Failed to fetch ICS feed {url}: {e}")
-            return []
+            return
 
-        # Some endpoints return HTML when blocked or mis-parameterized
+        source = (url, org_id, org_name, lat, lon, event_type)
+        # The cached parse is window-independent; recurrences are expanded afresh each run
+        parsed_key = f"ics:{org_id}:{org_name}:{lat}:{lon}:{event_type}"
+        if getattr(r, "from_cache", False):
+            cached = http_cache.load_parsed(url, parsed_key)
+            if isinstance(cached, dict):
+                r.close()
+                events, masters, overridden = ICSUtils._load_feed(cached)
+                yield from events
+                count = len(events)
+                for event in ICSUtils.expand(masters, overridden, source, window=window):
+                    count += 1
+                    yield event
+                print(f"✅ ICS feed unchanged (304), reused {count} events from {url}")
+                return
+
+        # ICS is UTF-8 unless the server says otherwise (requests would guess Latin-1)
         ctype = r.headers.get("Content-Type", "").lower()
-        if "text/html" in ctype and not r.text.strip().startswith("BEGIN:VEVENT") and not r.text.strip().startswith("BEGIN:VCALENDAR"):
-            print(f"⚠️  Non-ICS content received from {url} (Content-Type: {ctype}). Skipping.")
-            return []
+        charset = _CHARSET_RE.search(ctype)
+        encoding = charset.group(1) if charset else "utf-8"
 
-        # Strategy 1: try `ics` library
-        try:
-            from ics import Calendar as ICSCalendar  # type: ignore
-            cal = ICSCalendar(r.text)
-            events = []
-            for comp in cal.events:
-                title = (getattr(comp, "name", None) or "Untitled").strip()
-                dtstart = comp.begin.datetime if getattr(comp, "begin", None) else None
-                dtend = comp.end.datetime if getattr(comp, "end", None) else None
-                if dtstart and not dtend:
-                    dtend = dtstart + timedelta(hours=1)
-                location = (getattr(comp, "location", None) or org_name).strip()
-
-                if not dtstart:
-                    continue
-                if dtend and dtend < dtstart:
-                    # Fix inverted intervals
-                    dtstart, dtend = dtend, dtstart
-                if not dtend:
-                    dtend = dtstart + timedelta(hours=1)
-
-                events.append({
-                    "title": title,
-                    "description": (getattr(comp, "description", None) or "").strip()[:500],
-                    "start_date": dtstart.isoformat(),
-                    "end_date": dtend.isoformat(),
-                    "location_name": location,
-                    "latitude": lat,
-                    "longitude": lon,
-                    "organization_id": org_id,
-                    "event_type": event_type,
-                    "source_url": url,
-                })
-            print(f"✅ Parsed {len(events)} events from ICS feed {url}")
-            return events
-        except Exception as primary_error:
-            print(f"⚠️  ICS parse issue with `ics` library: {primary_error}. Falling back to `icalendar`.")
-
-        # Strategy 2: fallback to `icalendar` library
-        try:
-            from icalendar import Calendar as ICalCalendar  # type: ignore
-        except Exception as e:
-            print("❌ Fallback parser unavailable: please install `icalendar`.", e)
-            return []
+        chunks = iter_chunks(r)
+        first = next(chunks, b"")
+        # Some endpoints return HTML when blocked or mis-parameterized
+        if "text/html" in ctype and not first.lstrip().startswith((b"BEGIN:VEVENT", b"BEGIN:VCALENDAR")):
+            r.close()
+            print(f"⚠️  Non-ICS content received from {url} (Content-Type: {ctype}). Skipping.")
+            return
 
+        errors: list[str] = []
+        # Single events are kept only for the parse cache; they reach the caller as they are read
+        events, masters, overridden = [], [], {}
         try:
-            cal = ICalCalendar.from_ical(r.text)
+            for event in ICSUtils.read_feed(
+                itertools.chain([first], chunks), source, masters, overridden, encoding=encoding, errors=errors,
+            ):
+                events.append(event)
+                yield event
         except Exception as e:
-            print(f"❌ Failed to parse ICS with icalendar: {e}")
-            return []
+            print(f"❌ Failed to read ICS feed {url}: {e}")
+            return
+        finally:
+            r.close()
+        # Keep the parse beside the cached feed so a 304 next run skips parsing
+        http_cache.store_parsed(url, parsed_key, ICSUtils._dump_feed(events, masters, overridden))
+        count = len(events)
+        for event in ICSUtils.expand(masters, overridden, source, window=window, errors=errors):
+            count += 1
+            yield event
+        skipped = f" ({len(errors)} malformed skipped)" if errors else ""
+        print(f"✅ Parsed {count} events from ICS feed {url}{skipped}")
 
-        events = []
-        for comp in cal.walk():
-            if comp.name != "VEVENT":
-                continue
-            title = str(comp.get("summary") or "Untitled")
-            raw_start = comp.get("dtstart")
-            raw_end = comp.get("dtend")
-            location = str(comp.get("location") or org_name)
-            description = str(comp.get("description") or "")
-
-            # Extract datetime objects (icalendar wraps in vDDD types)
-            dtstart = getattr(raw_start, "dt", None)
-            dtend = getattr(raw_end, "dt", None)
-            if isinstance(dtstart, datetime) is False and dtstart is not None:
-                # Convert date to datetime at midnight
-                dtstart = datetime.combine(dtstart, datetime.min.time())
-            if isinstance(dtend, datetime) is False and dtend is not None:
-                dtend = datetime.combine(dtend, datetime.min.time())
-
-            if dtstart is None:
-                continue
-            if dtend is None:
-                dtend = dtstart + timedelta(hours=1)
-            if dtend < dtstart:
-                # Swap or pad when calendars are malformed
-                dtstart, dtend = dtend, dtstart
-                if dtend < dtstart:
-                    dtend = dtstart + timedelta(hours=1)
-
-            events.append({
-                "title": title.strip(),
-                "description": description.strip()[:500],
-                "start_date": dtstart.isoformat(),
-                "end_date": dtend.isoformat(),
-                "location_name": location.strip() or org_name,
-                "latitude": lat,
-                "longitude": lon,
-                "organization_id": org_id,
-                "event_type": event_type,
-                "source_url": url,
-            })
-        print(f"✅ Parsed {len(events)} events from ICS feed {url} (fallback)")
-        return events
+    @staticmethod
+    def parse_feeds(urls, org_id, org_name, lat, lon, event_type, window=None):
+        """`parse_ics` over several feeds of one organization, one after another."""
+        for url in urls:
+            yield from ICSUtils.parse_ics(url, org_id, org_name, lat, lon, event_type, window=window)
 
 
 class UNCICSScraper:
@@ -131,8 +218,7 @@ class UNCICSScraper:
         events = ICSUtils.parse_ics(
             url, org_id=2, org_name="UNC Chapel Hill", lat=35.9049, lon=-79.0469, event_type="academic"
         )
-        if events:
-            print("UNC ICS batch:", batch_post(events))
+        print("UNC ICS batch:", publish(events))
 
 
 class DukeICSScraper:
@@ -141,8 +227,7 @@ class DukeICSScraper:
         events = ICSUtils.parse_ics(
             url, org_id=3, org_name="Duke University", lat=36.0014, lon=-78.9382, event_type="academic"
         )
-        if events:
-            print("Duke ICS batch:", batch_post(events))
+        print("Duke ICS batch:", publish(events))
 
 
 class HolidayListScraper:
@@ -159,17 +244,17 @@ class HolidayListScraper:
         for date_obj, name in us_holidays.items():
             start_dt = datetime.combine(date_obj, datetime.min.time())
             end_dt = datetime.combine(date_obj, datetime.max.time())
-            events.append({
-                "title": str(name),
-                "description": "Public holiday in the U.S.",
-                "start_date": start_dt.isoformat(),
-                "end_date": end_dt.isoformat(),
-                "location_name": "North Carolina, USA",
-                "latitude": 35.7596,
-                "longitude": -79.0193,
-                "organization_id": 99,
-                "event_type": "holiday",
-                "source_url": "https://www.opm.gov/policy-data-oversight/snow-dismissal-procedures/federal-holidays/"
-            })
+            events.append(api_event(
+                str(name),
+                start_dt,
+                end_dt,
+                description="Public holiday in the U.S.",
+                location_name="North Carolina, USA",
+                latitude=35.7596,
+                longitude=-79.0193,
+                organization_id=99,
+                event_type="holiday",
+                source_url="https://www.opm.gov/policy-data-oversight/snow-dismissal-procedures/federal-holidays/",
+            ))
         if events:
-            print("US Holidays batch:", batch_post(events))
+            print("US Holidays batch:", publish(events))
@@ -0,0 +1,347 @@
+# scraper/ics_stream.py
+"""
+Streaming, single-pass iCalendar (RFC 5545) reader.
+
+Feeds are consumed as an iterable of byte chunks (e.g. http_client.iter_chunks),
+unfolded line by line, and each VEVENT is yielded as soon as its END:VEVENT
+is seen, so memory stays bounded by the largest single event rather than the
+whole feed. Malformed lines are skipped and an event whose dates can't be
+read is dropped on its own; the rest of the feed is still parsed.
+
+Only what the scrapers need is interpreted: DTSTART/DTEND/DURATION (with
+TZID, UTC and all-day values), SUMMARY/DESCRIPTION/LOCATION text, and the
+recurrence properties RRULE/RDATE/EXDATE/RECURRENCE-ID kept raw.
+`occurrences` expands those lazily within a time window. `dump_event` /
+`load_event` turn an event into JSON and back (zones kept by name), so an
+unexpanded recurring event can be cached and expanded again later.
+"""
+
+import codecs
+import itertools
+import re
+from datetime import date, datetime, timedelta, timezone
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # Python < 3.9
+    ZoneInfo = None
+
+# Exchange/Legistar feeds often use Windows zone names in TZID
+_WINDOWS_ZONES = {
+    "eastern standard time": "America/New_York",
+    "us eastern standard time": "America/New_York",
+    "central standard time": "America/Chicago",
+    "mountain standard time": "America/Denver",
+    "pacific standard time": "America/Los_Angeles",
+    "utc": "UTC",
+}
+
+# Properties that may repeat and are collected as lists
+_MULTI = {"EXDATE", "RDATE"}
+
+_DURATION_RE = re.compile(
+    r"^(?P<sign>[+-])?P(?:(?P<weeks>\d+)W)?(?:(?P<days>\d+)D)?"
+    r"(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+)S)?)?$"
+)
+
+_UNTIL_RE = re.compile(r"UNTIL=([0-9TZ]+)", re.I)
+
+_zone_cache: dict = {}
+
+
+def _physical_lines(chunks, encoding):
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    pending = ""
+    for chunk in chunks:
+        pending += decoder.decode(chunk) if isinstance(chunk, (bytes, bytearray)) else chunk
+        *lines, pending = pending.split("\n")
+        yield from lines
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def unfold_lines(chunks, encoding="utf-8"):
+    """Yield logical (unfolded) content lines from an iterable of bytes or str chunks."""
+    current = None
+    for raw in _physical_lines(chunks, encoding):
+        raw = raw.rstrip("\r")
+        if raw[:1] in (" ", "\t"):
+            if current is not None:
+                current += raw[1:]
+            continue
+        if current:
+            yield current
+        current = raw
+    if current:
+        yield current
+
+
+def parse_content_line(line):
+    """Split 'NAME;P1=a;P2="b:c":value' into (NAME, {P1: a, P2: b:c}, value)."""
+    in_quotes = False
+    colon = -1
+    for i, ch in enumerate(line):
+        if ch == '"':
+            in_quotes = not in_quotes
+        elif ch == ":" and not in_quotes:
+            colon = i
+            break
+    if colon < 0:
+        raise ValueError(f"Malformed content line: {line[:60]!r}")
+    head, value = line[:colon], line[colon + 1:]
+    parts = head.split(";")
+    name = parts[0].strip().upper()
+    params = {}
+    for part in parts[1:]:
+        if "=" in part:
+            k, v = part.split("=", 1)
+            params[k.strip().upper()] = v.strip().strip('"')
+    return name, params, value
+
+
+def unescape_text(value):
+    out = []
+    i = 0
+    while i < len(value):
+        ch = value[i]
+        if ch == "\\" and i + 1 < len(value):
+            nxt = value[i + 1]
+            out.append("\n" if nxt in "nN" else nxt)
+            i += 2
+            continue
+        out.append(ch)
+        i += 1
+    return "".join(out)
+
+
+def _zone(tzid):
+    if not tzid:
+        return None
+    if tzid in _zone_cache:
+        return _zone_cache[tzid]
+    name = _WINDOWS_ZONES.get(tzid.strip().lower(), tzid.strip())
+    zone = None
+    if name.upper() == "UTC":
+        zone = timezone.utc
+    elif ZoneInfo is not None:
+        try:
+            zone = ZoneInfo(name)
+        except Exception:
+            zone = None
+    _zone_cache[tzid] = zone
+    return zone
+
+
+def parse_datetime(value, params=None):
+    """
+    Parse a DATE or DATE-TIME value. All-day dates become midnight datetimes;
+    'Z' values are UTC-aware; TZID values are aware when the zone is known,
+    otherwise (and for floating times) naive.
+    """
+    params = params or {}
+    value = value.strip()
+    if params.get("VALUE", "").upper() == "DATE" or (len(value) == 8 and value.isdigit()):
+        d = date(int(value[0:4]), int(value[4:6]), int(value[6:8]))
+        return datetime(d.year, d.month, d.day)
+    utc = value.endswith("Z")
+    core = value[:-1] if utc else value
+    dt = datetime(
+        int(core[0:4]), int(core[4:6]), int(core[6:8]),
+        int(core[9:11]), int(core[11:13]), int(core[13:15] or 0),
+    )
+    if utc:
+        return dt.replace(tzinfo=timezone.utc)
+    zone = _zone(params.get("TZID"))
+    return dt.replace(tzinfo=zone) if zone else dt
+
+
+def parse_duration(value):
+    m = _DURATION_RE.match(value.strip())
+    if not m:
+        raise ValueError(f"Bad DURATION {value!r}")
+    parts = {k: int(v) for k, v in m.groupdict().items() if v and k != "sign"}
+    delta = timedelta(**parts)
+    return -delta if m.group("sign") == "-" else delta
+
+
+def iter_components(lines, name="VEVENT"):
+    """
+    Yield the properties of each `name` component as {PROP: (params, value)}
+    (lists for EXDATE/RDATE). Nested sub-components such as VALARM and lines
+    that are not valid content lines are skipped.
+    """
+    props = None
+    depth = 0
+    for line in lines:
+        if not line:
+            continue
+        upper = line[:16].upper()
+        if upper.startswith("BEGIN:"):
+            comp = line[6:].strip().upper()
+            if props is None:
+                if comp == name:
+                    props, depth = {}, 0
+            else:
+                depth += 1
+            continue
+        if upper.startswith("END:"):
+            comp = line[4:].strip().upper()
+            if props is not None:
+                if depth:
+                    depth -= 1
+                elif comp == name:
+                    yield props
+                    props = None
+            continue
+        if props is None or depth:
+            continue
+        try:
+            prop, params, value = parse_content_line(line)
+        except ValueError:
+            continue
+        if prop in _MULTI:
+            props.setdefault(prop, []).append((params, value))
+        elif prop not in props:
+            props[prop] = (params, value)
+
+
+def event_from_props(props):
+    """
+    Interpret a VEVENT's properties into plain Python values:
+    title, description, location, start, end (datetimes), plus raw
+    recurrence fields. Raises ValueError for events without a usable DTSTART.
+    """
+    if "DTSTART" not in props:
+        raise ValueError("VEVENT without DTSTART")
+    start_params, start_value = props["DTSTART"]
+    start = parse_datetime(start_value, start_params)
+    end = None
+    if "DTEND" in props:
+        end = parse_datetime(props["DTEND"][1], props["DTEND"][0])
+    elif "DURATION" in props:
+        end = start + parse_duration(props["DURATION"][1])
+
+    def text(key):
+        return unescape_text(props[key][1]) if key in props else ""
+
+    return {
+        "uid": text("UID"),
+        "title": text("SUMMARY"),
+        "description": text("DESCRIPTION"),
+        "location": text("LOCATION"),
+        "start": start,
+        "end": end,
+        "all_day": start_params.get("VALUE", "").upper() == "DATE" or len(start_value.strip()) == 8,
+        "rrule": props["RRULE"][1] if "RRULE" in props else None,
+        "rdate": props.get("RDATE", []),
+        "exdate": props.get("EXDATE", []),
+        "recurrence_id": props.get("RECURRENCE-ID"),
+        "status": text("STATUS").upper(),
+    }
+
+
+def _like(dt, ref):
+    """Give `dt` the same awareness as `ref` so the two can be compared."""
+    if ref.tzinfo is None:
+        return dt.replace(tzinfo=None)
+    return dt.replace(tzinfo=ref.tzinfo) if dt.tzinfo is None else dt
+
+
+def parse_date_list(entries, ref):
+    """Datetimes from EXDATE/RDATE/RECURRENCE-ID entries ((params, value) pairs)."""
+    out = []
+    for params, value in entries:
+        for item in value.split(","):
+            item = item.split("/")[0].strip()  # RDATE;VALUE=PERIOD:start/end
+            if item:
+                try:
+                    out.append(_like(parse_datetime(item, params), ref))
+                except (ValueError, IndexError):
+                    continue
+    return out
+
+
+def _rule_text(rrule, dtstart):
+    # dateutil insists UNTIL is UTC for aware DTSTART and naive otherwise
+    def fix(m):
+        until = _like(parse_datetime(m.group(1)), dtstart)
+        if until.tzinfo is None:
+            return "UNTIL=" + until.strftime("%Y%m%dT%H%M%S")
+        return "UNTIL=" + until.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    return _UNTIL_RE.sub(fix, rrule)
+
+
+def occurrences(ev, window_start, window_end, limit=None, skip=()):
+    """
+    Lazily yield the start datetimes of `ev` (an event_from_props dict) that fall
+    in [window_start, window_end], applying RRULE, RDATE and EXDATE. `skip`
+    holds extra instance starts to drop (instances overridden by RECURRENCE-ID
+    events); `limit` caps the number yielded. A non-recurring event yields its
+    own start if it is in the window.
+    """
+    from dateutil.rrule import rruleset, rrulestr  # deferred until a feed has something to expand
+    start = ev["start"]
+    window_start, window_end = _like(window_start, start), _like(window_end, start)
+    rset = rruleset()
+    if ev["rrule"]:
+        rset.rrule(rrulestr(_rule_text(ev["rrule"], start), dtstart=start))
+    else:
+        rset.rdate(start)
+    for dt in parse_date_list(ev["rdate"], start):
+        rset.rdate(dt)
+    for dt in parse_date_list(ev["exdate"], start) + [_like(dt, start) for dt in skip]:
+        rset.exdate(dt)
+    # xafter walks the rule forward without materialising it
+    found = rset.xafter(window_start, inc=True)
+    in_window = itertools.takewhile(lambda dt: dt <= window_end, found)
+    return itertools.islice(in_window, limit)
+
+
+def dump_datetime(dt):
+    """JSON form of a parsed datetime: [local ISO time, zone name or None]."""
+    if dt is None:
+        return None
+    zone = dt.tzinfo
+    if zone is timezone.utc:
+        return [dt.replace(tzinfo=None).isoformat(), "UTC"]
+    if zone is None or getattr(zone, "key", None) is None:
+        return [dt.isoformat(), None]
+    return [dt.replace(tzinfo=None).isoformat(), zone.key]
+
+
+def load_datetime(value):
+    if value is None:
+        return None
+    text, zone = value
+    dt = datetime.fromisoformat(text)
+    return dt.replace(tzinfo=_zone(zone)) if zone else dt
+
+
+def dump_event(ev):
+    """An event_from_props dict as JSON-serializable data (see load_event)."""
+    return dict(ev, start=dump_datetime(ev["start"]), end=dump_datetime(ev["end"]))
+
+
+def load_event(data):
+    ev = dict(data, start=load_datetime(data["start"]), end=load_datetime(data["end"]))
+    ev["rdate"] = [tuple(entry) for entry in ev["rdate"]]
+    ev["exdate"] = [tuple(entry) for entry in ev["exdate"]]
+    return ev
+
+
+def is_recurring(ev):
+    return bool(ev["rrule"] or ev["rdate"])
+
+
+def iter_events(chunks, encoding="utf-8", errors=None):
+    """
+    Yield interpreted VEVENT dicts (see event_from_props) from raw feed chunks.
+    Bad events are skipped; if `errors` is a list, one message per skip is appended.
+    """
+    for props in iter_components(unfold_lines(chunks, encoding)):
+        try:
+            yield event_from_props(props)
+        except (ValueError, IndexError, TypeError) as e:
+            if errors is not None:
+                errors.append(str(e))
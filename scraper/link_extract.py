@@ -0,0 +1,94 @@
+# scraper/link_extract.py
+"""
+Tree-free link extraction for discovery pages (ICS exports, EID detail links).
+
+`iter_links(html, base_url, match)` drives lxml's C tokenizer with a parser
+target: the target only sees start/end/data events, keeps the href and
+text of the <a> currently open, and drops everything else, so no DOM is
+ever built. The input may be a whole document or an iterable of str/bytes
+chunks (e.g. http_client.iter_chunks on a streamed response); links are
+yielded as each chunk is tokenized.
+
+`match(href, text)` receives the raw href and the anchor's text (as
+bs4's `a.get_text()` would give it) and returns True for wanted links.
+Matching links are yielded as absolute URLs, in document order.
+"""
+
+from urllib.parse import urljoin
+
+from lxml import etree
+
+
+class _AnchorTarget:
+    """lxml parser target that records (href, text) for every <a href>."""
+
+    def __init__(self, want_text):
+        self.want_text = want_text
+        self.found = []
+        self._href = None
+        self._text = []
+
+    def _flush(self):
+        if self._href is not None:
+            self.found.append((self._href, "".join(self._text)))
+            self._href = None
+            self._text = []
+
+    def start(self, tag, attrib):
+        if tag == "a":
+            self._flush()  # an unclosed <a> ends where the next one starts
+            self._href = attrib.get("href") or None
+
+    def end(self, tag):
+        if tag == "a":
+            self._flush()
+
+    def data(self, data):
+        if self._href is not None and self.want_text:
+            self._text.append(data)
+
+    def comment(self, text):
+        pass
+
+    def close(self):
+        self._flush()
+
+
+def _chunks(source):
+    if isinstance(source, (str, bytes, bytearray)):
+        step = 256 * 1024
+        for i in range(0, len(source), step):
+            yield source[i:i + step]
+    else:
+        yield from source
+
+
+def iter_links(source, base_url, match=None, want_text=True):
+    """
+    Yield absolute URLs of <a href> links in `source` for which
+    `match(href, text)` is true (all links when `match` is None).
+    Pass want_text=False when `match` ignores the text, to skip collecting it.
+    """
+    target = _AnchorTarget(want_text and match is not None)
+    parser = etree.HTMLParser(target=target)
+
+    def drain():
+        found, target.found = target.found, []
+        for href, text in found:
+            if match is None or match(href, text):
+                yield urljoin(base_url, href.strip())
+
+    for chunk in _chunks(source):
+        if chunk:
+            parser.feed(chunk)
+            yield from drain()
+    try:
+        parser.close()
+    except etree.XMLSyntaxError:
+        pass  # empty or hopeless input: nothing more to report
+    yield from drain()
+
+
+def href_contains(*needles):
+    """Predicate: href contains any of `needles` (like a[href*=...])."""
+    return lambda href, text: any(n in href for n in needles)
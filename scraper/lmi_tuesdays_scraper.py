@@ -1,7 +1,7 @@
 # scraper/lmi_tuesdays_scraper.py
 
 from ics_scrapers import ICSUtils
-from post_event import post_event
+from event_sink import publish
 
 class LMITuesdaysScraper:
     """
@@ -24,5 +24,4 @@ class LMITuesdaysScraper:
             lon=self.lon,
             event_type=self.event_type
         )
-        for ev in events:
-            post_event(ev)
+        print("LMI Tuesdays:", publish(events))
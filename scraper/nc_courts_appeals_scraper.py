@@ -1,11 +1,10 @@
-import requests
-from bs4 import BeautifulSoup
+from http_client import http_get
+from html_parse import make_soup
 from urllib.parse import urljoin
-from io import BytesIO
-from pdfminer.high_level import extract_text
-from dateutil import parser
-from datetime import timedelta
-from api_client import batch_post
+import pdf_text
+from date_extract import dated_lines, first_date
+from event_sink import publish
+from event_model import api_event
 
 
 class NCCourtOfAppealsScraper:
@@ -16,13 +15,12 @@ class NCCourtOfAppealsScraper:
     event_type = "state"
 
     def fetch(self, url: str) -> str:
-        headers = {"User-Agent": "Mozilla/5.0"}
-        r = requests.get(url, headers=headers, timeout=15)
+        r = http_get(url, timeout=15)
         r.raise_for_status()
         return r.text
 
     def discover_month_links(self, html: str) -> list[str]:
-        soup = BeautifulSoup(html, "html.parser")
+        soup = make_soup(html)
         links: list[str] = []
         for a in soup.find_all("a"):
             href = (a.get("href") or "").strip()
@@ -33,7 +31,7 @@ class NCCourtOfAppealsScraper:
         return deduped[:3]
 
     def parse_month(self, html: str, source_url: str) -> list[dict]:
-        soup = BeautifulSoup(html, "html.parser")
+        soup = make_soup(html)
         events: list[dict] = []
         # If the month page links to a PDF, attempt to parse text from it
         pdf_link = None
@@ -44,33 +42,21 @@ class NCCourtOfAppealsScraper:
                 break
         if pdf_link:
             try:
-                pdf_bytes = requests.get(pdf_link, timeout=15).content
-                text = extract_text(BytesIO(pdf_bytes))
-                # Heuristic: split by lines and look for date/time
-                for line in text.splitlines():
-                    s = line.strip()
-                    if not s:
-                        continue
-                    dt = None
-                    try:
-                        dt = parser.parse(s, fuzzy=True)
-                    except Exception:
-                        dt = None
-                    if not dt:
-                        continue
-                    end_dt = dt + timedelta(hours=2)
-                    events.append({
-                        'title': 'NC Court of Appeals Oral Arguments',
-                        'description': s[:600],
-                        'start_date': dt.isoformat(),
-                        'end_date': end_dt.isoformat(),
-                        'location_name': 'NC Court of Appeals (see PDF)',
-                        'latitude': self.lat,
-                        'longitude': self.lon,
-                        'organization_id': self.org_id,
-                        'event_type': self.event_type,
-                        'source_url': pdf_link,
-                    })
+                text = pdf_text.fetch_text(pdf_link)
+                # One scan over the whole dump; only lines holding a date become events
+                for s, dt in dated_lines(text):
+                    events.append(api_event(
+                        "NC Court of Appeals Oral Arguments",
+                        dt,
+                        default_hours=2,
+                        description=s,
+                        location_name="NC Court of Appeals (see PDF)",
+                        latitude=self.lat,
+                        longitude=self.lon,
+                        organization_id=self.org_id,
+                        event_type=self.event_type,
+                        source_url=pdf_link,
+                    ))
                 # Return early if PDF parsed produced events
                 if events:
                     return events
@@ -89,36 +75,21 @@ class NCCourtOfAppealsScraper:
             if "Oral" not in text and "Argument" not in text and "Court of Appeals" not in text:
                 # Still attempt parse since pages may be minimal
                 pass
-            dt = None
-            for piece in text.split("\n"):
-                s = piece.strip()
-                if not s:
-                    continue
-                try:
-                    dt = parser.parse(s, fuzzy=True)
-                    break
-                except Exception:
-                    continue
-            if not dt:
-                try:
-                    dt = parser.parse(text, fuzzy=True)
-                except Exception:
-                    dt = None
+            dt = first_date(text)
             if not dt:
                 continue
-            end_dt = dt + timedelta(hours=2)
-            events.append({
-                "title": "NC Court of Appeals Oral Arguments",
-                "description": text[:600],
-                "start_date": dt.isoformat(),
-                "end_date": end_dt.isoformat(),
-                "location_name": "NC Court of Appeals (see link)",
-                "latitude": self.lat,
-                "longitude": self.lon,
-                "organization_id": self.org_id,
-                "event_type": self.event_type,
-                "source_url": source_url,
-            })
+            events.append(api_event(
+                "NC Court of Appeals Oral Arguments",
+                dt,
+                default_hours=2,
+                description=text,
+                location_name="NC Court of Appeals (see link)",
+                latitude=self.lat,
+                longitude=self.lon,
+                organization_id=self.org_id,
+                event_type=self.event_type,
+                source_url=source_url,
+            ))
         return events
 
     def run_and_post(self):
@@ -148,7 +119,7 @@ class NCCourtOfAppealsScraper:
 
         print(f"✅ NC Courts (Appeals) parsed {len(deduped)} events")
         if deduped:
-            print("NC Courts (Appeals) batch:", batch_post(deduped))
+            print("NC Courts (Appeals) batch:", publish(deduped))
 
 
 if __name__ == "__main__":
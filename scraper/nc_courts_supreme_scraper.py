@@ -1,11 +1,10 @@
-import requests
-from bs4 import BeautifulSoup
+from http_client import http_get
+from html_parse import make_soup
 from urllib.parse import urljoin
-from io import BytesIO
-from pdfminer.high_level import extract_text
-from dateutil import parser
-from datetime import timedelta
-from api_client import batch_post
+import pdf_text
+from date_extract import dated_lines
+from event_sink import publish
+from event_model import api_event
 
 
 class NCSupremeCourtScraper:
@@ -16,13 +15,12 @@ class NCSupremeCourtScraper:
     event_type = "state"
 
     def fetch(self, url: str) -> str:
-        headers = {"User-Agent": "Mozilla/5.0"}
-        r = requests.get(url, headers=headers, timeout=15)
+        r = http_get(url, timeout=15)
         r.raise_for_status()
         return r.text
 
     def discover_month_links(self, html: str) -> list[str]:
-        soup = BeautifulSoup(html, "html.parser")
+        soup = make_soup(html)
         links: list[str] = []
         for a in soup.find_all("a"):
             href = (a.get("href") or "").strip()
@@ -31,12 +29,11 @@ class NCSupremeCourtScraper:
         return list(dict.fromkeys(links))[:3]
 
     def parse_month(self, url: str) -> list[dict]:
-        headers = {"User-Agent": "Mozilla/5.0"}
         try:
             html = self.fetch(url)
         except Exception:
             return []
-        soup = BeautifulSoup(html, "html.parser")
+        soup = make_soup(html)
         events: list[dict] = []
         pdf_link = None
         for a in soup.find_all('a'):
@@ -47,34 +44,23 @@ class NCSupremeCourtScraper:
         if not pdf_link:
             return []
         try:
-            pdf_bytes = requests.get(pdf_link, headers=headers, timeout=15).content
-            text = extract_text(BytesIO(pdf_bytes))
+            text = pdf_text.fetch_text(pdf_link)
         except Exception:
             return []
-        for line in text.splitlines():
-            s = line.strip()
-            if not s:
-                continue
-            dt = None
-            try:
-                dt = parser.parse(s, fuzzy=True)
-            except Exception:
-                dt = None
-            if not dt:
-                continue
-            end_dt = dt + timedelta(hours=2)
-            events.append({
-                'title': 'NC Supreme Court Oral Arguments',
-                'description': s[:600],
-                'start_date': dt.isoformat(),
-                'end_date': end_dt.isoformat(),
-                'location_name': 'NC Supreme Court (see PDF)',
-                'latitude': self.lat,
-                'longitude': self.lon,
-                'organization_id': self.org_id,
-                'event_type': self.event_type,
-                'source_url': pdf_link,
-            })
+        # One scan over the whole dump; only lines holding a date become events
+        for s, dt in dated_lines(text):
+            events.append(api_event(
+                "NC Supreme Court Oral Arguments",
+                dt,
+                default_hours=2,
+                description=s,
+                location_name="NC Supreme Court (see PDF)",
+                latitude=self.lat,
+                longitude=self.lon,
+                organization_id=self.org_id,
+                event_type=self.event_type,
+                source_url=pdf_link,
+            ))
         return events
 
     def run_and_post(self):
@@ -99,7 +85,7 @@ class NCSupremeCourtScraper:
             deduped.append(e)
         print(f"✅ NC Supreme parsed {len(deduped)} events")
         if deduped:
-            print("NC Supreme batch:", batch_post(deduped))
+            print("NC Supreme batch:", publish(deduped))
 
 
 if __name__ == "__main__":
@@ -1,8 +1,9 @@
-import requests
-from bs4 import BeautifulSoup
-from dateutil import parser
-from datetime import timedelta
-from api_client import batch_post
+from http_client import http_get
+from html_parse import make_soup
+from date_extract import parse_date
+import structured_data
+from event_sink import publish
+from event_model import api_event
 
 
 class NCDEQEventsScraper:
@@ -13,13 +14,13 @@ class NCDEQEventsScraper:
     event_type = "state"
 
     def fetch(self, url: str) -> str:
-        headers = {"User-Agent": "Mozilla/5.0"}
-        r = requests.get(url, headers=headers, timeout=15)
+        r = http_get(url, timeout=15)
         r.raise_for_status()
         return r.text
 
+    @structured_data.prefer_structured(default_hours=2)
     def parse_list(self, html: str, source_url: str) -> list[dict]:
-        soup = BeautifulSoup(html, "html.parser")
+        soup = make_soup(html)
         events: list[dict] = []
         for item in soup.select(".views-row, article, li"):
             title_el = item.find(["h2","h3","a"]) or None
@@ -33,35 +34,33 @@ class NCDEQEventsScraper:
                 if not s:
                     continue
                 try:
-                    dt = parser.parse(s, fuzzy=True)
+                    dt = parse_date(s, source="nc_deq_events")
                     break
                 except Exception:
                     continue
             if not dt:
                 try:
-                    dt = parser.parse(text, fuzzy=True)
+                    dt = parse_date(text, source="nc_deq_events")
                 except Exception:
                     dt = None
             if not dt:
                 continue
-            # End time heuristics: 2h window default
-            end_dt = dt + timedelta(hours=2)
             a = item.find("a")
             url = a.get("href") if a and a.get("href") else source_url
             if url and url.startswith("/"):
                 url = "https://www.deq.nc.gov" + url
-            events.append({
-                "title": title,
-                "description": text[:600],
-                "start_date": dt.isoformat(),
-                "end_date": end_dt.isoformat(),
-                "location_name": self.org_name,
-                "latitude": self.lat,
-                "longitude": self.lon,
-                "organization_id": self.org_id,
-                "event_type": self.event_type,
-                "source_url": url,
-            })
+            events.append(api_event(
+                title,
+                dt,
+                default_hours=2,
+                description=text,
+                location_name=self.org_name,
+                latitude=self.lat,
+                longitude=self.lon,
+                organization_id=self.org_id,
+                event_type=self.event_type,
+                source_url=url,
+            ))
         return events
 
     def run_and_post(self):
@@ -73,7 +72,7 @@ class NCDEQEventsScraper:
         events = self.parse_list(html, self.base_url)
         print(f"✅ NCDEQ parsed {len(events)} events")
         if events:
-            print("NCDEQ batch:", batch_post(events))
+            print("NCDEQ batch:", publish(events))
 
 
 if __name__ == "__main__":
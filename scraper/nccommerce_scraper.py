@@ -1,8 +1,6 @@
 from base_scraper import BaseScraper
-from post_event import post_event
-from bs4 import BeautifulSoup
-from dateutil import parser
-from datetime import timedelta
+from date_extract import parse_date
+from event_model import api_event
 
 
 class NCCommerceScraper(BaseScraper):
@@ -12,22 +10,14 @@ class NCCommerceScraper(BaseScraper):
     def __init__(self):
         super().__init__(
             "NC Commerce Events",
-            "https://www.commerce.nc.gov/events",
-            headers={
-                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-                "Accept-Language": "en-US,en;q=0.5",
-                "Accept-Encoding": "gzip, deflate",
-                "Connection": "keep-alive",
-                "Upgrade-Insecure-Requests": "1"
-            }
+            "https://www.commerce.nc.gov/events"
         )
         self.org_id = 32
         self.lat, self.lon = 35.771, -78.638
         self.event_type = "government"
 
     def parse_events(self, html):
-        soup = BeautifulSoup(html, "html.parser")
+        soup = self.get_soup(html)
         events = []
         
         # Try different selectors for Commerce events
@@ -90,28 +80,21 @@ class NCCommerceScraper(BaseScraper):
             date_str = date_str.replace("\n", " ").replace("\r", " ").strip()
             
             try:
-                start = parser.parse(date_str, fuzzy=True)
-                end = start + timedelta(hours=1)
+                start = parse_date(date_str, source="nccommerce")
             except Exception as e:
                 print(f"❌ Date parse error for '{title}': {e}")
                 continue
 
-            events.append({
-                "title": title,
-                "description": "",
-                "start_date": start.isoformat(),
-                "end_date": end.isoformat(),
-                "location_name": "NC Dept of Commerce",
-                "latitude": self.lat,
-                "longitude": self.lon,
-                "organization_id": self.org_id,
-                "event_type": self.event_type,
-                "source_url": url
-            })
+            events.append(api_event(
+                title,
+                start,
+                location_name="NC Dept of Commerce",
+                latitude=self.lat,
+                longitude=self.lon,
+                organization_id=self.org_id,
+                event_type=self.event_type,
+                source_url=url,
+            ))
             
         print(f"✅ Found {len(events)} Commerce events")
         return events
-
-    def run_and_post(self):
-        for e in self.run():
-            post_event(e)
\ No newline at end of file
@@ -1,10 +1,8 @@
 # scraper/ncdhhs_scraper.py
 
 from base_scraper import BaseScraper
-from post_event import post_event
-from bs4 import BeautifulSoup
-from dateutil import parser
-from datetime import timedelta
+from date_extract import parse_date
+from event_model import api_event
 
 class NCDHHSScraper(BaseScraper):
     """
@@ -13,22 +11,14 @@ class NCDHHSScraper(BaseScraper):
     def __init__(self):
         super().__init__(
             "NC DHHS Events",
-            "https://www.ncdhhs.gov/news",
-            headers={
-                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-                "Accept-Language": "en-US,en;q=0.5",
-                "Accept-Encoding": "gzip, deflate",
-                "Connection": "keep-alive",
-                "Upgrade-Insecure-Requests": "1"
-            }
+            "https://www.ncdhhs.gov/news"
         )
         self.org_id = 31
         self.lat, self.lon = 35.904, -78.940
         self.event_type = "government"
 
     def parse_events(self, html):
-        soup = BeautifulSoup(html, "html.parser")
+        soup = self.get_soup(html)
         events = []
         
         # Try different selectors for DHHS news/events
@@ -89,28 +79,21 @@ class NCDHHSScraper(BaseScraper):
             date_str = date_tag.get("content") or date_tag.get("datetime") or date_tag.text.strip()
             
             try:
-                start = parser.parse(date_str, fuzzy=True)
-                end = start + timedelta(hours=1)
+                start = parse_date(date_str, source="ncdhhs")
             except Exception as e:
                 print(f"❌ Date parse error for '{title}': {e}")
                 continue
 
-            events.append({
-                "title": title,
-                "description": "",
-                "start_date": start.isoformat(),
-                "end_date": end.isoformat(),
-                "location_name": "NC DHHS",
-                "latitude": self.lat,
-                "longitude": self.lon,
-                "organization_id": self.org_id,
-                "event_type": self.event_type,
-                "source_url": url
-            })
+            events.append(api_event(
+                title,
+                start,
+                location_name="NC DHHS",
+                latitude=self.lat,
+                longitude=self.lon,
+                organization_id=self.org_id,
+                event_type=self.event_type,
+                source_url=url,
+            ))
             
         print(f"✅ Found {len(events)} DHHS events")
         return events
-
-    def run_and_post(self):
-        for e in self.run():
-            post_event(e)
@@ -1,11 +1,9 @@
 # scraper/ncsu_athletics_scraper.py
 
 from base_scraper import BaseScraper
-from post_event import post_event
-from bs4 import BeautifulSoup
-from dateutil import parser
+from date_extract import parse_date
 from datetime import timedelta
-import requests
+from event_model import api_event
 
 class NCSUAthleticsScraper(BaseScraper):
     """
@@ -15,15 +13,7 @@ class NCSUAthleticsScraper(BaseScraper):
     def __init__(self):
         super().__init__(
             "NC State Athletics",
-            "https://gopack.com/calendar.aspx",
-            headers={
-                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-                "Accept-Language": "en-US,en;q=0.5",
-                "Accept-Encoding": "gzip, deflate",
-                "Connection": "keep-alive",
-                "Upgrade-Insecure-Requests": "1"
-            }
+            "https://gopack.com/calendar.aspx"
         )
         self.org_id = 1  # Same as NCSU
         self.lat, self.lon = 35.7847, -78.6821
@@ -35,7 +25,7 @@ class NCSUAthleticsScraper(BaseScraper):
         return self.parse_events("")  # Empty HTML since we're not fetching
 
     def parse_events(self, html):
-        soup = BeautifulSoup(html, "html.parser")
+        soup = self.get_soup(html)
         events = []
 
         # Always create sample athletics events since the website is complex to scrape
@@ -92,28 +82,24 @@ class NCSUAthleticsScraper(BaseScraper):
         
         for event_data in sample_events:
             try:
-                start = parser.parse(event_data["date"])
+                start = parse_date(event_data["date"], source="ncsu_athletics", fuzzy=False)
                 end = start + timedelta(hours=3)  # Default 3-hour game
                 
-                events.append({
-                    "title": event_data["title"],
-                    "description": event_data["description"],
-                    "start_date": start.isoformat(),
-                    "end_date": end.isoformat(),
-                    "location_name": event_data["location"],
-                    "latitude": self.lat,
-                    "longitude": self.lon,
-                    "organization_id": self.org_id,
-                    "event_type": self.event_type,
-                    "source_url": "https://gopack.com/calendar.aspx"
-                })
+                events.append(api_event(
+                    event_data["title"],
+                    start,
+                    end,
+                    description=event_data["description"],
+                    location_name=event_data["location"],
+                    latitude=self.lat,
+                    longitude=self.lon,
+                    organization_id=self.org_id,
+                    event_type=self.event_type,
+                    source_url="https://gopack.com/calendar.aspx",
+                ))
             except Exception as e:
                 print(f"❌ Error parsing sample athletics event: {e}")
                 continue
 
         print(f"✅ Found {len(events)} NC State athletics events")
         return events
-
-    def run_and_post(self):
-        for e in self.run():
-            post_event(e) 
\ No newline at end of file
@@ -2,7 +2,8 @@ import requests
 from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
 import json
-from post_event import post_event
+from event_sink import publish
+from event_model import api_event
 
 class NCSURealEventsScraper:
     def __init__(self):
@@ -16,61 +17,61 @@ class NCSURealEventsScraper:
         
         # Real NC State events data (simulated from actual sources)
         real_events = [
-            {
-                "title": "NC State Engineering Career Fair",
-                "description": "Annual career fair connecting engineering students with top employers. Over 100 companies will be present.",
-                "start_date": "2024-02-15T09:00:00",
-                "end_date": "2024-02-15T17:00:00",
-                "location_name": "Talley Student Union, NC State University",
-                "latitude": 35.7877,
-                "longitude": -78.6642,
-                "event_type": "academic",
-                "source_url": "https://calendar.ncsu.edu/event/engineering_career_fair"
-            },
-            {
-                "title": "Wolfpack Basketball vs Duke",
-                "description": "ACC rivalry game at PNC Arena. NC State Wolfpack takes on Duke Blue Devils.",
-                "start_date": "2024-02-20T19:00:00",
-                "end_date": "2024-02-20T22:00:00",
-                "location_name": "PNC Arena, Raleigh",
-                "latitude": 35.8033,
-                "longitude": -78.7222,
-                "event_type": "academic",
-                "source_url": "https://calendar.ncsu.edu/event/wolfpack_basketball"
-            },
-            {
-                "title": "Spring Break 2024",
-                "description": "NC State University Spring Break - No classes",
-                "start_date": "2024-03-11T00:00:00",
-                "end_date": "2024-03-15T23:59:59",
-                "location_name": "NC State University",
-                "latitude": 35.7877,
-                "longitude": -78.6642,
-                "event_type": "holiday",
-                "source_url": "https://calendar.ncsu.edu/event/spring_break"
-            },
-            {
-                "title": "NC State Research Symposium",
-                "description": "Annual research showcase featuring student and faculty research projects across all disciplines.",
-                "start_date": "2024-03-25T08:00:00",
-                "end_date": "2024-03-25T17:00:00",
-                "location_name": "Hunt Library, NC State University",
-                "latitude": 35.7877,
-                "longitude": -78.6642,
-                "event_type": "academic",
-                "source_url": "https://calendar.ncsu.edu/event/research_symposium"
-            },
-            {
-                "title": "NC State Commencement 2024",
-                "description": "Spring 2024 Commencement Ceremony for graduating students",
-                "start_date": "2024-05-10T09:00:00",
-                "end_date": "2024-05-10T12:00:00",
-                "location_name": "Carter-Finley Stadium, Raleigh",
-                "latitude": 35.7997,
-                "longitude": -78.7219,
-                "event_type": "academic",
-                "source_url": "https://calendar.ncsu.edu/event/commencement_2024"
-            }
+            api_event(
+                "NC State Engineering Career Fair",
+                "2024-02-15T09:00:00",
+                "2024-02-15T17:00:00",
+                description="Annual career fair connecting engineering students with top employers. Over 100 companies will be present.",
+                location_name="Talley Student Union, NC State University",
+                latitude=35.7877,
+                longitude=-78.6642,
+                event_type="academic",
+                source_url="https://calendar.ncsu.edu/event/engineering_career_fair",
+            ),
+            api_event(
+                "Wolfpack Basketball vs Duke",
+                "2024-02-20T19:00:00",
+                "2024-02-20T22:00:00",
+                description="ACC rivalry game at PNC Arena. NC State Wolfpack takes on Duke Blue Devils.",
+                location_name="PNC Arena, Raleigh",
+                latitude=35.8033,
+                longitude=-78.7222,
+                event_type="academic",
+                source_url="https://calendar.ncsu.edu/event/wolfpack_basketball",
+            ),
+            api_event(
+                "Spring Break 2024",
+                "2024-03-11T00:00:00",
+                "2024-03-15T23:59:59",
+                description="NC State University Spring Break - No classes",
+                location_name="NC State University",
+                latitude=35.7877,
+                longitude=-78.6642,
+                event_type="holiday",
+                source_url="https://calendar.ncsu.edu/event/spring_break",
+            ),
+            api_event(
+                "NC State Research Symposium",
+                "2024-03-25T08:00:00",
+                "2024-03-25T17:00:00",
+                description="Annual research showcase featuring student and faculty research projects across all disciplines.",
+                location_name="Hunt Library, NC State University",
+                latitude=35.7877,
+                longitude=-78.6642,
+                event_type="academic",
+                source_url="https://calendar.ncsu.edu/event/research_symposium",
+            ),
+            api_event(
+                "NC State Commencement 2024",
+                "2024-05-10T09:00:00",
+                "2024-05-10T12:00:00",
+                description="Spring 2024 Commencement Ceremony for graduating students",
+                location_name="Carter-Finley Stadium, Raleigh",
+                latitude=35.7997,
+                longitude=-78.7219,
+                event_type="academic",
+                source_url="https://calendar.ncsu.edu/event/commencement_2024",
+            )
         ]
         
         return real_events
@@ -81,21 +82,12 @@ class NCSURealEventsScraper:
         
         try:
             events = self.scrape_ncsu_events()
-            added_count = 0
-            skipped_count = 0
-            
-            for event in events:
-                try:
-                    if post_event(event):
-                        added_count += 1
-                    else:
-                        skipped_count += 1
-                except Exception as e:
-                    print(f"❌ Failed to post {event['title']}: {str(e)}")
-            
+            stats = publish(events)
+
             print(f"\n📊 NC State Events Summary:")
-            print(f"   ✅ Added: {added_count}")
-            print(f"   ⏭️  Skipped (duplicates): {skipped_count}")
+            print(f"   ✅ Added: {stats.get('inserted', 0)}")
+            print(f"   ⏭️  Skipped (duplicates): {stats.get('duplicates', 0) + stats.get('skipped_duplicates', 0)}")
+            print(f"   ⏸️  Unchanged since last run: {stats.get('skipped_unchanged', 0)}")
             print(f"   📋 Total processed: {len(events)}")
                     
         except Exception as e:
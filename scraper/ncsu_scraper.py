@@ -1,15 +1,14 @@
 from base_scraper import BaseScraper
-from api_client import batch_post
+from event_sink import publish
 from datetime import datetime, timedelta
-from bs4 import BeautifulSoup
-from dateutil import parser  # Requires: pip install python-dateutil
+from date_extract import parse_date
 
 class NCSUScraper(BaseScraper):
     def __init__(self):
         super().__init__("NC State University", "https://calendar.ncsu.edu/")
 
     def parse_events(self, html):
-        soup = BeautifulSoup(html, "html.parser")
+        soup = self.get_soup(html)
         events = []
 
         event_cards = soup.select(".em-card")  # Matches top-level event blocks
@@ -32,7 +31,7 @@ class NCSUScraper(BaseScraper):
                 title = title_tag.text.strip()
 
                 try:
-                    start_date = parser.parse(date_str, fuzzy=True)
+                    start_date = parse_date(date_str, source="ncsu")
                     # Default to 1-hour duration if no end specified
                     end_date = start_date + timedelta(hours=1)
                 except Exception as e:
@@ -64,5 +63,5 @@ class NCSUScraper(BaseScraper):
     def run_and_post(self):
         events = self.run()
         if events:
-            stats = batch_post(events)
+            stats = publish(events)
             print("NCSU batch:", stats)
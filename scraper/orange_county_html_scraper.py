@@ -1,8 +1,10 @@
-import requests
-from bs4 import BeautifulSoup
-from dateutil import parser
-from datetime import timedelta
-from api_client import batch_post
+from http_client import http_get
+from urllib.parse import urljoin
+from html_parse import make_soup
+from date_extract import parse_date
+import structured_data
+from event_sink import publish
+from event_model import api_event
 
 
 class OrangeCountyHTMLScraper:
@@ -13,13 +15,13 @@ class OrangeCountyHTMLScraper:
     event_type = "government"
 
     def fetch(self, url: str) -> str:
-        headers = {"User-Agent": "Mozilla/5.0"}
-        r = requests.get(url, headers=headers, timeout=15)
+        r = http_get(url, timeout=15)
         r.raise_for_status()
         return r.text
 
+    @structured_data.prefer_structured(default_hours=2)
     def parse_list(self, html: str, source_url: str) -> list[dict]:
-        soup = BeautifulSoup(html, "html.parser")
+        soup = make_soup(html)
         events: list[dict] = []
 
         # CivicPlus calendar entries in list view
@@ -29,31 +31,29 @@ class OrangeCountyHTMLScraper:
                 continue
             title = title_el.get_text(strip=True)
             href = title_el.get("href") if title_el.name == "a" else None
-            url = href if (href and href.startswith("http")) else (source_url if not href else requests.compat.urljoin(source_url, href))
+            url = href if (href and href.startswith("http")) else (source_url if not href else urljoin(source_url, href))
 
             text = item.get_text(" ", strip=True)
             start = None
             for candidate in [text[:180], text]:
                 try:
-                    start = parser.parse(candidate, fuzzy=True)
+                    start = parse_date(candidate, source="orange_county_html")
                     break
                 except Exception:
                     continue
             if not start:
                 continue
-            end = start + timedelta(hours=2)
-            events.append({
-                "title": title,
-                "description": "",
-                "start_date": start.isoformat(),
-                "end_date": end.isoformat(),
-                "location_name": self.org_name,
-                "latitude": self.lat,
-                "longitude": self.lon,
-                "organization_id": self.org_id,
-                "event_type": self.event_type,
-                "source_url": url,
-            })
+            events.append(api_event(
+                title,
+                start,
+                default_hours=2,
+                location_name=self.org_name,
+                latitude=self.lat,
+                longitude=self.lon,
+                organization_id=self.org_id,
+                event_type=self.event_type,
+                source_url=url,
+            ))
         return events
 
     def discover_category_urls(self) -> list[str]:
@@ -71,7 +71,7 @@ class OrangeCountyHTMLScraper:
             all_events.extend(self.parse_list(html, url))
         print(f"✅ Orange County (HTML) parsed {len(all_events)} events across categories")
         if all_events:
-            print("Orange County (HTML) batch:", batch_post(all_events))
+            print("Orange County (HTML) batch:", publish(all_events))
 
 
 if __name__ == "__main__":
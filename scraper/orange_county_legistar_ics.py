@@ -1,8 +1,8 @@
-import requests
-from bs4 import BeautifulSoup
+from http_client import http_get
+from html_parse import make_soup
 from urllib.parse import urljoin
 from ics_scrapers import ICSUtils
-from api_client import batch_post
+from event_sink import publish
 
 
 class OrangeCountyLegistarICSScraper:
@@ -13,15 +13,14 @@ class OrangeCountyLegistarICSScraper:
     event_type = "government"
 
     def fetch_ics_links(self) -> list[str]:
-        headers = {"User-Agent": "Mozilla/5.0"}
         try:
-            r = requests.get(self.base_url, headers=headers, timeout=15)
+            r = http_get(self.base_url, timeout=15)
             r.raise_for_status()
         except Exception as e:
             print(f"❌ Failed to fetch Orange County Legistar calendar: {e}")
             return []
 
-        soup = BeautifulSoup(r.text, "html.parser")
+        soup = make_soup(r.text)
         links = []
         # Primary iCal export links
         for a in soup.select('a[href*="View.ashx?M=IC&"]'):
@@ -36,11 +35,11 @@ class OrangeCountyLegistarICSScraper:
                 continue
             year_url = urljoin(self.base_url, year_href)
             try:
-                yr = requests.get(year_url, headers=headers, timeout=15)
+                yr = http_get(year_url, timeout=15)
                 yr.raise_for_status()
             except Exception:
                 continue
-            ysoup = BeautifulSoup(yr.text, 'html.parser')
+            ysoup = make_soup(yr.text)
             for y in ysoup.select('a[href*="View.ashx?M=IC&"]'):
                 href = y.get('href')
                 if href:
@@ -50,24 +49,15 @@ class OrangeCountyLegistarICSScraper:
         return unique
 
     def run_and_post(self):
-        events = []
-        for ics_url in self.fetch_ics_links():
-            events.extend(
-                ICSUtils.parse_ics(
-                    ics_url,
-                    org_id=self.org_id,
-                    org_name=self.org_name,
-                    lat=self.lat,
-                    lon=self.lon,
-                    event_type=self.event_type,
-                )
-            )
-
-        if events:
-            stats = batch_post(events)
-            print("Orange County Legistar ICS batch:", stats)
-        else:
-            print("Orange County Legistar ICS: no events parsed")
+        events = ICSUtils.parse_feeds(
+            self.fetch_ics_links(),
+            org_id=self.org_id,
+            org_name=self.org_name,
+            lat=self.lat,
+            lon=self.lon,
+            event_type=self.event_type,
+        )
+        print("Orange County Legistar ICS batch:", publish(events))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,137 @@
+# scraper/pdf_text.py
+"""
+Cached, page-bounded PDF text extraction for the court calendar scrapers.
+
+PDFs are downloaded as a stream and abandoned once they pass PDF_MAX_MB.
+pdfminer only reads the first PDF_MAX_PAGES pages (or the pages asked for)
+and runs in a small process pool (PDF_WORKERS), so a slow multi-page
+document neither holds the GIL nor keeps pdfminer's memory in the main
+process. Extracted text is cached on disk by the SHA-256 of the PDF bytes
+plus the page range, so an unchanged calendar is never re-extracted; with
+the HTTP cache answering 304s this makes a repeat run free.
+"""
+
+import hashlib
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+
+from http_client import http_get, iter_chunks
+
+CACHE_DIR = os.getenv(
+    "PDF_TEXT_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "pdf_text"),
+)
+MAX_BYTES = int(float(os.getenv("PDF_MAX_MB", "20")) * 1024 * 1024)
+MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "12"))
+WORKERS = int(os.getenv("PDF_WORKERS", "2"))
+TTL_SECONDS = int(os.getenv("PDF_TEXT_TTL_DAYS", "60")) * 86400
+
+_lock = threading.Lock()
+_pool = None
+_pruned = False
+
+
+class PDFTooLarge(ValueError):
+    """The PDF exceeds PDF_MAX_MB; raised before the whole body is read."""
+
+
+def download(url, max_bytes=MAX_BYTES, timeout=15) -> bytes:
+    """Stream a PDF into memory, giving up as soon as it passes `max_bytes`."""
+    r = http_get(url, timeout=timeout, stream=True)
+    try:
+        r.raise_for_status()
+        declared = r.headers.get("Content-Length")
+        if declared and declared.isdigit() and int(declared) > max_bytes:
+            raise PDFTooLarge(f"{url} is {int(declared) // 1024} KB (limit {max_bytes // 1024} KB)")
+        buf = BytesIO()
+        for chunk in iter_chunks(r):
+            buf.write(chunk)
+            if buf.tell() > max_bytes:
+                raise PDFTooLarge(f"{url} exceeds {max_bytes // 1024} KB")
+        return buf.getvalue()
+    finally:
+        r.close()
+
+
+def _extract(pdf_bytes, page_numbers, maxpages):
+    # Runs in a worker process; pdfminer is imported there, not in the scraper
+    from pdfminer.high_level import extract_text
+    return extract_text(BytesIO(pdf_bytes), page_numbers=page_numbers, maxpages=maxpages)
+
+
+def _executor():
+    global _pool
+    with _lock:
+        if _pool is None and WORKERS > 0:
+            # spawn, not fork: the runner is multi-threaded and forking it is unsafe
+            _pool = ProcessPoolExecutor(max_workers=WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def _cache_path(digest, page_numbers, maxpages):
+    pages = ",".join(str(p) for p in sorted(page_numbers)) if page_numbers else f"first{maxpages}"
+    return os.path.join(CACHE_DIR, digest[:2], f"{digest}.{pages}.txt")
+
+
+def _prune():
+    global _pruned
+    if _pruned:
+        return
+    _pruned = True
+    cutoff = time.time() - TTL_SECONDS
+    for root, _dirs, files in os.walk(CACHE_DIR):
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+
+
+def extract(pdf_bytes, pages=None, maxpages=MAX_PAGES) -> str:
+    """
+    Text of `pages` (0-based page numbers) or of the first `maxpages` pages.
+    Served from the content-hash cache when this exact PDF was seen before.
+    """
+    page_numbers = set(pages) if pages is not None else None
+    maxpages = 0 if page_numbers else maxpages
+    digest = hashlib.sha256(pdf_bytes).hexdigest()
+    path = _cache_path(digest, page_numbers, maxpages)
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            os.utime(path)
+            return fh.read()
+    except OSError:
+        pass
+
+    text = None
+    pool = _executor()
+    if pool is not None:
+        try:
+            text = pool.submit(_extract, pdf_bytes, page_numbers, maxpages).result()
+        except BrokenProcessPool as e:
+            print(f"⚠️ PDF worker pool unavailable ({e}); extracting in-process")
+    if text is None:
+        text = _extract(pdf_bytes, page_numbers, maxpages)
+
+    try:
+        _prune()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            fh.write(text)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+    return text
+
+
+def fetch_text(url, pages=None, maxpages=MAX_PAGES, max_bytes=MAX_BYTES) -> str:
+    """Download `url` (size-capped) and return its extracted text."""
+    return extract(download(url, max_bytes=max_bytes), pages=pages, maxpages=maxpages)
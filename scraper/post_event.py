@@ -1,12 +1,12 @@
 # scraper/post_event.py
 
-import requests
+from http_client import http_post
 
 API_URL = "http://localhost:3001/api/events"
 
 def post_event(event):
     try:
-        response = requests.post(API_URL, json=event)
+        response = http_post(API_URL, json=event, timeout=15)
         if response.status_code == 201:
             print(f"✅ Posted: {event['title']}")
             return True
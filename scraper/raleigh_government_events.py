@@ -2,7 +2,8 @@ import requests
 from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
 import json
-from api_client import batch_post
+from event_sink import publish
+from event_model import api_event
 
 class RaleighGovernmentEventsScraper:
     def __init__(self):
@@ -16,61 +17,61 @@ class RaleighGovernmentEventsScraper:
         
         # Real Raleigh government events data
         real_events = [
-            {
-                "title": "Raleigh City Council Meeting",
-                "description": "Regular City Council meeting. Public comment period available. Agenda includes budget review and development proposals.",
-                "start_date": "2024-02-20T19:00:00",
-                "end_date": "2024-02-20T22:00:00",
-                "location_name": "Raleigh City Hall, Council Chambers",
-                "latitude": 35.7796,
-                "longitude": -78.6382,
-                "event_type": "government",
-                "source_url": "https://raleighnc.gov/city-council-meetings"
-            },
-            {
-                "title": "Downtown Raleigh Development Public Hearing",
-                "description": "Public hearing on proposed downtown development project. Citizens invited to provide input on zoning changes.",
-                "start_date": "2024-02-22T18:00:00",
-                "end_date": "2024-02-22T20:00:00",
-                "location_name": "Raleigh Convention Center",
-                "latitude": 35.7731,
-                "longitude": -78.6389,
-                "event_type": "government",
-                "source_url": "https://raleighnc.gov/public-hearings"
-            },
-            {
-                "title": "Raleigh Parks & Recreation Board Meeting",
-                "description": "Monthly Parks & Recreation Board meeting. Discussion of new park projects and facility improvements.",
-                "start_date": "2024-02-28T17:00:00",
-                "end_date": "2024-02-28T19:00:00",
-                "location_name": "Raleigh Parks & Recreation Office",
-                "latitude": 35.7796,
-                "longitude": -78.6382,
-                "event_type": "government",
-                "source_url": "https://raleighnc.gov/parks-board"
-            },
-            {
-                "title": "Raleigh Transportation Public Forum",
-                "description": "Public forum on transportation improvements and transit expansion plans for Raleigh.",
-                "start_date": "2024-03-05T18:30:00",
-                "end_date": "2024-03-05T20:30:00",
-                "location_name": "Raleigh Municipal Building",
-                "latitude": 35.7796,
-                "longitude": -78.6382,
-                "event_type": "government",
-                "source_url": "https://raleighnc.gov/transportation-forum"
-            },
-            {
-                "title": "Raleigh Budget Workshop",
-                "description": "Public workshop on Raleigh's 2024-2025 budget. Learn about city spending priorities and provide feedback.",
-                "start_date": "2024-03-12T19:00:00",
-                "end_date": "2024-03-12T21:00:00",
-                "location_name": "Raleigh City Hall, Conference Room A",
-                "latitude": 35.7796,
-                "longitude": -78.6382,
-                "event_type": "government",
-                "source_url": "https://raleighnc.gov/budget-workshop"
-            }
+            api_event(
+                "Raleigh City Council Meeting",
+                "2024-02-20T19:00:00",
+                "2024-02-20T22:00:00",
+                description="Regular City Council meeting. Public comment period available. Agenda includes budget review and development proposals.",
+                location_name="Raleigh City Hall, Council Chambers",
+                latitude=35.7796,
+                longitude=-78.6382,
+                event_type="government",
+                source_url="https://raleighnc.gov/city-council-meetings",
+            ),
+            api_event(
+                "Downtown Raleigh Development Public Hearing",
+                "2024-02-22T18:00:00",
+                "2024-02-22T20:00:00",
+                description="Public hearing on proposed downtown development project. Citizens invited to provide input on zoning changes.",
+                location_name="Raleigh Convention Center",
+                latitude=35.7731,
+                longitude=-78.6389,
+                event_type="government",
+                source_url="https://raleighnc.gov/public-hearings",
+            ),
+            api_event(
+                "Raleigh Parks & Recreation Board Meeting",
+                "2024-02-28T17:00:00",
+                "2024-02-28T19:00:00",
+                description="Monthly Parks & Recreation Board meeting. Discussion of new park projects and facility improvements.",
+                location_name="Raleigh Parks & Recreation Office",
+                latitude=35.7796,
+                longitude=-78.6382,
+                event_type="government",
+                source_url="https://raleighnc.gov/parks-board",
+            ),
+            api_event(
+                "Raleigh Transportation Public Forum",
+                "2024-03-05T18:30:00",
+                "2024-03-05T20:30:00",
+                description="Public forum on transportation improvements and transit expansion plans for Raleigh.",
+                location_name="Raleigh Municipal Building",
+                latitude=35.7796,
+                longitude=-78.6382,
+                event_type="government",
+                source_url="https://raleighnc.gov/transportation-forum",
+            ),
+            api_event(
+                "Raleigh Budget Workshop",
+                "2024-03-12T19:00:00",
+                "2024-03-12T21:00:00",
+                description="Public workshop on Raleigh's 2024-2025 budget. Learn about city spending priorities and provide feedback.",
+                location_name="Raleigh City Hall, Conference Room A",
+                latitude=35.7796,
+                longitude=-78.6382,
+                event_type="government",
+                source_url="https://raleighnc.gov/budget-workshop",
+            )
         ]
         
         return real_events
@@ -83,7 +84,7 @@ class RaleighGovernmentEventsScraper:
             events = self.scrape_government_events()
             
             if events:
-                stats = batch_post(events)
+                stats = publish(events)
                 print("Raleigh batch:", stats)
                     
         except Exception as e:
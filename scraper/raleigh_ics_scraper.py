@@ -1,7 +1,7 @@
 # scraper/raleigh_ics_scraper.py
 
 from ics_scrapers import ICSUtils
-from api_client import batch_post
+from event_sink import publish
 
 class RaleighICSScraper:
     def __init__(self):
@@ -22,6 +22,4 @@ class RaleighICSScraper:
             lon=self.lon,
             event_type=self.event_type
         )
-        if events:
-            stats = batch_post(events)
-            print("Raleigh ICS batch:", stats)
+        print("Raleigh ICS batch:", publish(events))
@@ -1,9 +1,8 @@
 # scraper/raleigh_scraper.py
 
 from base_scraper import BaseScraper
-from api_client import batch_post
-from bs4 import BeautifulSoup
-from dateutil import parser
+from event_sink import publish
+from date_extract import parse_date
 from datetime import timedelta
 
 class RaleighCityScraper(BaseScraper):
@@ -13,19 +12,11 @@ class RaleighCityScraper(BaseScraper):
     def __init__(self):
         super().__init__(
             "Raleigh City Events",
-            "https://raleighnc.gov/",
-            headers={
-                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-                "Accept-Language": "en-US,en;q=0.5",
-                "Accept-Encoding": "gzip, deflate",
-                "Connection": "keep-alive",
-                "Upgrade-Insecure-Requests": "1"
-            }
+            "https://raleighnc.gov/"
         )
 
     def parse_events(self, html):
-        soup = BeautifulSoup(html, "html.parser")
+        soup = self.get_soup(html)
         events = []
 
         # Look for event containers
@@ -50,7 +41,7 @@ class RaleighCityScraper(BaseScraper):
                     continue
 
                 try:
-                    start = parser.parse(date_str, fuzzy=True)
+                    start = parse_date(date_str, source="raleigh")
                     end = start + timedelta(hours=1)
                 except Exception as e:
                     print(f"❌ Date parse error for '{title}': {e}")
@@ -81,5 +72,5 @@ class RaleighCityScraper(BaseScraper):
     def run_and_post(self):
         events = self.run()
         if events:
-            stats = batch_post(events)
+            stats = publish(events)
             print("Raleigh batch:", stats)
\ No newline at end of file
@@ -0,0 +1,74 @@
+# scraper/rate_limit.py
+"""
+Per-host politeness scheduler: one token bucket per origin, shared by every
+scraper in the process. http_client takes a token before each network request,
+so parallel scrapers hitting the same site (e.g. the five durhamnc.gov
+scrapers) are paced together instead of each at full speed.
+
+Rates and burst sizes come from config.HOST_RATE_LIMITS; other hosts use
+HTTP_RATE_PER_SEC / HTTP_RATE_BURST.
+"""
+
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+from config import HOST_RATE_LIMITS
+
+DEFAULT_RATE = float(os.getenv("HTTP_RATE_PER_SEC", "4"))
+DEFAULT_BURST = int(os.getenv("HTTP_RATE_BURST", "8"))
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, holding at most `burst`."""
+
+    def __init__(self, rate, burst):
+        self.rate = float(rate)
+        self.burst = max(1.0, float(burst))
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _reserve(self):
+        # Take a token (possibly going negative) and return how long to wait for it.
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def acquire(self):
+        if self.rate <= 0:
+            return 0.0
+        wait = self._reserve()
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+def host_key(url) -> str:
+    host = (urlparse(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+_buckets: dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def bucket_for(url) -> TokenBucket:
+    host = host_key(url)
+    bucket = _buckets.get(host)
+    if bucket is None:
+        with _buckets_lock:
+            bucket = _buckets.get(host)
+            if bucket is None:
+                rate, burst = HOST_RATE_LIMITS.get(host, (DEFAULT_RATE, DEFAULT_BURST))
+                bucket = _buckets[host] = TokenBucket(rate, burst)
+    return bucket
+
+
+def acquire(url) -> float:
+    """Block until the host of `url` may be requested again; returns seconds waited."""
+    return bucket_for(url).acquire()
@@ -3,56 +3,250 @@
 EventPulse NC - Run All Scrapers
 Populates the database with real event data from multiple sources
 Priority order based on EventPulse NC documentation
+
+Scrapers run concurrently (``--jobs``) with a per-host cap (``--per-host``) so
+one slow origin cannot hold up the whole run (request pacing per host is left
+to the token buckets in rate_limit.py); each scraper's output is
+buffered and reported in priority order.
+
+``--record`` saves every HTTP response to a cassette and ``--replay`` serves
+them back with no network access, for reproducible profiling of the parse
+phase (see cassette.py).
+
+Runs are incremental: only events that are new or changed since the last
+successful upload are posted, and scrapers can keep per-source watermarks
+(see state_store.py). ``--full`` re-posts everything.
+
+``--sink`` picks where events go (event_sink.py): the HTTP API (default),
+an NDJSON file, or ``sqlite`` to bulk-load backend/events.db directly when
+running on the API's host. ``--sync`` sends each scraper's output as a change
+set (inserts, updates, retirements) against what it contributed last run
+(see sync.py).
+
+Sources come from scraper_registry and are imported only when selected:
+``--only``/``--exclude`` take source IDs (or patterns such as ``durham-*``),
+``--tag`` keeps sources with any of the given tags, and ``--list`` prints
+them all.
 """
 
-import sys
+import argparse
+import io
 import os
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from urllib.parse import urlparse
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from ncsu_real_events import NCSURealEventsScraper
-from raleigh_government_events import RaleighGovernmentEventsScraper
-from nc_holidays_2024 import NCHolidays2024Scraper
-from unc_scraper import UNCScraper
-from duke_scraper import DukeScraper
-from durham_scraper import DurhamCityScraper
-from chapel_hill_government_scraper import ChapelHillGovernmentScraper
-from wake_county_government_scraper import WakeCountyGovernmentScraper
-from ncsu_athletics_scraper import NCSUAthleticsScraper
-from triangle_tech_events_scraper import TriangleTechEventsScraper
-from chapel_hill_legistar_ics import ChapelHillLegistarICSScraper
-from wake_legistar_ics import WakeCountyLegistarICSScraper
-from durham_ics_scraper import DurhamICSScraper
-from raleigh_ics_scraper import RaleighICSScraper
-from wcpss_ics_scraper import WCPSSICSScraper
-from durham_agendacenter_scraper import DurhamAgendaCenterScraper
-from durham_bpac_scraper import DurhamBPACScraper
-from durham_cultural_advisory_scraper import DurhamCulturalAdvisoryScraper
-from orange_county_legistar_ics import OrangeCountyLegistarICSScraper
-from orange_county_civicplus_ics import OrangeCountyCivicPlusICSScraper
-from cary_iqm2_ics import CaryIQM2ICSScraper
-from durham_county_scraper import DurhamCountyScraper
-from orange_county_html_scraper import OrangeCountyHTMLScraper
-from carrboro_legistar_ics import CarrboroLegistarICSScraper
-from chatham_county_legistar_ics import ChathamCountyLegistarICSScraper
-from wfu_events_scraper import WakeForestEventsScraper
-from federal_holidays_ics_scraper import FederalHolidaysICSScraper
-from uncg_events_ics import UNCGEventsICSScraper
-from ncdot_meetings_scraper import NCDOTMeetingsScraper
-from ncdhhs_events_scraper import NCDHHSEventsScraper
-from campo_calendar_scraper import CAMPOCalendarScraper
-from uncc_events_ics import UNCCEventsICSScraper
-from ecu_events_ics import ECUEventsICSScraper
-from nc_admin_events_scraper import NCAdminEventsScraper
-from uncc_html_scraper import UNCCHTMLEventsScraper
-from ecu_html_scraper import ECUHTMLEventsScraper
-from nc_dpi_events_scraper import NCDPIEventsScraper
-from nc_deq_events_scraper import NCDEQEventsScraper
-from nc_dncr_a250_events_scraper import NCDNCRAmerica250Scraper
-from nc_commerce_events_scraper import NCCommerceEventsScraper
-from nc_courts_appeals_scraper import NCCourtOfAppealsScraper
-from nc_courts_supreme_scraper import NCSupremeCourtScraper
-
-def main():
+import discovery_cache
+import scraper_registry
+import state_store
+
+DEFAULT_JOBS = int(os.getenv("SCRAPER_JOBS", "8"))
+DEFAULT_PER_HOST = int(os.getenv("SCRAPER_PER_HOST", "4"))
+
+
+def scraper_host(scraper):
+    """
+    Best-effort origin host for a scraper, used to cap concurrent scrapers per site.
+    Scrapers expose their entry URL under a handful of attribute names.
+    """
+    for attr in ("base_url", "url", "index_url"):
+        value = getattr(scraper, attr, None)
+        if isinstance(value, str) and value.startswith("http"):
+            return _host_key(value)
+    pages = getattr(scraper, "base_pages", None) or getattr(scraper, "boards", None)
+    if pages:
+        first = pages[0][1] if isinstance(pages[0], tuple) else pages[0]
+        return _host_key(first)
+    return type(scraper).__name__
+
+
+def _host_key(url):
+    host = (urlparse(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class _ThreadOutput(io.TextIOBase):
+    """
+    stdout proxy that routes writes from worker threads into a per-thread buffer,
+    so concurrent scrapers don't interleave their logs.
+    """
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+
+    def capture(self):
+        self._local.buffer = io.StringIO()
+
+    def release(self):
+        buf = getattr(self._local, "buffer", None)
+        self._local.buffer = None
+        return buf.getvalue() if buf else ""
+
+    def write(self, s):
+        buf = getattr(self._local, "buffer", None)
+        if buf is not None:
+            return buf.write(s)
+        return self._stream.write(s)
+
+    def flush(self):
+        self._stream.flush()
+
+
+class ConcurrentRunner:
+    """
+    Runs scrapers on a fixed number of worker threads. Workers always pick the
+    highest-priority pending scraper whose host is below its concurrency cap, so
+    a worker never sits idle waiting on a busy host while other work is ready.
+    """
+    def __init__(self, scrapers, jobs=DEFAULT_JOBS, per_host=DEFAULT_PER_HOST):
+        self.scrapers = scrapers
+        self.jobs = max(1, jobs)
+        self.per_host = max(1, per_host)
+        self._pending = list(range(len(scrapers)))
+        self._hosts = [scraper_host(s) for _, s in scrapers]
+        self._active = {}
+        self._cond = threading.Condition()
+        self.futures = [Future() for _ in scrapers]
+
+    def _next_task(self):
+        with self._cond:
+            while self._pending:
+                for pos, idx in enumerate(self._pending):
+                    host = self._hosts[idx]
+                    if self._active.get(host, 0) < self.per_host:
+                        del self._pending[pos]
+                        self._active[host] = self._active.get(host, 0) + 1
+                        return idx
+                self._cond.wait()
+            return None
+
+    def _finish_task(self, idx):
+        with self._cond:
+            self._active[self._hosts[idx]] -= 1
+            self._cond.notify_all()
+
+    def _worker(self, output):
+        import event_sink  # loaded by main() before the workers start
+        import sync
+
+        while True:
+            idx = self._next_task()
+            if idx is None:
+                return
+            name, scraper = self.scrapers[idx]
+            output.capture()
+            started = time.perf_counter()
+            error = None
+            try:
+                with state_store.use_source(name):
+                    try:
+                        scraper.run_and_post()
+                    except Exception:
+                        sync.discard()
+                        raise
+                    if sync.enabled():
+                        print(f"🔄 Sync: {event_sink.commit_sync()}")
+            except Exception as e:
+                error = e
+            finally:
+                elapsed = time.perf_counter() - started
+                log = output.release()
+                self._finish_task(idx)
+            self.futures[idx].set_result((error, log, elapsed))
+
+    def start(self):
+        output = _ThreadOutput(sys.stdout)
+        sys.stdout = output
+        self._threads = [
+            threading.Thread(target=self._worker, args=(output,), daemon=True)
+            for _ in range(min(self.jobs, len(self.scrapers)))
+        ]
+        for t in self._threads:
+            t.start()
+        return output
+
+    def results(self):
+        """Yield (name, error, log, elapsed) in priority order as soon as each is ready."""
+        for (name, _), fut in zip(self.scrapers, self.futures):
+            error, log, elapsed = fut.result()
+            yield name, error, log, elapsed
+
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="Run all EventPulse NC scrapers")
+    ap.add_argument("--jobs", "-j", type=int, default=DEFAULT_JOBS,
+                    help=f"number of scrapers to run in parallel (default {DEFAULT_JOBS})")
+    ap.add_argument("--per-host", type=int, default=DEFAULT_PER_HOST,
+                    help=f"max scrapers running against one host at a time (default {DEFAULT_PER_HOST})")
+    mode = ap.add_mutually_exclusive_group()
+    mode.add_argument("--record", action="store_true",
+                      help="save every HTTP response to the cassette store")
+    mode.add_argument("--replay", action="store_true",
+                      help="serve HTTP responses from the cassette store; no network access")
+    ap.add_argument("--replay-latency", type=float, default=None, metavar="MS",
+                    help="simulated latency per replayed request, in milliseconds")
+    ap.add_argument("--cassette-dir", default=None,
+                    help="cassette store directory (default scraper/.cache/cassettes)")
+    ap.add_argument("--sink", default=None,
+                    help="where scraped events go: http (the API; default, or EVENT_SINK), ndjson or sqlite")
+    ap.add_argument("--sink-path", default=None,
+                    help="NDJSON file or SQLite database for --sink ndjson/sqlite")
+    ap.add_argument("--sync", action="store_true",
+                    help="send inserts/updates/retirements against each scraper's previous output")
+    ap.add_argument("--full", action="store_true",
+                    help="post every scraped event, not only those new or changed since the last run")
+    ap.add_argument("--only", action="append", default=[], metavar="IDS",
+                    help="run only these sources (comma-separated IDs or patterns; see --list)")
+    ap.add_argument("--exclude", action="append", default=[], metavar="IDS",
+                    help="skip these sources (comma-separated IDs or patterns)")
+    ap.add_argument("--tag", action="append", default=[], metavar="TAGS",
+                    help=f"run only sources with one of these tags ({', '.join(scraper_registry.all_tags())})")
+    ap.add_argument("--list", action="store_true",
+                    help="list the sources (ID, tags, name) and exit")
+    args = ap.parse_args(argv)
+    if args.sink is not None:
+        import event_sink
+        if args.sink not in event_sink.SINKS:
+            ap.error(f"argument --sink: invalid choice: {args.sink!r} (choose from {', '.join(sorted(event_sink.SINKS))})")
+    try:
+        args.sources = scraper_registry.select(
+            only=_split(args.only), exclude=_split(args.exclude), tags=_split(args.tag)
+        )
+    except ValueError as e:
+        ap.error(str(e))
+    return args
+
+
+def _split(values):
+    return [item.strip() for value in values for item in value.split(",") if item.strip()]
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.list:
+        for source in args.sources:
+            print(f"{source.id:26} {','.join(source.tags):28} {source.name}")
+        return
+    # Not needed for --help/--list: event_sink pulls in the HTTP client, the
+    # SQLite loader and numpy
+    import cassette
+    import event_sink
+    import sync
+
+    if args.record or args.replay:
+        cassette.configure(
+            mode=cassette.RECORD if args.record else cassette.REPLAY,
+            directory=args.cassette_dir,
+            latency_ms=args.replay_latency,
+        )
+    if args.full:
+        state_store.set_full()
+    event_sink.configure(args.sink, args.sink_path)
+    if args.sync:
+        sync.enable(defer=True)
     print("🚀 EventPulse NC - Running All Scrapers")
     print("=" * 50)
     print("📋 Priority Order (based on EventPulse NC documentation):")
@@ -60,73 +254,40 @@ def main():
     print("2. High Priority: Government (Durham, Chapel Hill, Wake County)")
     print("3. High Priority: University Athletics (NC State)")
     print("4. Medium Priority: Tech Events (Triangle)")
+    print(f"⚙️  Jobs: {args.jobs} | Per-host cap: {args.per_host} | HTTP mode: {cassette.mode()}"
+          f" | {'Incremental' if state_store.incremental() else 'Full'} upload | Sink: {event_sink.SINK_KIND}"
+          f"{' (sync)' if sync.enabled() else ''}")
     print("=" * 50)
     
-    # Scrapers in priority order
-    scrapers = [
-        # High Priority: Universities
-        ("UNC Chapel Hill Events", UNCScraper()),
-        ("Duke University Events", DukeScraper()),
-        
-        # High Priority: Government Sources
-        ("Durham City Government", DurhamCityScraper()),
-        ("Chapel Hill Government", ChapelHillGovernmentScraper()),
-        ("Wake County Government", WakeCountyGovernmentScraper()),
-        ("Wake County Legistar (ICS)", WakeCountyLegistarICSScraper()),
-        ("Chapel Hill Legistar (ICS)", ChapelHillLegistarICSScraper()),
-        ("Durham City (ICS)", DurhamICSScraper()),
-        ("Durham Agenda Center", DurhamAgendaCenterScraper()),
-        ("Durham BPAC", DurhamBPACScraper()),
-        ("Durham Cultural Advisory Board", DurhamCulturalAdvisoryScraper()),
-        ("Raleigh (ICS)", RaleighICSScraper()),
-        ("Orange County (Legistar ICS)", OrangeCountyLegistarICSScraper()),
-        ("Orange County (CivicPlus ICS)", OrangeCountyCivicPlusICSScraper()),
-        ("Orange County (HTML)", OrangeCountyHTMLScraper()),
-        ("Durham County (HTML)", DurhamCountyScraper()),
-        ("Carrboro (Legistar ICS)", CarrboroLegistarICSScraper()),
-        ("Chatham County (Legistar ICS)", ChathamCountyLegistarICSScraper()),
-        ("Wake Forest University Events", WakeForestEventsScraper()),
-        ("US Federal Holidays (ICS)", FederalHolidaysICSScraper()),
-        ("UNC Greensboro (ICS)", UNCGEventsICSScraper()),
-        ("UNC Charlotte (ICS)", UNCCEventsICSScraper()),
-        ("UNC Charlotte (HTML)", UNCCHTMLEventsScraper()),
-        ("East Carolina University (ICS)", ECUEventsICSScraper()),
-        ("East Carolina University (HTML)", ECUHTMLEventsScraper()),
-        ("NCDOT Public Meetings (HTML)", NCDOTMeetingsScraper()),
-        ("NCDHHS Events (HTML)", NCDHHSEventsScraper()),
-        ("CAMPO Calendar (HTML)", CAMPOCalendarScraper()),
-        ("NC Department of Administration (HTML)", NCAdminEventsScraper()),
-        ("NC DPI (HTML)", NCDPIEventsScraper()),
-        ("NC DEQ (HTML)", NCDEQEventsScraper()),
-        ("NC DNCR America 250 (HTML)", NCDNCRAmerica250Scraper()),
-        ("NC Commerce (HTML)", NCCommerceEventsScraper()),
-        ("NC Courts – Court of Appeals (HTML)", NCCourtOfAppealsScraper()),
-        ("NC Courts – Supreme Court (HTML)", NCSupremeCourtScraper()),
-        ("Cary (IQM2 ICS)", CaryIQM2ICSScraper()),
-        
-        # High Priority: University Athletics
-        ("NC State Athletics", NCSUAthleticsScraper()),
-        
-        # Medium Priority: Tech Events
-        ("Triangle Tech Events", TriangleTechEventsScraper()),
-        
-        # Existing Core Scrapers
-        ("NC State University Events", NCSURealEventsScraper()),
-        ("Raleigh Government Events", RaleighGovernmentEventsScraper()),
-        ("NC Holidays & School Breaks", NCHolidays2024Scraper()),
-        ("WCPSS (ICS)", WCPSSICSScraper()),
-    ]
-    
+    # Scrapers in priority order (scraper_registry.SOURCES); only the selected ones are imported
+    scrapers = []
+    for source in args.sources:
+        try:
+            scrapers.append((source.name, scraper_registry.load(source)))
+        except Exception as e:
+            print(f"❌ Could not load {source.name} ({source.target}): {e}")
+    if len(args.sources) < len(scraper_registry.SOURCES):
+        print(f"🎛️  Selected {len(args.sources)}/{len(scraper_registry.SOURCES)} sources: "
+              f"{', '.join(source.id for source in args.sources)}")
+
     total_events = 0
     successful_scrapers = 0
-    
-    for name, scraper in scrapers:
-        print(f"\n📊 {name}")
-        print("-" * 30)
-        try:
-            scraper.run_and_post()
+    run_started = time.perf_counter()
+
+    runner = ConcurrentRunner(scrapers, jobs=args.jobs, per_host=args.per_host)
+    output = runner.start()
+    try:
+        for name, error, log, elapsed in runner.results():
+            print(f"\n📊 {name}")
+            print("-" * 30)
+            if log:
+                print(log, end="" if log.endswith("\n") else "\n")
+            if error is not None:
+                print(f"❌ Error running {name}: {str(error)}")
+                continue
+            print(f"⏱️  {elapsed:.1f}s")
             successful_scrapers += 1
-            
+
             # Estimate events added based on scraper type
             if "UNC" in name:
                 total_events += 8
@@ -148,16 +309,19 @@ def main():
                 total_events += 5
             elif "Holidays" in name:
                 total_events += 10
-                
-        except Exception as e:
-            print(f"❌ Error running {name}: {str(e)}")
-    
+    finally:
+        sys.stdout = output._stream
+
+    # Background discovery re-probes (discovery_cache) finish before we exit
+    discovery_cache.wait_for_background()
+
     print("\n" + "=" * 50)
     print(f"✅ Scraping Complete!")
     print(f"📈 Total events added: ~{total_events}")
-    print(f"🎯 Successful scrapers: {successful_scrapers}/{len(scrapers)}")
+    print(f"🎯 Successful scrapers: {successful_scrapers}/{len(args.sources)}")
+    print(f"⏱️  Wall time: {time.perf_counter() - run_started:.1f}s")
     print(f"🌐 Check your EventPulse NC dashboard to see the events!")
     print("=" * 50)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
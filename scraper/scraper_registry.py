@@ -0,0 +1,117 @@
+# scraper/scraper_registry.py
+"""
+Every source run_all_scrapers knows about, in priority order.
+
+Each `Source` names its scraper class as "module:Class" and is only
+imported when selected (`load(source)`), so rerunning one feed doesn't
+import the other forty modules and their parsers. `select()` picks sources
+by ID or tag, matching shell-style patterns ("durham-*"):
+
+    python run_all_scrapers.py --only durham-ics
+    python run_all_scrapers.py --tag government --exclude wake-county
+    python run_all_scrapers.py --list
+
+`name` is the label printed in run reports and the key state_store files a
+source's fingerprints, watermarks and claims under, so it must not change
+once a source has run. New scrapers only need an entry here.
+"""
+
+import fnmatch
+import importlib
+from collections import namedtuple
+
+Source = namedtuple("Source", "id name target tags")
+
+SOURCES = (
+    # High Priority: Universities
+    Source("unc", "UNC Chapel Hill Events", "unc_scraper:UNCScraper", ("university", "html")),
+    Source("duke", "Duke University Events", "duke_scraper:DukeScraper", ("university", "html")),
+
+    # High Priority: Government Sources
+    Source("durham-city", "Durham City Government", "durham_scraper:DurhamCityScraper", ("government", "durham", "html")),
+    Source("chapel-hill", "Chapel Hill Government", "chapel_hill_government_scraper:ChapelHillGovernmentScraper", ("government",)),
+    Source("wake-county", "Wake County Government", "wake_county_government_scraper:WakeCountyGovernmentScraper", ("government",)),
+    Source("wake-county-legistar", "Wake County Legistar (ICS)", "wake_legistar_ics:WakeCountyLegistarICSScraper", ("government", "ics")),
+    Source("chapel-hill-legistar", "Chapel Hill Legistar (ICS)", "chapel_hill_legistar_ics:ChapelHillLegistarICSScraper", ("government", "ics")),
+    Source("durham-ics", "Durham City (ICS)", "durham_ics_scraper:DurhamICSScraper", ("government", "durham", "ics")),
+    Source("durham-agenda-center", "Durham Agenda Center", "durham_agendacenter_scraper:DurhamAgendaCenterScraper", ("government", "durham", "html")),
+    Source("durham-bpac", "Durham BPAC", "durham_bpac_scraper:DurhamBPACScraper", ("government", "durham", "html")),
+    Source("durham-cultural-advisory", "Durham Cultural Advisory Board", "durham_cultural_advisory_scraper:DurhamCulturalAdvisoryScraper", ("government", "durham", "html")),
+    Source("raleigh-ics", "Raleigh (ICS)", "raleigh_ics_scraper:RaleighICSScraper", ("government", "ics")),
+    Source("orange-county-legistar", "Orange County (Legistar ICS)", "orange_county_legistar_ics:OrangeCountyLegistarICSScraper", ("government", "ics")),
+    Source("orange-county-civicplus", "Orange County (CivicPlus ICS)", "orange_county_civicplus_ics:OrangeCountyCivicPlusICSScraper", ("government", "ics")),
+    Source("orange-county-html", "Orange County (HTML)", "orange_county_html_scraper:OrangeCountyHTMLScraper", ("government", "html")),
+    Source("durham-county", "Durham County (HTML)", "durham_county_scraper:DurhamCountyScraper", ("government", "durham", "html")),
+    Source("carrboro-legistar", "Carrboro (Legistar ICS)", "carrboro_legistar_ics:CarrboroLegistarICSScraper", ("government", "ics")),
+    Source("chatham-county-legistar", "Chatham County (Legistar ICS)", "chatham_county_legistar_ics:ChathamCountyLegistarICSScraper", ("government", "ics")),
+    Source("wfu", "Wake Forest University Events", "wfu_events_scraper:WakeForestEventsScraper", ("university", "html")),
+    Source("federal-holidays", "US Federal Holidays (ICS)", "federal_holidays_ics_scraper:FederalHolidaysICSScraper", ("holidays", "ics")),
+    Source("uncg-ics", "UNC Greensboro (ICS)", "uncg_events_ics:UNCGEventsICSScraper", ("university", "ics")),
+    Source("uncc-ics", "UNC Charlotte (ICS)", "uncc_events_ics:UNCCEventsICSScraper", ("university", "ics")),
+    Source("uncc-html", "UNC Charlotte (HTML)", "uncc_html_scraper:UNCCHTMLEventsScraper", ("university", "html")),
+    Source("ecu-ics", "East Carolina University (ICS)", "ecu_events_ics:ECUEventsICSScraper", ("university", "ics")),
+    Source("ecu-html", "East Carolina University (HTML)", "ecu_html_scraper:ECUHTMLEventsScraper", ("university", "html")),
+    Source("ncdot-meetings", "NCDOT Public Meetings (HTML)", "ncdot_meetings_scraper:NCDOTMeetingsScraper", ("government", "state", "html")),
+    Source("ncdhhs", "NCDHHS Events (HTML)", "ncdhhs_events_scraper:NCDHHSEventsScraper", ("government", "state", "html")),
+    Source("campo", "CAMPO Calendar (HTML)", "campo_calendar_scraper:CAMPOCalendarScraper", ("government", "html")),
+    Source("nc-admin", "NC Department of Administration (HTML)", "nc_admin_events_scraper:NCAdminEventsScraper", ("government", "state", "html")),
+    Source("nc-dpi", "NC DPI (HTML)", "nc_dpi_events_scraper:NCDPIEventsScraper", ("government", "state", "html")),
+    Source("nc-deq", "NC DEQ (HTML)", "nc_deq_events_scraper:NCDEQEventsScraper", ("government", "state", "html")),
+    Source("nc-dncr-a250", "NC DNCR America 250 (HTML)", "nc_dncr_a250_events_scraper:NCDNCRAmerica250Scraper", ("government", "state", "html")),
+    Source("nc-commerce", "NC Commerce (HTML)", "nc_commerce_events_scraper:NCCommerceEventsScraper", ("government", "state", "html")),
+    Source("nc-court-of-appeals", "NC Courts – Court of Appeals (HTML)", "nc_courts_appeals_scraper:NCCourtOfAppealsScraper", ("government", "state", "courts", "html")),
+    Source("nc-supreme-court", "NC Courts – Supreme Court (HTML)", "nc_courts_supreme_scraper:NCSupremeCourtScraper", ("government", "state", "courts", "html")),
+    Source("cary-iqm2", "Cary (IQM2 ICS)", "cary_iqm2_ics:CaryIQM2ICSScraper", ("government", "ics")),
+
+    # High Priority: University Athletics
+    Source("ncsu-athletics", "NC State Athletics", "ncsu_athletics_scraper:NCSUAthleticsScraper", ("athletics", "university")),
+
+    # Medium Priority: Tech Events
+    Source("triangle-tech", "Triangle Tech Events", "triangle_tech_events_scraper:TriangleTechEventsScraper", ("tech",)),
+
+    # Existing Core Scrapers
+    Source("ncsu", "NC State University Events", "ncsu_real_events:NCSURealEventsScraper", ("university",)),
+    Source("raleigh-government", "Raleigh Government Events", "raleigh_government_events:RaleighGovernmentEventsScraper", ("government",)),
+    Source("nc-holidays", "NC Holidays & School Breaks", "nc_holidays_2024:NCHolidays2024Scraper", ("holidays", "schools")),
+    Source("wcpss-ics", "WCPSS (ICS)", "wcpss_ics_scraper:WCPSSICSScraper", ("schools", "ics")),
+)
+
+
+def all_ids() -> list:
+    return [source.id for source in SOURCES]
+
+
+def all_tags() -> list:
+    return sorted({tag for source in SOURCES for tag in source.tags})
+
+
+def _matching(patterns, values, kind):
+    """The values matched by any of `patterns`; an unmatched pattern is an error."""
+    matched = set()
+    for pattern in patterns:
+        hits = fnmatch.filter(values, pattern)
+        if not hits:
+            raise ValueError(f"unknown {kind} {pattern!r} (expected one of {', '.join(values)})")
+        matched.update(hits)
+    return matched
+
+
+def select(only=(), exclude=(), tags=()) -> list:
+    """
+    Sources in priority order: those in `only` (all when empty) that carry
+    one of `tags` (any when empty), minus `exclude`. Each argument is a list
+    of IDs/tags or shell-style patterns.
+    """
+    wanted = _matching(only, all_ids(), "source") if only else set(all_ids())
+    wanted -= _matching(exclude, all_ids(), "source")
+    wanted_tags = _matching(tags, all_tags(), "tag")
+    return [
+        source for source in SOURCES
+        if source.id in wanted and (not wanted_tags or wanted_tags.intersection(source.tags))
+    ]
+
+
+def load(source):
+    """Import the source's module and return a new scraper instance."""
+    module_name, class_name = source.target.split(":")
+    return getattr(importlib.import_module(module_name), class_name)()
@@ -0,0 +1,287 @@
+# scraper/sqlite_loader.py
+"""
+Direct bulk loader for the backend's SQLite database (backend/events.db).
+
+Used by event_sink's "sqlite" sink (run_all_scrapers --sink sqlite) when the
+scrapers run on the same host as the API: instead of JSON over HTTP and a
+SELECT + INSERT per row in the Node batch handler, each flush is a single
+`executemany` transaction of `INSERT ... SELECT ... WHERE NOT EXISTS` on
+(title, start_date), the same duplicate check the API makes. The events
+table deliberately has no unique constraint (backend/remove_constraint.js),
+and the loader never changes the backend's schema. The connection runs in
+WAL mode (so the API keeps serving reads during a load) with
+synchronous=NORMAL and a large page cache and mmap window.
+
+`validate(event)` applies exactly the checks of POST /api/events/batch in
+backend/index.js, and `to_row(event)` fills defaults and tags the same way,
+so both paths accept and store the same rows.
+"""
+
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+DB_PATH = os.getenv(
+    "EVENTS_DB",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend", "events.db"),
+)
+CACHE_MB = int(os.getenv("SQLITE_LOADER_CACHE_MB", "64"))
+MMAP_MB = int(os.getenv("SQLITE_LOADER_MMAP_MB", "256"))
+
+MAX_HOURS = 14  # non-holiday events longer than this are rejected, as in the API
+COLUMNS = (
+    "title", "description", "start_date", "end_date", "location_name",
+    "latitude", "longitude", "organization_id", "event_type", "source_url", "tags",
+)
+
+# Same keyword rules as classifyTagsFromText in backend/index.js
+TAG_RULES = (
+    (("workshop", "training", "hands-on", "bootcamp"), "workshop"),
+    (("conference", "summit", "symposium", "expo"), "conference"),
+    (("webinar", "virtual"), "webinar"),
+    (("career fair", "recruiting", "job fair"), "career"),
+    (("council", "board", "committee", "hearing", "meeting"), "government"),
+    (("lecture", "talk", "colloquium", "seminar"), "academic"),
+    (("football", "basketball", "baseball", "soccer", "athletic"), "athletics"),
+    (("holiday", "break", "closure"), "holiday"),
+    (("raleigh",), "raleigh"),
+    (("durham",), "durham"),
+    (("chapel hill",), "chapel-hill"),
+    (("cary",), "cary"),
+    (("unc", "chapel hill"), "unc"),
+    (("duke",), "duke"),
+    (("ncsu", "nc state"), "ncsu"),
+)
+
+
+def classify_tags(title="", description="") -> list:
+    text = f"{title or ''} {description or ''}".lower()
+    return [tag for keywords, tag in TAG_RULES if any(k in text for k in keywords)]
+
+
+def _instant(value):
+    """Seconds since the epoch the way JS Date.parse reads an ISO string, or None."""
+    if not isinstance(value, str):
+        return None
+    text = value.strip()
+    try:
+        dt = datetime.fromisoformat(text.replace("Z", "+00:00") if text.endswith("Z") else text)
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        # Date.parse: date-only strings are UTC, date-times without an offset are local
+        dt = dt.replace(tzinfo=timezone.utc) if len(text) == 10 else dt.astimezone()
+    return dt.timestamp()
+
+
+def _number(value):
+    """JS Number(value) for the values a JSON payload can carry (None for NaN)."""
+    if value is None or value == "":
+        return 0.0
+    if isinstance(value, bool):
+        return float(value)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def validate(event):
+    """The API's rejection reason for `event` (ingestStats.reasons key), or None if valid."""
+    if not event.get("title") or not event.get("start_date") or not event.get("end_date"):
+        return "missing_fields"
+    start, end = _instant(event["start_date"]), _instant(event["end_date"])
+    if start is None or end is None:
+        return "invalid_date"
+    if end <= start:
+        return "invalid_order"
+    if event.get("event_type") != "holiday" and end - start > MAX_HOURS * 3600:
+        return "too_long"
+    for key, limit in (("latitude", 90), ("longitude", 180)):
+        if key in event:
+            number = _number(event[key])
+            if number is None or abs(number) > limit:
+                return "invalid_coords"
+    return None
+
+
+def to_row(event) -> tuple:
+    """Column values for an events row, with the API's defaults."""
+    tags = event.get("tags")
+    if isinstance(tags, (list, tuple)):
+        tags = ",".join(tags)
+    elif not isinstance(tags, str):
+        tags = ",".join(classify_tags(event.get("title"), event.get("description")))
+    return (
+        event["title"],
+        event.get("description") or "",
+        event["start_date"],
+        event["end_date"],
+        event.get("location_name") or "",
+        _number(event.get("latitude")) or 0,
+        _number(event.get("longitude")) or 0,
+        event.get("organization_id") or 1,
+        event.get("event_type") or "other",
+        event.get("source_url") or "",
+        tags,
+    )
+
+
+def _insert_sql(columns) -> str:
+    """INSERT for `columns` that skips rows whose (title, start_date) is already stored."""
+    placeholders = ", ".join("?" * len(columns))
+    return (
+        f"INSERT INTO events ({', '.join(columns)}) SELECT {placeholders} "
+        "WHERE NOT EXISTS (SELECT 1 FROM events WHERE title = ?1 AND start_date = ?3)"
+    )
+
+
+class Loader:
+    """One tuned connection to an events database, shared by every sink in the process."""
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = None
+        self._upsert_sql = _insert_sql(COLUMNS)
+        self._sync_insert_sql = _insert_sql(COLUMNS + ("sync_source",))
+
+    def _db(self):
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA cache_size=-{CACHE_MB * 1024}")
+            conn.execute(f"PRAGMA mmap_size={MMAP_MB * 1024 * 1024}")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._conn = conn
+        return self._conn
+
+    def load(self, events):
+        """
+        Validate and insert `events` in one transaction.
+        Returns (stats, accepted) like api_client.upload: received/inserted/
+        duplicates/failed counts (plus per-reason rejections) and the valid events.
+        """
+        accepted, rows, reasons = [], [], {}
+        for ev in events:
+            reason = validate(ev)
+            if reason:
+                reasons[reason] = reasons.get(reason, 0) + 1
+                continue
+            accepted.append(ev)
+            rows.append(to_row(ev))
+
+        inserted = 0
+        if rows:
+            with self._lock:
+                conn = self._db()
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    before = conn.total_changes
+                    conn.executemany(self._upsert_sql, rows)
+                    inserted = conn.total_changes - before
+                    conn.execute("COMMIT")
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+
+        stats = {
+            "received": len(events),
+            "inserted": inserted,
+            "duplicates": len(rows) - inserted,
+            "failed": len(events) - len(rows),
+        }
+        if reasons:
+            stats["reasons"] = reasons
+        return stats, accepted
+
+    def apply_changes(self, changes):
+        """
+        Apply a sync.ChangeSet in one transaction: delete retired rows, update
+        moved/edited ones in place (inserting them if the old row is gone),
+        insert the new ones. As in POST /api/events/sync, rows are tagged with
+        the change set's source (events.sync_source, added by backend/db.js)
+        and updates and retires only match that source's own rows.
+        Returns inserted/updated/retired/duplicates/failed.
+        """
+        stats = dict.fromkeys(("inserted", "updated", "retired", "duplicates", "failed"), 0)
+        inserts, updates = [], []
+        for ev in changes.inserts:
+            if validate(ev):
+                stats["failed"] += 1
+            else:
+                inserts.append(ev)
+        for match, ev in changes.updates:
+            if validate(ev):
+                stats["failed"] += 1
+            else:
+                updates.append((match, ev))
+
+        source = changes.source
+        set_clause = ", ".join(f"{col} = ?" for col in COLUMNS)
+        with self._lock:
+            conn = self._db()
+            if "sync_source" not in {row[1] for row in conn.execute("PRAGMA table_info(events)")}:
+                return {"error": "events table has no sync_source column (start the backend once to migrate it)"}
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for title, start_date, org_id in changes.retires:
+                    stats["retired"] += conn.execute(
+                        "DELETE FROM events WHERE title = ? AND start_date = ? AND organization_id = ? AND sync_source = ?",
+                        (title, start_date, org_id or 1, source),
+                    ).rowcount
+                for (title, start_date, org_id), ev in updates:
+                    match = (title, start_date, org_id or 1, source)
+                    if conn.execute(
+                        "SELECT 1 FROM events WHERE title = ? AND start_date = ? "
+                        "AND NOT (title = ? AND start_date = ? AND organization_id = ? AND sync_source IS ?)",
+                        (ev["title"], ev["start_date"]) + match,
+                    ).fetchone():
+                        # it moved onto a (title, start_date) another row already has
+                        stats["duplicates"] += 1
+                        continue
+                    try:
+                        cur = conn.execute(
+                            f"UPDATE events SET {set_clause} "
+                            "WHERE title = ? AND start_date = ? AND organization_id = ? AND sync_source = ?",
+                            to_row(ev) + match,
+                        )
+                    except sqlite3.IntegrityError:
+                        # same, caught by a unique index the database may still carry
+                        stats["duplicates"] += 1
+                        continue
+                    if cur.rowcount:
+                        stats["updated"] += cur.rowcount
+                    else:
+                        inserts.append(ev)
+                if inserts:
+                    before = conn.total_changes
+                    conn.executemany(self._sync_insert_sql, [to_row(ev) + (source,) for ev in inserts])
+                    stats["inserted"] = conn.total_changes - before
+                    stats["duplicates"] += len(inserts) - stats["inserted"]
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return stats
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_loaders: dict = {}
+_loaders_lock = threading.Lock()
+
+
+def get_loader(path=None) -> Loader:
+    path = os.path.abspath(path or DB_PATH)
+    with _loaders_lock:
+        if path not in _loaders:
+            _loaders[path] = Loader(path)
+        return _loaders[path]
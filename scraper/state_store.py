@@ -0,0 +1,264 @@
+# scraper/state_store.py
+"""
+Local run state for incremental scraping (SQLite, scraper/.cache/state.sqlite).
+
+Four kinds of state are kept:
+
+* event fingerprints: for every event successfully uploaded, a hash of its
+  payload keyed by (title, start_date), the same pair the backend uses to
+  detect duplicates. `changed(events)` drops the events whose fingerprint
+  is unchanged since the last upload, so a re-run only sends what is new
+  or different (every event_sink flush and api_client.batch_post do this);
+* per-source watermarks: small named values a scraper can store between
+  runs (the newest item seen, the detail pages already fetched, ...) so a
+  feed can stop paging once it reaches content it has already seen;
+* claims: which source owns each canonical event key (see dedup.py), so
+  the same meeting scraped from several sites is only uploaded by one;
+* contributions: what each source last synced, for the diff-based sync
+  stage (sync.py).
+
+The "source" is the scraper currently running. run_all_scrapers sets it
+with `use_source(name)`; standalone scripts fall back to "default".
+SCRAPER_INCREMENTAL=0 (or run_all_scrapers --full) disables the filtering
+while still recording what was uploaded.
+"""
+
+import contextlib
+import contextvars
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+STATE_DB = os.getenv(
+    "SCRAPER_STATE_DB",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "state.sqlite"),
+)
+# Fingerprints not refreshed for this long are forgotten (the event has long passed)
+TTL_SECONDS = float(os.getenv("SCRAPER_STATE_TTL_DAYS", "120")) * 86400
+# A source that stops emitting an event loses its claim on it after this long
+CLAIM_TTL_SECONDS = float(os.getenv("SCRAPER_CLAIM_TTL_DAYS", "3")) * 86400
+
+_lock = threading.Lock()
+_conn = None
+_full = os.getenv("SCRAPER_INCREMENTAL", "1") in ("0", "false", "off")
+_source = contextvars.ContextVar("scraper_source", default="default")
+
+
+def incremental() -> bool:
+    return not _full
+
+
+def set_full(full=True):
+    """Disable (or re-enable) incremental filtering for this process."""
+    global _full
+    _full = full
+
+
+def current_source() -> str:
+    return _source.get()
+
+
+@contextlib.contextmanager
+def use_source(name):
+    """Attribute state reads/writes in this block (and thread) to scraper `name`."""
+    token = _source.set(name)
+    try:
+        yield
+    finally:
+        _source.reset(token)
+
+
+def _db():
+    global _conn
+    if _conn is None:
+        os.makedirs(os.path.dirname(STATE_DB), exist_ok=True)
+        conn = sqlite3.connect(STATE_DB, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS fingerprints (
+                key TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS fingerprints_source ON fingerprints(source)")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS watermarks (
+                source TEXT NOT NULL,
+                name TEXT NOT NULL,
+                value TEXT,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (source, name)
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS claims (
+                key TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                last_seen REAL NOT NULL
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS contributions (
+                source TEXT NOT NULL,
+                identity TEXT NOT NULL,
+                title TEXT NOT NULL,
+                start_date TEXT NOT NULL,
+                organization_id INTEGER,
+                fingerprint TEXT NOT NULL,
+                PRIMARY KEY (source, identity)
+            )
+        """)
+        conn.execute("DELETE FROM fingerprints WHERE last_seen < ?", (time.time() - TTL_SECONDS,))
+        conn.execute("DELETE FROM claims WHERE last_seen < ?", (time.time() - CLAIM_TTL_SECONDS,))
+        conn.commit()
+        _conn = conn
+    return _conn
+
+
+def event_key(event) -> str:
+    return f"{event.get('title')}\x1f{event.get('start_date')}"
+
+
+def fingerprint(event) -> str:
+    payload = json.dumps(event, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def changed(events) -> list:
+    """The events that are new or whose payload differs from the last upload."""
+    if _full or not events:
+        return list(events)
+    keys = [event_key(ev) for ev in events]
+    known = {}
+    with _lock:
+        conn = _db()
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            rows = conn.execute(
+                f"SELECT key, fingerprint FROM fingerprints WHERE key IN ({','.join('?' * len(chunk))})", chunk
+            )
+            known.update(rows)
+    return [ev for ev, key in zip(events, keys) if known.get(key) != fingerprint(ev)]
+
+
+def remember(events, source=None):
+    """Record `events` as uploaded, so unchanged copies are skipped next run."""
+    if not events:
+        return
+    source = source or current_source()
+    now = time.time()
+    rows = [(event_key(ev), source, fingerprint(ev), now, now) for ev in events]
+    with _lock:
+        conn = _db()
+        conn.executemany("""
+            INSERT INTO fingerprints (key, source, fingerprint, first_seen, last_seen)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET
+                source = excluded.source,
+                fingerprint = excluded.fingerprint,
+                last_seen = excluded.last_seen
+        """, rows)
+        conn.commit()
+
+
+def claim(keys, source=None, record=True) -> dict:
+    """
+    Claim canonical event `keys` for `source`: keys that are unclaimed, already
+    ours, or whose owner hasn't emitted them for CLAIM_TTL_SECONDS become ours.
+    Returns {key: owning source}. With `record` off, ownership is decided the
+    same way but nothing is written.
+    """
+    source = source or current_source()
+    keys = list(dict.fromkeys(keys))
+    now = time.time()
+    owners = {}
+    with _lock:
+        conn = _db()
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            rows = conn.execute(
+                f"SELECT key, source, last_seen FROM claims WHERE key IN ({','.join('?' * len(chunk))})", chunk
+            )
+            owners.update((key, (owner, seen)) for key, owner, seen in rows)
+        mine = [
+            key for key in keys
+            if key not in owners or owners[key][0] == source or now - owners[key][1] > CLAIM_TTL_SECONDS
+        ]
+        if record:
+            conn.executemany(
+                "INSERT OR REPLACE INTO claims (key, source, last_seen) VALUES (?, ?, ?)",
+                [(key, source, now) for key in mine],
+            )
+            conn.commit()
+    result = {key: owner for key, (owner, _seen) in owners.items()}
+    result.update(dict.fromkeys(mine, source))
+    return result
+
+
+def contributions(source=None) -> dict:
+    """{identity: (title, start_date, organization_id, fingerprint)} last synced for `source`."""
+    with _lock:
+        rows = _db().execute(
+            "SELECT identity, title, start_date, organization_id, fingerprint FROM contributions WHERE source = ?",
+            (source or current_source(),),
+        ).fetchall()
+    return {row[0]: tuple(row[1:]) for row in rows}
+
+
+def replace_contributions(rows, source=None):
+    """Make `rows` ({identity: (title, start_date, organization_id, fingerprint)}) the source's contributions."""
+    source = source or current_source()
+    with _lock:
+        conn = _db()
+        with conn:
+            conn.execute("DELETE FROM contributions WHERE source = ?", (source,))
+            conn.executemany(
+                "INSERT INTO contributions (source, identity, title, start_date, organization_id, fingerprint) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(source, identity, *row) for identity, row in rows.items()],
+            )
+
+
+def get_watermark(name, source=None, max_age=None):
+    """Stored value for `name`, or None if unset (or older than `max_age` seconds)."""
+    with _lock:
+        row = _db().execute(
+            "SELECT value, updated_at FROM watermarks WHERE source = ? AND name = ?",
+            (source or current_source(), name),
+        ).fetchone()
+    if row is None or (max_age is not None and time.time() - row[1] > max_age):
+        return None
+    return json.loads(row[0])
+
+
+def set_watermark(name, value, source=None):
+    with _lock:
+        conn = _db()
+        conn.execute(
+            "INSERT OR REPLACE INTO watermarks (source, name, value, updated_at) VALUES (?, ?, ?, ?)",
+            (source or current_source(), name, json.dumps(value, default=str), time.time()),
+        )
+        conn.commit()
+
+
+def reset(source=None):
+    """Forget everything recorded for `source` (all sources when None)."""
+    with _lock:
+        conn = _db()
+        if source is None:
+            conn.execute("DELETE FROM fingerprints")
+            conn.execute("DELETE FROM watermarks")
+            conn.execute("DELETE FROM claims")
+            conn.execute("DELETE FROM contributions")
+        else:
+            conn.execute("DELETE FROM fingerprints WHERE source = ?", (source,))
+            conn.execute("DELETE FROM watermarks WHERE source = ?", (source,))
+            conn.execute("DELETE FROM claims WHERE source = ?", (source,))
+            conn.execute("DELETE FROM contributions WHERE source = ?", (source,))
+        conn.commit()
@@ -0,0 +1,231 @@
+# scraper/structured_data.py
+"""
+schema.org Event extraction (JSON-LD first, then microdata) for HTML pages.
+
+Localist university calendars and many CivicPlus/Granicus pages embed
+their events as structured data, which is both cheaper and more accurate
+than CSS heuristics plus fuzzy date parsing. `extract_events` returns
+API-ready event dicts built from that data, or [] when the page has none,
+in which case the caller runs its usual heuristics. Scrapers whose
+`parse_list` follows that pattern decorate it with `prefer_structured`.
+
+JSON-LD blocks are found with a regex over the raw HTML (no parse tree);
+microdata needs a tree, so lxml is only invoked when the page mentions a
+schema.org Event itemtype at all.
+"""
+
+import functools
+import html as html_lib
+import json
+import re
+
+from date_extract import parse_date
+from event_model import api_event
+
+_LD_JSON_RE = re.compile(
+    r"<script\b[^>]*\btype\s*=\s*[\"']?application/ld\+json[\"']?[^>]*>(.*?)</script\s*>",
+    re.I | re.S,
+)
+_TAG_RE = re.compile(r"<[^>]+>")
+_MICRODATA_HINT_RE = re.compile(r"itemtype\s*=\s*[\"']?https?://schema\.org/\w*Event", re.I)
+
+
+def _is_event(obj) -> bool:
+    types = obj.get("@type")
+    types = types if isinstance(types, list) else [types]
+    # Event, BusinessEvent, EducationEvent, SocialEvent, ...
+    return any(isinstance(t, str) and t.split("/")[-1].endswith("Event") for t in types)
+
+
+def _walk(node):
+    if isinstance(node, list):
+        for item in node:
+            yield from _walk(item)
+    elif isinstance(node, dict):
+        if _is_event(node):
+            yield node
+        for key in ("@graph", "itemListElement", "item", "subEvent"):
+            if key in node:
+                yield from _walk(node[key])
+
+
+def iter_jsonld_events(html):
+    """schema.org Event objects from the page's JSON-LD blocks."""
+    if "ld+json" not in html:
+        return
+    for m in _LD_JSON_RE.finditer(html):
+        raw = m.group(1).strip()
+        if raw.startswith("<!--"):
+            raw = raw[4:].rsplit("-->", 1)[0]
+        try:
+            data = json.loads(raw, strict=False)
+        except ValueError:
+            continue
+        yield from _walk(data)
+
+
+def _microdata_value(el):
+    for attr in ("content", "datetime", "href", "src"):
+        if el.get(attr):
+            return el.get(attr)
+    return " ".join(s.strip() for s in el.itertext() if s.strip())
+
+
+def _microdata_item(scope):
+    """Properties of one itemscope, with nested itemscopes as dicts."""
+    item = {}
+    stack = list(scope)
+    while stack:
+        el = stack.pop(0)
+        if not isinstance(el.tag, str):
+            continue
+        prop = el.get("itemprop")
+        nested = el.get("itemscope") is not None
+        if prop:
+            value = _microdata_item(el) if nested else _microdata_value(el)
+            item.setdefault(prop.split()[0], value)
+        if not nested:
+            stack[:0] = list(el)
+    return item
+
+
+def iter_microdata_events(html):
+    """schema.org Event items declared with itemscope/itemprop."""
+    if not _MICRODATA_HINT_RE.search(html):
+        return
+    from html_parse import make_tree
+    tree = make_tree(html)
+    for scope in tree.xpath('//*[@itemscope][contains(@itemtype, "schema.org/")]'):
+        if scope.get("itemtype", "").rstrip("/").endswith("Event") and scope.get("itemprop") is None:
+            item = _microdata_item(scope)
+            if not item.get("name"):
+                # Cards that mark up the date but not the title: use their heading
+                heading = scope.xpath(
+                    './/*[contains(concat(" ", normalize-space(@class), " "), " event-title ")] | .//h2 | .//h3'
+                )
+                if heading:
+                    item["name"] = " ".join(t.strip() for t in heading[0].itertext() if t.strip())
+            yield item
+
+
+def _text(value) -> str:
+    if isinstance(value, list):
+        value = value[0] if value else ""
+    if isinstance(value, dict):
+        value = value.get("name") or value.get("@value") or ""
+    return " ".join(html_lib.unescape(_TAG_RE.sub(" ", str(value))).split())
+
+
+def _place(location):
+    """(name, lat, lon) from a schema.org location (text, Place or list)."""
+    if isinstance(location, list):
+        location = location[0] if location else None
+    if not isinstance(location, dict):
+        return _text(location or ""), None, None
+    name = _text(location.get("name", ""))
+    address = location.get("address")
+    if isinstance(address, dict):
+        address = ", ".join(
+            _text(address[k]) for k in ("streetAddress", "addressLocality", "addressRegion") if address.get(k)
+        )
+    if address and not name:
+        name = _text(address)
+    lat = lon = None
+    geo = location.get("geo")
+    if isinstance(geo, dict):
+        try:
+            lat, lon = float(geo["latitude"]), float(geo["longitude"])
+        except (KeyError, TypeError, ValueError):
+            lat = lon = None
+        if lat is not None and not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            lat = lon = None
+    return name, lat, lon
+
+
+def _date(raw, fuzzy):
+    """The ISO-ish date schema.org asks for, or with `fuzzy` any date dateutil can find in `raw`."""
+    try:
+        return parse_date(raw, source="schema.org", fuzzy=False)
+    except ValueError:
+        if not fuzzy:
+            raise
+    return parse_date(raw, source="schema.org-text")
+
+
+def to_api_event(obj, source_url, org_id, org_name, lat, lon, event_type, default_hours=1, fuzzy=False):
+    """
+    API event dict from a schema.org Event object, or None if it lacks a name
+    or start. `fuzzy` accepts free-text dates ("Tuesday, March 4 at 6pm"),
+    which some pages put in startDate/endDate.
+    """
+    title = _text(obj.get("name", ""))
+    raw_start = _text(obj.get("startDate", ""))
+    if not title or not raw_start:
+        return None
+    try:
+        start = _date(raw_start, fuzzy)
+    except ValueError:
+        return None
+    end = None
+    raw_end = _text(obj.get("endDate", ""))
+    if raw_end:
+        try:
+            end = _date(raw_end, fuzzy)
+        except ValueError:
+            end = None
+
+    place, place_lat, place_lon = _place(obj.get("location"))
+    url = obj.get("url")
+    url = url if isinstance(url, str) and url.startswith("http") else source_url
+    return api_event(
+        title,
+        start,
+        end,  # missing or not after the start: start + default_hours
+        default_hours,
+        description=_text(obj.get("description", "")),
+        location_name=place or org_name,
+        latitude=place_lat if place_lat is not None else lat,
+        longitude=place_lon if place_lon is not None else lon,
+        organization_id=org_id,
+        event_type=event_type,
+        source_url=url,
+    )
+
+
+def extract_events(html, source_url, org_id, org_name, lat, lon, event_type, default_hours=1, fuzzy=False):
+    """
+    API-ready events from the page's structured data: JSON-LD when present,
+    otherwise microdata. Returns [] when the page declares no usable Event.
+    `fuzzy` is passed on to `to_api_event`.
+    """
+    if not html:
+        return []
+    for objects in (iter_jsonld_events(html), iter_microdata_events(html)):
+        events = []
+        seen = set()
+        for obj in objects:
+            ev = to_api_event(obj, source_url, org_id, org_name, lat, lon, event_type, default_hours, fuzzy)
+            if ev and (ev["title"], ev["start_date"]) not in seen:
+                seen.add((ev["title"], ev["start_date"]))
+                events.append(ev)
+        if events:
+            return events
+    return []
+
+
+def prefer_structured(default_hours=1):
+    """
+    Decorator for a scraper's `parse_list(self, html, source_url)`: returns the
+    page's structured events (built with the scraper's org_id, org_name, lat,
+    lon and event_type) when it has any, and only otherwise runs the method's
+    own heuristics.
+    """
+    def decorate(parse_list):
+        @functools.wraps(parse_list)
+        def wrapper(self, html, source_url):
+            events = extract_events(
+                html, source_url, self.org_id, self.org_name, self.lat, self.lon, self.event_type, default_hours
+            )
+            return events or parse_list(self, html, source_url)
+        return wrapper
+    return decorate
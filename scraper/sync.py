@@ -0,0 +1,191 @@
+# scraper/sync.py
+"""
+Diff-based sync: each source sends inserts, updates and retirements instead
+of re-appending its whole output.
+
+With sync enabled (run_all_scrapers --sync or SCRAPER_SYNC=1), event sinks
+stage a source's events instead of writing them. When the source finishes,
+`commit(apply)` compares the staged output with what that source contributed
+on its last sync (state_store.contributions) and hands one change set to
+`apply` (the sink's `apply_changes`):
+
+* inserts:  events whose identity is new;
+* updates:  same identity, different fingerprint (a meeting that moved or
+            was edited), matched against the row as it was last synced;
+* retires:  identities the source no longer lists whose start is still in
+            the future (cancelled or moved away). Past events simply age out
+            of feeds and are kept.
+
+An event's identity is its organization plus its own detail URL when that
+URL is unique within the source's output, and otherwise its canonical key
+(dedup.canonical_key). A source that returns nothing, or that would retire
+more than SYNC_MAX_RETIRE_FRACTION of what it contributed, is treated as a
+failed scrape and retires nothing. Because anything missing from the output
+counts as gone, scrapers must not skip pages they saw recently while sync
+is enabled; state that should only advance once the change set is applied
+(such as those watermarks) is saved through `on_commit(callback)`.
+"""
+
+import os
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+
+import cassette
+import dedup
+import state_store
+
+MAX_RETIRE_FRACTION = float(os.getenv("SYNC_MAX_RETIRE_FRACTION", "0.5"))
+
+_enabled = os.getenv("SCRAPER_SYNC", "0") in ("1", "true", "on")
+_deferred = False
+_lock = threading.Lock()
+_staged: dict[str, list] = {}
+_on_commit: dict[str, list] = {}
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def deferred() -> bool:
+    return _deferred
+
+
+def enable(on=True, defer=False):
+    """
+    Turn sync mode on. With `defer`, sinks don't commit when they close; the
+    caller (run_all_scrapers) commits once per source after it finishes.
+    """
+    global _enabled, _deferred
+    _enabled, _deferred = on, defer
+
+
+def stage(events, source=None):
+    """Add `events` to the source's output for the next commit."""
+    source = source or state_store.current_source()
+    with _lock:
+        _staged.setdefault(source, []).extend(events)
+
+
+def discard(source=None):
+    """Drop the staged output (and commit callbacks) of a source whose scrape failed."""
+    source = source or state_store.current_source()
+    with _lock:
+        _staged.pop(source, None)
+        _on_commit.pop(source, None)
+
+
+def on_commit(callback, source=None):
+    """Call `callback()` once the source's next change set has been applied without error."""
+    with _lock:
+        _on_commit.setdefault(source or state_store.current_source(), []).append(callback)
+
+
+def identities(events) -> list:
+    urls = Counter(ev.get("source_url") for ev in events)
+    result = []
+    for ev in events:
+        org = ev.get("organization_id") or 1
+        url = ev.get("source_url")
+        if url and urls[url] == 1:
+            result.append(f"{org}|url|{url}")
+        else:
+            result.append(f"{org}|key|{dedup.canonical_key(ev)}")
+    return result
+
+
+def _is_future(start_date, now) -> bool:
+    try:
+        start = datetime.fromisoformat(str(start_date))
+    except ValueError:
+        return False
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=dedup.LOCAL_TZ)
+    return start >= now
+
+
+class ChangeSet:
+    """One source's inserts, updates and retirements, plus the contributions they leave behind."""
+
+    def __init__(self, source):
+        self.source = source
+        self.inserts = []
+        self.updates = []   # (previous row as (title, start_date, organization_id), event)
+        self.retires = []   # (title, start_date, organization_id)
+        self.unchanged = 0
+        self.contributions = {}
+
+    def __len__(self):
+        return len(self.inserts) + len(self.updates) + len(self.retires)
+
+    def events(self) -> list:
+        return self.inserts + [ev for _match, ev in self.updates]
+
+    def payload(self) -> dict:
+        """JSON body for POST /api/events/sync."""
+        def match(row):
+            return {"title": row[0], "start_date": row[1], "organization_id": row[2]}
+        return {
+            "source": self.source,
+            "inserts": self.inserts,
+            "updates": [{"match": match(row), "event": ev} for row, ev in self.updates],
+            "retires": [match(row) for row in self.retires],
+        }
+
+
+def diff(events, previous, source, now=None) -> ChangeSet:
+    """Change set turning `previous` (state_store.contributions) into `events`."""
+    now = now or datetime.now(timezone.utc)
+    changes = ChangeSet(source)
+    current = {}
+    for identity, ev in zip(identities(events), events):
+        current.setdefault(identity, ev)
+
+    for identity, ev in current.items():
+        fp = state_store.fingerprint(ev)
+        changes.contributions[identity] = (ev["title"], ev["start_date"], ev.get("organization_id") or 1, fp)
+        old = previous.get(identity)
+        if old is None:
+            changes.inserts.append(ev)
+        elif old[3] != fp:
+            changes.updates.append((old[:3], ev))
+        else:
+            changes.unchanged += 1
+
+    gone = {identity: row for identity, row in previous.items() if identity not in current}
+    retire = {identity: row for identity, row in gone.items() if _is_future(row[1], now)}
+    if retire and (not current or len(retire) > MAX_RETIRE_FRACTION * len(previous)):
+        print(f"⚠️ {source}: not retiring {len(retire)} of {len(previous)} events (output looks incomplete)")
+        changes.contributions.update(retire)  # try again next run
+    else:
+        changes.retires = [row[:3] for row in retire.values()]
+    return changes
+
+
+def commit(apply, source=None, record=True) -> dict:
+    """
+    Diff the source's staged output against its last sync and apply the
+    change set with `apply(changes) -> stats`. Contributions are only
+    updated (with `record`) when the change set was applied without error.
+    """
+    source = source or state_store.current_source()
+    with _lock:
+        events = _staged.pop(source, [])
+        callbacks = _on_commit.pop(source, [])
+    changes = diff(events, state_store.contributions(source), source)
+    if not changes:
+        print(f"⏭️  {source}: in sync ({changes.unchanged} unchanged)")
+        stats = {}
+    else:
+        stats = apply(changes)
+        if "error" in stats:
+            return stats
+    if record and not cassette.replaying():
+        state_store.replace_contributions(changes.contributions, source)
+        state_store.remember(changes.events(), source)
+    for callback in callbacks:
+        callback()
+    stats["received"] = len(events)
+    stats["unchanged"] = changes.unchanged
+    return stats
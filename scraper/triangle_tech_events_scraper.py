@@ -1,11 +1,9 @@
 # scraper/triangle_tech_events_scraper.py
 
 from base_scraper import BaseScraper
-from post_event import post_event
-from bs4 import BeautifulSoup
-from dateutil import parser
+from date_extract import parse_date
 from datetime import timedelta
-import requests
+from event_model import api_event
 
 class TriangleTechEventsScraper(BaseScraper):
     """
@@ -15,15 +13,7 @@ class TriangleTechEventsScraper(BaseScraper):
     def __init__(self):
         super().__init__(
             "Triangle Tech Events",
-            "https://www.meetup.com/find/?location=us--NC--Raleigh&source=EVENTS",
-            headers={
-                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-                "Accept-Language": "en-US,en;q=0.5",
-                "Accept-Encoding": "gzip, deflate",
-                "Connection": "keep-alive",
-                "Upgrade-Insecure-Requests": "1"
-            }
+            "https://www.meetup.com/find/?location=us--NC--Raleigh&source=EVENTS"
         )
         self.org_id = 43
         self.lat, self.lon = 35.7796, -78.6382  # Raleigh coordinates
@@ -35,7 +25,7 @@ class TriangleTechEventsScraper(BaseScraper):
         return self.parse_events("")  # Empty HTML since we're not fetching
 
     def parse_events(self, html):
-        soup = BeautifulSoup(html, "html.parser")
+        soup = self.get_soup(html)
         events = []
 
         # Since Meetup.com is complex to scrape, create sample tech events
@@ -104,28 +94,24 @@ class TriangleTechEventsScraper(BaseScraper):
         
         for event_data in sample_events:
             try:
-                start = parser.parse(event_data["date"])
+                start = parse_date(event_data["date"], source="triangle_tech_events", fuzzy=False)
                 end = start + timedelta(hours=2)  # Default 2-hour meetup
                 
-                events.append({
-                    "title": event_data["title"],
-                    "description": event_data["description"],
-                    "start_date": start.isoformat(),
-                    "end_date": end.isoformat(),
-                    "location_name": event_data["location"],
-                    "latitude": self.lat,
-                    "longitude": self.lon,
-                    "organization_id": self.org_id,
-                    "event_type": self.event_type,
-                    "source_url": "https://www.meetup.com/find/?location=us--NC--Raleigh&source=EVENTS"
-                })
+                events.append(api_event(
+                    event_data["title"],
+                    start,
+                    end,
+                    description=event_data["description"],
+                    location_name=event_data["location"],
+                    latitude=self.lat,
+                    longitude=self.lon,
+                    organization_id=self.org_id,
+                    event_type=self.event_type,
+                    source_url="https://www.meetup.com/find/?location=us--NC--Raleigh&source=EVENTS",
+                ))
             except Exception as e:
                 print(f"❌ Error parsing sample tech event: {e}")
                 continue
 
         print(f"✅ Found {len(events)} Triangle tech events")
         return events
-
-    def run_and_post(self):
-        for e in self.run():
-            post_event(e) 
\ No newline at end of file
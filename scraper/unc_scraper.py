@@ -1,28 +1,28 @@
 # scraper/unc_scraper.py
 
 from base_scraper import BaseScraper
-from api_client import batch_post
-from datetime import timedelta
-from bs4 import BeautifulSoup
-from dateutil import parser
+from event_sink import publish
+from date_extract import parse_date
+from event_model import api_event
+import structured_data
 
 class UNCScraper(BaseScraper):
     def __init__(self):
         super().__init__(
             "UNC Chapel Hill",
-            "https://calendar.unc.edu/",
-            headers={
-                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-                "Accept-Language": "en-US,en;q=0.5",
-                "Accept-Encoding": "gzip, deflate",
-                "Connection": "keep-alive",
-                "Upgrade-Insecure-Requests": "1"
-            }
+            "https://calendar.unc.edu/"
         )
 
     def parse_events(self, html):
-        soup = BeautifulSoup(html, "html.parser")
+        # Localist embeds schema.org Event JSON-LD with real start/end times
+        events = structured_data.extract_events(
+            html, self.base_url, 2, "UNC Chapel Hill", 35.9049, -79.0469, "academic"
+        )
+        if events:
+            print(f"✅ Found {len(events)} UNC events (structured data)")
+            return events
+
+        soup = self.get_soup(html)
         events = []
 
         # Localist cards
@@ -39,24 +39,21 @@ class UNCScraper(BaseScraper):
             url      = title_tag["href"]
 
             try:
-                start = parser.parse(date_str, fuzzy=True)
-                end   = start + timedelta(hours=1)
+                start = parse_date(date_str, source="unc")
             except Exception as e:
                 print(f"❌ UNC date parse error '{title}': {e}")
                 continue
 
-            events.append({
-                "title":          title,
-                "description":    "",
-                "start_date":     start.isoformat(),
-                "end_date":       end.isoformat(),
-                "location_name":  loc_tag.text.strip() if loc_tag else "UNC Chapel Hill",
-                "latitude":       35.9049,
-                "longitude":     -79.0469,
-                "organization_id": 2,
-                "event_type":     "academic",
-                "source_url":     url
-            })
+            events.append(api_event(
+                title,
+                start,
+                location_name=loc_tag.text.strip() if loc_tag else "UNC Chapel Hill",
+                latitude=35.9049,
+                longitude=-79.0469,
+                organization_id=2,
+                event_type="academic",
+                source_url=url,
+            ))
 
         print(f"✅ Found {len(events)} UNC events")
         return events
@@ -64,5 +61,5 @@ class UNCScraper(BaseScraper):
     def run_and_post(self):
         events = self.run()
         if events:
-            stats = batch_post(events)
+            stats = publish(events)
             print("UNC batch:", stats)
@@ -1,8 +1,8 @@
-import requests
-from bs4 import BeautifulSoup
+from http_client import http_get
+from html_parse import make_soup
 from urllib.parse import urljoin
 from ics_scrapers import ICSUtils
-from api_client import batch_post
+from event_sink import publish
 
 
 class UNCCEventsICSScraper:
@@ -15,16 +15,15 @@ class UNCCEventsICSScraper:
     event_type = "university"
 
     def find_ics_links(self) -> list[str]:
-        headers = {"User-Agent": "Mozilla/5.0"}
         links: list[str] = []
         for page in self.base_pages:
             try:
-                r = requests.get(page, headers=headers, timeout=15)
+                r = http_get(page, timeout=15)
                 r.raise_for_status()
             except Exception as e:
                 print(f"❌ UNCC page fetch failed: {page} {e}")
                 continue
-            soup = BeautifulSoup(r.text, "html.parser")
+            soup = make_soup(r.text)
             for a in soup.find_all("a"):
                 href = (a.get("href") or "").strip()
                 text = (a.get_text() or "").lower()
@@ -38,23 +37,15 @@ class UNCCEventsICSScraper:
         return list(dict.fromkeys(links))
 
     def run_and_post(self):
-        ics_links = self.find_ics_links()
-        all_events: list[dict] = []
-        for url in ics_links:
-            events = ICSUtils.parse_ics(
-                url,
-                org_id=self.org_id,
-                org_name=self.org_name,
-                lat=self.lat,
-                lon=self.lon,
-                event_type=self.event_type,
-            )
-            all_events.extend(events)
-        if all_events:
-            print(f"UNCC ICS parsed {len(all_events)} events from {len(ics_links)} feeds")
-            print("UNCC ICS batch:", batch_post(all_events))
-        else:
-            print("UNCC ICS: no events parsed")
+        events = ICSUtils.parse_feeds(
+            self.find_ics_links(),
+            org_id=self.org_id,
+            org_name=self.org_name,
+            lat=self.lat,
+            lon=self.lon,
+            event_type=self.event_type,
+        )
+        print("UNCC ICS batch:", publish(events))
 
 
 if __name__ == "__main__":
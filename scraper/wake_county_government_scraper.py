@@ -1,11 +1,10 @@
 # scraper/wake_county_government_scraper.py
 
 from base_scraper import BaseScraper
-from api_client import batch_post
-from bs4 import BeautifulSoup
-from dateutil import parser
+from event_sink import publish
+from date_extract import parse_date
 from datetime import timedelta
-import requests
+from event_model import api_event
 
 class WakeCountyGovernmentScraper(BaseScraper):
     """
@@ -15,15 +14,7 @@ class WakeCountyGovernmentScraper(BaseScraper):
     def __init__(self):
         super().__init__(
             "Wake County Government",
-            "https://www.wakegov.com/calendar",
-            headers={
-                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-                "Accept-Language": "en-US,en;q=0.5",
-                "Accept-Encoding": "gzip, deflate",
-                "Connection": "keep-alive",
-                "Upgrade-Insecure-Requests": "1"
-            }
+            "https://www.wakegov.com/calendar"
         )
         self.org_id = 42
         self.lat, self.lon = 35.7796, -78.6382
@@ -35,7 +26,7 @@ class WakeCountyGovernmentScraper(BaseScraper):
         return self.parse_events("")  # Empty HTML since we're not fetching
 
     def parse_events(self, html):
-        soup = BeautifulSoup(html, "html.parser")
+        soup = self.get_soup(html)
         events = []
 
         # Create sample Wake County government events since website is not accessible
@@ -92,21 +83,21 @@ class WakeCountyGovernmentScraper(BaseScraper):
 
         for event_data in sample_events:
             try:
-                start = parser.parse(event_data["date"])
+                start = parse_date(event_data["date"], source="wake_county_government", fuzzy=False)
                 end = start + timedelta(hours=2)  # Default 2-hour meeting
                 
-                events.append({
-                    "title": event_data["title"],
-                    "description": event_data["description"],
-                    "start_date": start.isoformat(),
-                    "end_date": end.isoformat(),
-                    "location_name": event_data["location"],
-                    "latitude": self.lat,
-                    "longitude": self.lon,
-                    "organization_id": self.org_id,
-                    "event_type": self.event_type,
-                    "source_url": "https://www.wakegov.com/calendar"
-                })
+                events.append(api_event(
+                    event_data["title"],
+                    start,
+                    end,
+                    description=event_data["description"],
+                    location_name=event_data["location"],
+                    latitude=self.lat,
+                    longitude=self.lon,
+                    organization_id=self.org_id,
+                    event_type=self.event_type,
+                    source_url="https://www.wakegov.com/calendar",
+                ))
             except Exception as e:
                 print(f"❌ Error parsing sample Wake County event: {e}")
                 continue
@@ -117,5 +108,5 @@ class WakeCountyGovernmentScraper(BaseScraper):
     def run_and_post(self):
         events = self.run()
         if events:
-            stats = batch_post(events)
+            stats = publish(events)
             print("Wake County batch:", stats)
\ No newline at end of file
@@ -1,7 +1,7 @@
 # scraper/wcpss_ics_scraper.py
 
 from ics_scrapers import ICSUtils
-from api_client import batch_post
+from event_sink import publish
 from urllib.parse import quote
 
 class WCPSSICSScraper:
@@ -37,6 +37,4 @@ class WCPSSICSScraper:
             lon=self.lon,
             event_type=self.event_type
         )
-        if events:
-            stats = batch_post(events)
-            print("WCPSS ICS batch:", stats)
+        print("WCPSS ICS batch:", publish(events))